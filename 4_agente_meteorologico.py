@@ -14,26 +14,43 @@ O agente é construído utilizando o framework de código aberto Strands Agents
 (https://strandsagents.com), que facilita a criação de agentes de IA
 com capacidades de raciocínio e uso de ferramentas externas.
 
-O agente utiliza ferramentas como requisições HTTP, comandos de shell e acesso
-ao tempo atual para enriquecer suas respostas com dados meteorológicos precisos.
+O agente utiliza as ferramentas nativas get_current_weather, get_current_weather_bulk e
+get_forecast (definidas em ferramentas_clima.py), que resolvem o nome da cidade em um índice
+local (indice_de_cidades.py) e consultam o OpenWeatherMap com pool de conexões e cache, e a
+ferramenta de tempo atual para enriquecer suas respostas com dados meteorológicos precisos.
+
+A pergunta pode ser passada pela linha de comando; sem ela, é usado o exemplo da sessão:
+
+    python 4_agente_meteorologico.py "Como está o tempo em Recife, Natal e Salvador?"
 
 Requer uma chave de API do OpenWeatherMap configurada como variável de ambiente.
 """
 
+import sys
+
 from strands import Agent
-from strands_tools import http_request, shell, current_time
+from strands_tools import current_time
 from strands.models import BedrockModel
+from ferramentas_clima import get_current_weather, get_current_weather_bulk, get_forecast
 
 SYSTEM_PROMPT = """# Agente Meteorológico do Palla e da Chey para o AWS Summit São Paulo 2025
 
 Você é um assistente especializado em informações meteorológicas que utiliza a API do 
 OpenWeatherMap para fornecer dados precisos sobre o clima.
 
-## Configuração da API:
-- Acesse a chave da API do OpenWeatherMap através da variável de ambiente OPENWEATHER_API_KEY 
-  (você deve busca-la com a ferramenta apropriada)
-- Caso a variável de ambiente não esteja disponível, informe ao usuário que é necessário configurá-la
+## Ferramentas:
+- Use get_current_weather para condições atuais e get_forecast para previsões; a chave da API
+  do OpenWeatherMap (variável de ambiente OPENWEATHER_API_KEY) é lida pelas próprias ferramentas
+- Caso as ferramentas informem que a variável de ambiente não está configurada, informe ao usuário
+  que é necessário configurá-la
 - Nunca solicite que o usuário forneça a chave da API diretamente na conversa
+- Passe o nome da cidade exatamente como o usuário escreveu (com a UF, se informada); as
+  ferramentas resolvem o nome localmente, sem precisar de coordenadas
+- Se a resposta trouxer outras_cidades_com_o_mesmo_nome, diga qual cidade foi consultada
+- Se a resposta trouxer cidades_parecidas_no_indice, confira se a cidade consultada é a que o
+  usuário queria e, na dúvida, pergunte
+- Para perguntas sobre várias cidades, use get_current_weather_bulk com todas elas em uma única
+  chamada, em vez de consultar cidade por cidade
 
 ## Suas capacidades:
 - Consultar condições climáticas atuais para qualquer localização
@@ -64,16 +81,18 @@ OpenWeatherMap para fornecer dados precisos sobre o clima.
 Responda sempre em português brasileiro, adaptando unidades e terminologia local.
 """
 
-def main():
+EXAMPLE_QUESTION = "Qual a temperatura em João Pessoa agora?"
+
+def main(question=EXAMPLE_QUESTION):
     bedrock_model = BedrockModel(
         model_id="us.anthropic.claude-3-7-sonnet-20250219-v1:0")
     
     agent = Agent(
         model=bedrock_model,
         system_prompt=SYSTEM_PROMPT,
-        tools=[http_request, shell, current_time])
+        tools=[get_current_weather, get_current_weather_bulk, get_forecast, current_time])
     
-    agent("Qual a temperatura em João Pessoa agora?")
+    agent(question)
 
 if __name__ == "__main__":
-    main()
+    main(" ".join(sys.argv[1:]) or EXAMPLE_QUESTION)
@@ -8,7 +8,7 @@ Este exemplo demonstra um fluxo de trabalho com agentes utilizando o framework S
 com capacidades de pesquisa na web e em base de conhecimento interna.
 
 ## Características Principais
-- Agentes especializados trabalhando em sequência
+- Agentes especializados trabalhando em sequência, com as etapas independentes em paralelo
 - Passagem direta de informações entre estágios do fluxo
 - Pesquisa na web usando ferramentas http_request e retrieve
 - Consulta a base de conhecimento interna
@@ -19,6 +19,15 @@ com capacidades de pesquisa na web e em base de conhecimento interna.
 2. Execute: python 6_colaboracao_multi_agente.py
 3. Digite consultas ou afirmações no prompt
 
+## Modo em Lote
+Processa um arquivo JSONL de consultas (uma por linha) e grava cada relatório em
+outro arquivo JSONL assim que fica pronto:
+
+    python 6_fluxo_de_trabalho_multi_agente.py --lote consultas.jsonl --saida relatorios.jsonl --workers 8
+
+Cada linha pode ser uma string JSON ou um objeto com a consulta no campo indicado
+por --campo (padrão: "query"). O identificador é lido de "id" ou "request_id".
+
 ## Exemplos de Consultas
 - "Thomas Edison inventou a lâmpada"
 - "Terça-feira vem antes de segunda-feira na semana"
@@ -28,14 +37,101 @@ com capacidades de pesquisa na web e em base de conhecimento interna.
 2. Agente de Conhecimento: Consulta a base de conhecimento interna
 3. Agente Analista: Verifica fatos e sintetiza descobertas de ambas as fontes
 4. Agente Redator: Cria o relatório final
+
+As etapas declaram suas entradas e saídas e são executadas pelo motor de fluxo
+(motor_de_fluxo.py), que monta o grafo de dependências e executa etapas
+independentes em paralelo. As etapas 1 e 2 não dependem uma da outra; apenas o
+Agente Analista precisa aguardar as duas. Assim, a latência total passa a ser
+aproximadamente max(pesquisa, base de conhecimento) em vez da soma das duas.
+
+Os agentes de cada etapa são construídos uma única vez e reutilizados entre
+consultas através de um pool por papel (pool_de_agentes.py, na raiz do repositório e
+compartilhado com a demo 7), que apaga o
+histórico de conversa a cada devolução.
+
+Os resultados da base de conhecimento ficam em um cache local em SQLite
+(cache_de_recuperacao.py), de modo que consultas repetidas não voltam à rede.
+
+Opcionalmente (--cache-semantico), um cache (cache_semantico.py) fica na frente dos
+Agentes Analista e Redator: entradas iguais a outras já respondidas (ignorando
+acentos, maiúsculas e pontuação) reutilizam a análise e o relatório armazenados, sem
+chamar o modelo. Com uma função local de embedding de sentenças
+(--embedding modulo:funcao, ex: um modelo sentence-transformers carregado do disco),
+paráfrases acima de --limiar-similaridade também são reutilizadas, exceto quando
+diferem em negações ou na ordem dos termos.
+
+Antes das etapas de análise e relatório, o texto recebido das etapas anteriores é
+compactado (compactacao.py): passagens repetidas entre a web e a base de
+conhecimento são removidas e cada passagem de etapa respeita um orçamento de
+tokens, preservando as URLs das fontes.
+
+No modo streaming (--streaming), stream_research_workflow é um gerador assíncrono
+que emite eventos de progresso de cada etapa e, na etapa final, os tokens do
+Agente Redator à medida que são gerados, reduzindo o tempo até o primeiro token.
 """
 
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Módulos compartilhados entre as demos (pool_de_agentes.py) ficam na raiz do repositório
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from strands import Agent
 from strands_tools import http_request, retrieve
 from strands.models import BedrockModel
+from motor_de_fluxo import Stage, Workflow
+from pool_de_agentes import AgentPool
+from cache_de_recuperacao import RetrievalCache
+from cache_semantico import SemanticCache
+from compactacao import compact_sources, compact_text
 
 bedrock_model = BedrockModel(model_id="us.anthropic.claude-3-7-sonnet-20250219-v1:0")
 
+agent_pool = AgentPool()
+
+# Orçamento de tokens do texto repassado a cada etapa
+ANALYST_INPUT_TOKEN_BUDGET = 2500
+WRITER_INPUT_TOKEN_BUDGET = 1200
+
+# Caches semânticos das etapas de análise e relatório (desabilitados por padrão)
+semantic_caches = {}
+
+def enable_semantic_cache(threshold=0.85, embed=None):
+    """
+    Habilita o cache semântico na frente dos Agentes Analista e Redator.
+
+    Args:
+        threshold: Similaridade mínima entre entradas para reutilizar uma resposta
+            (usada apenas com embed)
+        embed: Função local de embedding de sentenças (padrão: apenas entradas iguais
+            após a normalização)
+    """
+    semantic_caches["analise"] = SemanticCache(embed, threshold)
+    semantic_caches["relatorio"] = SemanticCache(embed, threshold)
+
+def load_embedding(spec):
+    """
+    Carrega uma função de embedding de sentenças no formato "modulo:funcao".
+
+    O módulo é importado normalmente (do diretório atual ou do ambiente), por exemplo
+    "cache_semantico:hashed_ngram_embedding" ou um módulo próprio que carrega um modelo
+    sentence-transformers do disco. A função recebe um texto e devolve um vetor.
+    """
+    module_name, _, function_name = spec.partition(":")
+    if not module_name or not function_name:
+        raise ValueError(f"Use o formato modulo:funcao (recebido: '{spec}')")
+    embed = getattr(importlib.import_module(module_name), function_name)
+    if not callable(embed):
+        raise ValueError(f"'{spec}' não é uma função")
+    return embed
+
 RESEARCHER_SYSTEM_PROMPT = (
     "Você é um Agente Pesquisador que coleta informações da web. "
     "1. Determine se a entrada é uma consulta de pesquisa ou uma afirmação factual "
@@ -43,6 +139,13 @@ RESEARCHER_SYSTEM_PROMPT = (
     "3. Inclua URLs das fontes e mantenha as descobertas com menos de 500 palavras"
 )
 
+agent_pool.register("pesquisador", lambda: Agent(
+    model=bedrock_model,
+    system_prompt=RESEARCHER_SYSTEM_PROMPT,
+    callback_handler=None,
+    tools=[http_request],
+))
+
 def execute_research_stage(user_input):
     """
     Etapa 1: Executa o Agente Pesquisador para coletar informações da web.
@@ -51,24 +154,17 @@ def execute_research_stage(user_input):
         user_input: Consulta de pesquisa ou afirmação a ser verificada
 
     Returns:
-        str: Resultados da pesquisa
+        AgentResult: Resultados da pesquisa (str() retorna o texto)
     """
     print("\nEtapa 1: Agente Pesquisador coletando informações da web...")
 
-    researcher_agent = Agent(
-        model=bedrock_model,
-        system_prompt=RESEARCHER_SYSTEM_PROMPT,
-        callback_handler=None,
-        tools=[http_request],
-    )
-
     researcher_instruction = (
         f"Pesquisa: '{user_input}'. Use suas ferramentas disponíveis para coletar informações de fontes confiáveis. "
         f"Concentre-se em ser conciso e completo, mas limite as requisições web a 1-2 fontes."
     )
 
-    researcher_response = researcher_agent(researcher_instruction)
-    research_findings = str(researcher_response)
+    with agent_pool.agent("pesquisador") as researcher_agent:
+        research_findings = researcher_agent(researcher_instruction)
 
     print("Pesquisa web concluída")
     return research_findings
@@ -80,6 +176,22 @@ KNOWLEDGE_SYSTEM_PROMPT = (
     "3. Mantenha as informações concisas, com menos de 400 palavras"
 )
 
+KNOWLEDGE_BASE_ID = "XJFMTXZF8L"
+KNOWLEDGE_BASE_REGION = "us-east-1"
+
+retrieval_cache = RetrievalCache(
+    os.path.join("cache", "recuperacao.sqlite3"),
+    ttl_seconds=24 * 3600,
+    max_entries=10_000,
+)
+
+agent_pool.register("conhecimento", lambda: Agent(
+    model=bedrock_model,
+    system_prompt=KNOWLEDGE_SYSTEM_PROMPT,
+    callback_handler=None,
+    tools=[retrieve],
+))
+
 def execute_knowledge_base_stage(user_input):
     """
     Etapa 2: Executa o Agente de Conhecimento para consultar a base de conhecimento interna.
@@ -92,24 +204,26 @@ def execute_knowledge_base_stage(user_input):
     """
     print("\nEtapa 2: Agente de Conhecimento consultando base interna...")
 
-    knowledge_agent = Agent(
-        model=bedrock_model,
-        system_prompt=KNOWLEDGE_SYSTEM_PROMPT, 
-        callback_handler=None, 
-        tools=[retrieve]
-    )
+    cached_findings = retrieval_cache.get(user_input, KNOWLEDGE_BASE_ID, KNOWLEDGE_BASE_REGION)
+    if cached_findings is not None:
+        print("Consulta à base de conhecimento respondida pelo cache local")
+        return cached_findings
 
     knowledge_instruction = (
         f"Consulte nossa base de conhecimento interna sobre: '{user_input}'. "
     )
 
-    knowledge_response = knowledge_agent.tool.retrieve(
-        text=knowledge_instruction,
-        knowledgeBaseId="XJFMTXZF8L",
-        region="us-east-1"
-    )
+    with agent_pool.agent("conhecimento") as knowledge_agent:
+        knowledge_response = knowledge_agent.tool.retrieve(
+            text=knowledge_instruction,
+            knowledgeBaseId=KNOWLEDGE_BASE_ID,
+            region=KNOWLEDGE_BASE_REGION
+        )
 
-    knowledge_findings = str(knowledge_response)
+    knowledge_findings = "\n\n".join(
+        block["text"] for block in knowledge_response.get("content", []) if "text" in block)
+    if knowledge_response.get("status") == "success":
+        retrieval_cache.put(user_input, KNOWLEDGE_BASE_ID, KNOWLEDGE_BASE_REGION, knowledge_findings)
 
     print("Consulta à base de conhecimento concluída")
     return knowledge_findings
@@ -123,6 +237,12 @@ ANALYST_SYSTEM_PROMPT = (
     "5. Avalie a confiabilidade das fontes e mantenha a análise com menos de 500 palavras"
 )
 
+agent_pool.register("analista", lambda: Agent(
+    model=bedrock_model,
+    system_prompt=ANALYST_SYSTEM_PROMPT,
+    callback_handler=None,
+))
+
 def execute_analysis_stage(user_input, research_findings, knowledge_findings):
     """
     Etapa 3: Executa o Agente Analista para verificar e analisar as informações de ambas as fontes.
@@ -133,23 +253,35 @@ def execute_analysis_stage(user_input, research_findings, knowledge_findings):
         knowledge_findings: Resultados da consulta à base de conhecimento
 
     Returns:
-        str: Análise integrada das informações
+        AgentResult: Análise integrada das informações (str() retorna o texto)
     """
     print("Etapa 3: Agente Analista analisando descobertas de ambas as fontes...")
 
-    analyst_agent = Agent(
-        model=bedrock_model,
-        system_prompt=ANALYST_SYSTEM_PROMPT, 
-        callback_handler=None)
+    analysis_cache = semantic_caches.get("analise")
+    if analysis_cache is not None:
+        cached_analysis = analysis_cache.lookup(user_input)
+        if cached_analysis is not None:
+            print("Análise reutilizada do cache semântico")
+            return cached_analysis
+
+    (research_text, knowledge_text), compaction = compact_sources(
+        [str(research_findings), str(knowledge_findings)], ANALYST_INPUT_TOKEN_BUDGET)
+    print(
+        f"Contexto do Agente Analista: {compaction['tokens_antes']} → "
+        f"{compaction['tokens_depois']} tokens estimados"
+    )
 
     analyst_instruction = (
         f"Analise estas descobertas sobre '{user_input}':\n\n"
-        f"=== PESQUISA WEB ===\n{research_findings}\n\n"
-        f"=== BASE DE CONHECIMENTO INTERNA ===\n{knowledge_findings}"
+        f"=== PESQUISA WEB ===\n{research_text}\n\n"
+        f"=== BASE DE CONHECIMENTO INTERNA ===\n{knowledge_text}"
     )
 
-    analyst_response = analyst_agent(analyst_instruction)
-    analysis = str(analyst_response)
+    with agent_pool.agent("analista") as analyst_agent:
+        analysis = analyst_agent(analyst_instruction)
+
+    if analysis_cache is not None:
+        analysis_cache.store(user_input, str(analysis))
 
     print("Análise concluída")
     return analysis
@@ -163,6 +295,23 @@ WRITER_SYSTEM_PROMPT = (
     "5. Mantenha os relatórios com menos de 600 palavras com breves menções às fontes"
 )
 
+agent_pool.register("redator", lambda: Agent(
+    model=bedrock_model,
+    system_prompt=WRITER_SYSTEM_PROMPT,
+))
+
+# No modo streaming os tokens são entregues por stream_async, sem impressão direta
+agent_pool.register("redator_streaming", lambda: Agent(
+    model=bedrock_model,
+    system_prompt=WRITER_SYSTEM_PROMPT,
+    callback_handler=None,
+))
+
+def build_writer_instruction(user_input, analysis):
+    """Monta a instrução do Agente Redator a partir da análise integrada, já compactada."""
+    analysis_text, _ = compact_text(str(analysis), WRITER_INPUT_TOKEN_BUDGET)
+    return f"Crie um relatório sobre '{user_input}' com base nesta análise:\n\n{analysis_text}"
+
 def execute_report_stage(user_input, analysis):
     """
     Etapa 4: Executa o Agente Redator para criar o relatório final.
@@ -176,50 +325,298 @@ def execute_report_stage(user_input, analysis):
     """
     print("Etapa 4: Agente Redator criando relatório final...")
 
-    writer_agent = Agent(
-        model=bedrock_model,
-        system_prompt=WRITER_SYSTEM_PROMPT)
+    report_cache = semantic_caches.get("relatorio")
+    if report_cache is not None:
+        cached_report = report_cache.lookup(user_input)
+        if cached_report is not None:
+            print("Relatório reutilizado do cache semântico")
+            return cached_report
 
-    writer_instruction = (
-        f"Crie um relatório sobre '{user_input}' com base nesta análise:\n\n{analysis}"
-    )
+    writer_instruction = build_writer_instruction(user_input, analysis)
 
-    final_report = writer_agent(writer_instruction)
+    with agent_pool.agent("redator") as writer_agent:
+        final_report = writer_agent(writer_instruction)
+
+    if report_cache is not None:
+        report_cache.store(user_input, str(final_report))
 
     print("Criação do relatório concluída")
     return final_report
 
-def run_research_workflow(user_input):
+# Tempo máximo (em segundos) de cada etapa; o motor executa em paralelo
+# todas as etapas cujas entradas já estão disponíveis
+ANALYSIS_STAGES = [
+    Stage("pesquisa", execute_research_stage,
+          inputs=("user_input",), outputs=("research_findings",), timeout=120),
+    Stage("base_de_conhecimento", execute_knowledge_base_stage,
+          inputs=("user_input",), outputs=("knowledge_findings",), timeout=60),
+    Stage("analise", execute_analysis_stage,
+          inputs=("user_input", "research_findings", "knowledge_findings"),
+          outputs=("analysis",)),
+]
+
+RESEARCH_WORKFLOW = Workflow(
+    stages=ANALYSIS_STAGES + [
+        Stage("relatorio", execute_report_stage,
+              inputs=("user_input", "analysis"), outputs=("final_report",)),
+    ],
+    max_workers=4,
+)
+
+# Fluxo sem a etapa final, usado no modo streaming
+ANALYSIS_WORKFLOW = Workflow(stages=ANALYSIS_STAGES, max_workers=4)
+
+def run_research_workflow(user_input, concurrent=True):
     """
     Executa um fluxo de trabalho com quatro agentes para pesquisa e verificação de fatos,
     combinando fontes web e base de conhecimento interna.
 
     Args:
         user_input: Consulta de pesquisa ou afirmação a ser verificada
+        concurrent: Se True, executa etapas independentes em paralelo
 
     Returns:
         str: O relatório final do Agente Redator
     """
     print(f"\nProcessando: '{user_input}'")
 
-    # Etapa 1: Pesquisa Web
-    research_findings = execute_research_stage(user_input)
+    run = RESEARCH_WORKFLOW.run(
+        max_workers=None if concurrent else 1,
+        user_input=user_input)
 
-    # Etapa 2: Consulta à Base de Conhecimento
-    knowledge_findings = execute_knowledge_base_stage(user_input)
-    print("Passando descobertas de ambas as fontes para o Agente Analista...\n")
+    print("\nMétricas do fluxo de trabalho:")
+    print(run.summary())
+    for stage_name, cache in semantic_caches.items():
+        metrics = cache.metrics()
+        print(
+            f"Cache semântico ({stage_name}): taxa de acerto {metrics['taxa_de_acerto']:.0%}, "
+            f"latência média {metrics['latencia_media_ms']:.2f}ms, {metrics['entradas']} entradas"
+        )
 
-    # Etapa 3: Análise Integrada
-    analysis = execute_analysis_stage(user_input, research_findings, knowledge_findings)
-    print("Passando análise para o Agente Redator...\n")
+    # Retorna o relatório final
+    return run.values["final_report"]
 
-    # Etapa 4: Relatório
-    final_report = execute_report_stage(user_input, analysis)
+async def stream_research_workflow(user_input):
+    """
+    Executa o fluxo de trabalho emitindo eventos à medida que ele avança.
 
-    # Retorna o relatório final
-    return final_report
+    As três primeiras etapas rodam no motor de fluxo, em uma thread separada, e
+    emitem eventos de início e conclusão. A etapa final usa stream_async do Agente
+    Redator e emite cada trecho de texto assim que o modelo o gera.
+
+    Args:
+        user_input: Consulta de pesquisa ou afirmação a ser verificada
+
+    Yields:
+        dict: Eventos com a chave "tipo": "etapa_iniciada", "etapa_concluida",
+            "token" (com "texto") e, por fim, "relatorio" (com o texto completo)
+    """
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+
+    def listener(event):
+        loop.call_soon_threadsafe(events.put_nowait, event)
+
+    workflow_task = asyncio.ensure_future(asyncio.to_thread(
+        ANALYSIS_WORKFLOW.run, listener=listener, user_input=user_input))
+
+    # Repassa os eventos das etapas enquanto o fluxo é executado
+    while not workflow_task.done() or not events.empty():
+        next_event = asyncio.ensure_future(events.get())
+        done, _ = await asyncio.wait(
+            {workflow_task, next_event}, return_when=asyncio.FIRST_COMPLETED)
+        if next_event in done:
+            yield next_event.result()
+        else:
+            next_event.cancel()
+
+    analysis = workflow_task.result().values["analysis"]
+
+    yield {"tipo": "etapa_iniciada", "etapa": "relatorio"}
+    started_at = time.monotonic()
+
+    report_cache = semantic_caches.get("relatorio")
+    final_report = report_cache.lookup(user_input) if report_cache is not None else None
+    if final_report is not None:
+        yield {"tipo": "token", "texto": final_report}
+    else:
+        chunks = []
+        with agent_pool.agent("redator_streaming") as writer_agent:
+            async for event in writer_agent.stream_async(
+                    build_writer_instruction(user_input, analysis)):
+                if "data" in event:
+                    chunks.append(event["data"])
+                    yield {"tipo": "token", "texto": event["data"]}
+        final_report = "".join(chunks)
+        if report_cache is not None:
+            report_cache.store(user_input, final_report)
+
+    yield {"tipo": "etapa_concluida", "etapa": "relatorio",
+           "tempo_s": time.monotonic() - started_at}
+    yield {"tipo": "relatorio", "texto": final_report}
+
+async def print_streamed_research_workflow(user_input):
+    """Exibe o progresso e o relatório do modo streaming, com o tempo até o primeiro token."""
+    print(f"\nProcessando: '{user_input}'")
+    started_at = time.monotonic()
+    first_token_at = None
+
+    async for event in stream_research_workflow(user_input):
+        if event["tipo"] == "etapa_iniciada":
+            print(f"[{event['etapa']}] iniciada")
+        elif event["tipo"] == "etapa_concluida":
+            if event["etapa"] == "relatorio":
+                print()
+            print(f"[{event['etapa']}] concluída em {event['tempo_s']:.2f}s")
+        elif event["tipo"] == "token":
+            if first_token_at is None:
+                first_token_at = time.monotonic()
+                print()
+            print(event["texto"], end="", flush=True)
+
+    if first_token_at is not None:
+        print(f"Tempo até o primeiro token: {first_token_at - started_at:.2f}s")
+
+def read_batch_queries(input_path, field="query"):
+    """
+    Lê consultas de um arquivo JSONL, uma por linha, sem carregar o arquivo inteiro.
+
+    Linhas inválidas (JSON malformado, sem o campo da consulta ou com uma consulta que
+    não é texto) não interrompem a leitura: são devolvidas com a descrição do erro.
+
+    Args:
+        input_path: Caminho do arquivo JSONL de entrada
+        field: Campo que contém a consulta quando a linha é um objeto JSON
+
+    Yields:
+        tuple: Identificador, texto da consulta (None se a linha é inválida) e erro
+            (None se a linha é válida)
+    """
+    with open(input_path, encoding="utf-8") as input_file:
+        for line_number, line in enumerate(input_file, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, None, f"Linha {line_number}: JSON inválido ({e})"
+                continue
+            if isinstance(record, str):
+                query_id, query = line_number, record
+            elif isinstance(record, dict):
+                query_id = record.get("id", record.get("request_id", line_number))
+                query = record.get(field)
+            else:
+                yield line_number, None, f"Linha {line_number}: esperado um texto ou objeto JSON"
+                continue
+            if not isinstance(query, str) or not query.strip():
+                yield query_id, None, f"Linha {line_number}: campo '{field}' ausente ou vazio"
+                continue
+            yield query_id, query, None
+
+def run_batch(input_path, output_path, workers=4, field="query"):
+    """
+    Executa o fluxo de trabalho sobre todas as consultas de um arquivo JSONL.
+
+    Até `workers` consultas são processadas simultaneamente; novas linhas só são
+    lidas quando há um worker livre, e cada resultado é gravado no arquivo de
+    saída assim que a consulta termina (a ordem de saída é a de conclusão).
+
+    Args:
+        input_path: Caminho do arquivo JSONL de entrada
+        output_path: Caminho do arquivo JSONL de saída
+        workers: Número de consultas processadas simultaneamente
+        field: Campo que contém a consulta quando a linha é um objeto JSON
+
+    Returns:
+        tuple: Quantidade de consultas concluídas e de consultas com erro
+    """
+    # Cada consulta em andamento precisa de um agente de cada papel
+    agent_pool.max_agents_per_role = max(agent_pool.max_agents_per_role, workers)
+
+    slots = threading.BoundedSemaphore(workers)
+    write_lock = threading.Lock()
+    counts = {"concluidas": 0, "erros": 0}
+
+    with open(output_path, "w", encoding="utf-8") as output_file:
+
+        def write_result(result):
+            with write_lock:
+                output_file.write(json.dumps(result, ensure_ascii=False) + "\n")
+                output_file.flush()
+                counts["erros" if "error" in result else "concluidas"] += 1
+
+        def process(query_id, query):
+            started_at = time.monotonic()
+            result = {"id": query_id, "query": query}
+            try:
+                result["report"] = str(run_research_workflow(query))
+            except Exception as e:
+                result["error"] = str(e)
+            result["elapsed_s"] = round(time.monotonic() - started_at, 3)
+            write_result(result)
+
+        def release_slot(_future):
+            slots.release()
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lote") as executor:
+            for query_id, query, error in read_batch_queries(input_path, field):
+                # Linhas inválidas viram registros de erro, sem interromper o lote
+                if error is not None:
+                    write_result({"id": query_id, "query": query, "error": error, "elapsed_s": 0.0})
+                    continue
+                slots.acquire()
+                executor.submit(process, query_id, query).add_done_callback(release_slot)
+
+    return counts["concluidas"], counts["erros"]
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Fluxo de trabalho com agentes: assistente de pesquisa com base de conhecimento")
+    parser.add_argument("--lote", metavar="ENTRADA",
+                        help="Arquivo JSONL de consultas a processar em lote")
+    parser.add_argument("--saida", metavar="SAIDA", default="relatorios.jsonl",
+                        help="Arquivo JSONL onde os relatórios do lote são gravados")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="Número de consultas processadas simultaneamente no modo em lote")
+    parser.add_argument("--campo", default="query",
+                        help="Campo JSON que contém a consulta em cada linha do lote")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Exibe o progresso das etapas e o relatório à medida que é gerado")
+    parser.add_argument("--cache-semantico", action="store_true",
+                        help="Reutiliza análises e relatórios de entradas já respondidas")
+    parser.add_argument("--embedding", metavar="MODULO:FUNCAO",
+                        help="Função local de embedding de sentenças usada pelo cache semântico "
+                             "para reutilizar paráfrases (sem ela, apenas entradas iguais)")
+    parser.add_argument("--limiar-similaridade", type=float, default=None,
+                        help="Similaridade mínima para o cache semântico considerar um acerto "
+                             "por embedding (padrão: 0.85; exige --embedding)")
+    args = parser.parse_args()
+    if args.embedding and not args.cache_semantico:
+        parser.error("--embedding exige --cache-semantico")
+    if args.limiar_similaridade is not None and not args.embedding:
+        parser.error("--limiar-similaridade exige --embedding: sem uma função de embedding, "
+                     "o cache reutiliza apenas entradas iguais")
+    return args
 
 if __name__ == "__main__":
+    args = parse_args()
+
+    if args.cache_semantico:
+        try:
+            embed = load_embedding(args.embedding) if args.embedding else None
+        except (ImportError, AttributeError, ValueError) as e:
+            raise SystemExit(f"Não foi possível carregar a função de embedding: {e}")
+        threshold = args.limiar_similaridade if args.limiar_similaridade is not None else 0.85
+        enable_semantic_cache(threshold, embed)
+
+    if args.lote:
+        print(f"Processando lote '{args.lote}' com {args.workers} workers...")
+        completed, failed = run_batch(args.lote, args.saida, args.workers, args.campo)
+        print(f"\nLote concluído: {completed} relatórios, {failed} erros. Resultados em: {args.saida}")
+        raise SystemExit(1 if failed else 0)
+
     # Imprime mensagem de boas-vindas
     print(
         "\nFluxo de Trabalho com Agentes: Assistente de Pesquisa com Base de Conhecimento\n"
@@ -242,7 +639,10 @@ if __name__ == "__main__":
                 break
 
             # Processa a entrada através do fluxo de trabalho de agentes
-            final_report = run_research_workflow(user_input)
+            if args.streaming:
+                asyncio.run(print_streamed_research_workflow(user_input))
+            else:
+                final_report = run_research_workflow(user_input)
         except KeyboardInterrupt:
             print("\n\nExecução interrompida. Saindo...")
             break
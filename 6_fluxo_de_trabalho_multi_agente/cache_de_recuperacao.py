@@ -0,0 +1,123 @@
+"""
+Cache Local de Consultas à Base de Conhecimento
+
+Este módulo foi desenvolvido como exemplo para a sessão "AIM307" do AWS Summit São Paulo 2025.
+
+Guarda em um arquivo SQLite os resultados da ferramenta retrieve, endereçados pelo
+hash do texto normalizado da consulta, do ID da base de conhecimento e da região.
+Consultas repetidas (ou que diferem apenas em maiúsculas, espaços ou
+pontuação final) são respondidas localmente, sem ida e volta à rede. As entradas
+expiram após um TTL e, quando o cache atinge o tamanho máximo, as menos usadas
+recentemente são descartadas (LRU). Por ficar em disco, o cache sobrevive a
+reinicializações do processo.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+
+def normalize_query(text):
+    """Normaliza uma consulta: Unicode NFKC, minúsculas, espaços colapsados e sem pontuação final."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = re.sub(r"\s+", " ", text).strip()
+    return text.strip(" .!?;:\"'")
+
+
+class RetrievalCache:
+    """
+    Cache persistente de resultados de retrieve com expiração (TTL) e descarte LRU.
+
+    Args:
+        path: Caminho do arquivo SQLite
+        ttl_seconds: Tempo de validade de cada entrada
+        max_entries: Número máximo de entradas mantidas
+    """
+
+    def __init__(self, path, ttl_seconds=24 * 3600, max_entries=10_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS retrieval_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_retrieval_cache_last_access"
+            " ON retrieval_cache (last_access)"
+        )
+        self._connection.commit()
+
+    @staticmethod
+    def make_key(query, knowledge_base_id, region):
+        """Calcula a chave do cache a partir da consulta normalizada, da base e da região."""
+        payload = json.dumps([knowledge_base_id, region, normalize_query(query)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, query, knowledge_base_id, region):
+        """Retorna o resultado em cache, ou None se ausente ou expirado."""
+        key = self.make_key(query, knowledge_base_id, region)
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, created_at FROM retrieval_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._connection.execute("DELETE FROM retrieval_cache WHERE key = ?", (key,))
+                    self._connection.commit()
+                self.misses += 1
+                return None
+            self._connection.execute(
+                "UPDATE retrieval_cache SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._connection.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, query, knowledge_base_id, region, value):
+        """Armazena um resultado e descarta as entradas excedentes menos usadas."""
+        key = self.make_key(query, knowledge_base_id, region)
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO retrieval_cache (key, value, created_at, last_access)"
+                " VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._connection.execute(
+                "DELETE FROM retrieval_cache WHERE key IN ("
+                " SELECT key FROM retrieval_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._connection.commit()
+
+    def purge_expired(self):
+        """Remove todas as entradas expiradas e retorna quantas foram removidas."""
+        with self._lock:
+            cursor = self._connection.execute(
+                "DELETE FROM retrieval_cache WHERE created_at < ?",
+                (time.time() - self.ttl_seconds,),
+            )
+            self._connection.commit()
+            return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
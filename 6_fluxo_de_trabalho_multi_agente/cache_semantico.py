@@ -0,0 +1,202 @@
+"""
+Cache Semântico de Respostas
+
+Este módulo foi desenvolvido como exemplo para a sessão "AIM307" do AWS Summit São Paulo 2025.
+
+Muitas consultas repetem afirmações já verificadas, com outra capitalização,
+acentuação ou pontuação. Por padrão, o cache devolve a resposta armazenada apenas
+quando a entrada normalizada (sem acentos, maiúsculas e pontuação) é idêntica a uma
+já respondida.
+
+Opcionalmente, uma função local de embedding de sentenças (ex: um modelo
+sentence-transformers carregado do disco) permite reutilizar respostas de paráfrases:
+o embedding de cada entrada fica em um índice vetorial compacto em NumPy e uma entrada
+com similaridade de cosseno acima do limiar reutiliza a resposta. Como a resposta de um
+verificador de fatos se inverte com uma negação ("Limão cura câncer" / "Limão não cura
+câncer") ou com a troca de ordem dos termos ("segunda vem antes de terça" / "terça vem
+antes de segunda"), um acerto por similaridade é recusado quando as duas entradas
+diferem nas palavras de negação ou na ordem das palavras em comum.
+
+hashed_ngram_embedding é apenas lexical (n-gramas de caracteres) e não distingue essas
+entradas por si só; serve para testes e como exemplo da interface de embedding.
+"""
+
+import threading
+import time
+import unicodedata
+import zlib
+from collections import Counter, OrderedDict
+
+import numpy as np
+
+# Palavras que invertem o sentido de uma afirmação
+NEGATIONS = {
+    "nao", "nunca", "jamais", "nem", "nenhum", "nenhuma", "ninguem", "nada", "sem",
+    "not", "no", "never", "nor", "none", "nobody", "nothing", "without",
+}
+
+
+def normalize_words(text):
+    """Palavras do texto sem acentos, maiúsculas e pontuação."""
+    folded = unicodedata.normalize("NFKD", text.casefold())
+    folded = "".join(c for c in folded if not unicodedata.combining(c))
+    return "".join(c if c.isalnum() else " " for c in folded).split()
+
+
+def same_claim_structure(first, second):
+    """
+    Indica se duas entradas podem compartilhar a resposta: as mesmas palavras de negação
+    e as palavras em comum na mesma ordem.
+    """
+    first_words, second_words = normalize_words(first), normalize_words(second)
+    negations = lambda words: Counter(w for w in words if w in NEGATIONS)
+    if negations(first_words) != negations(second_words):
+        return False
+    shared = set(first_words) & set(second_words)
+    first_order = [w for w in dict.fromkeys(first_words) if w in shared]
+    second_order = [w for w in dict.fromkeys(second_words) if w in shared]
+    return first_order == second_order
+
+
+def hashed_ngram_embedding(text, dimensions=1024, ngram_size=3):
+    """
+    Embedding local baseado em feature hashing de n-gramas de caracteres e palavras.
+
+    Args:
+        text: Texto a ser representado
+        dimensions: Tamanho do vetor resultante
+        ngram_size: Tamanho dos n-gramas de caracteres
+
+    Returns:
+        numpy.ndarray: Vetor float32 de norma unitária
+    """
+    words = normalize_words(text)
+
+    features = list(words)
+    for word in words:
+        padded = f" {word} "
+        features.extend(padded[i:i + ngram_size] for i in range(len(padded) - ngram_size + 1))
+
+    vector = np.zeros(dimensions, dtype=np.float32)
+    for feature in features:
+        digest = zlib.crc32(feature.encode("utf-8"))
+        sign = 1.0 if digest & 0x80000000 else -1.0
+        vector[digest % dimensions] += sign
+
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class VectorIndex:
+    """
+    Índice vetorial em memória com busca exata por similaridade de cosseno.
+
+    Os vetores ficam em uma única matriz float32 pré-alocada. Quando a capacidade
+    é atingida, os vetores mais antigos são sobrescritos (buffer circular).
+
+    Args:
+        capacity: Número máximo de vetores mantidos
+    """
+
+    def __init__(self, capacity=10_000):
+        self.capacity = capacity
+        self._vectors = None
+        self._values = [None] * capacity
+        self._size = 0
+        self._next = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, vector, value):
+        vector = np.asarray(vector, dtype=np.float32)
+        if self._vectors is None:
+            self._vectors = np.zeros((self.capacity, vector.shape[0]), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        self._vectors[self._next] = vector / norm if norm else vector
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def nearest(self, vector):
+        """Retorna (valor, similaridade) do vetor mais parecido, ou (None, 0.0) se vazio."""
+        if not self._size:
+            return None, 0.0
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector = vector / norm
+        scores = self._vectors[:self._size] @ vector
+        best = int(np.argmax(scores))
+        return self._values[best], float(scores[best])
+
+
+class SemanticCache:
+    """
+    Cache de respostas indexado pela entrada normalizada e, opcionalmente, pela
+    similaridade semântica das entradas.
+
+    Args:
+        embed: Função local de embedding de sentenças; sem ela, apenas entradas
+            idênticas após a normalização são reutilizadas
+        threshold: Similaridade mínima (cosseno) para considerar um acerto por embedding
+        capacity: Número máximo de entradas mantidas
+    """
+
+    def __init__(self, embed=None, threshold=0.9, capacity=10_000):
+        self.embed = embed
+        self.threshold = threshold
+        self.capacity = capacity
+        self._exact = OrderedDict()
+        self._index = VectorIndex(capacity) if embed is not None else None
+        self._lock = threading.Lock()
+        self._lookups = 0
+        self._hits = 0
+        self._lookup_time_s = 0.0
+
+    def _search(self, text):
+        key = " ".join(normalize_words(text))
+        with self._lock:
+            if key in self._exact:
+                self._exact.move_to_end(key)
+                return self._exact[key]
+        if self._index is None:
+            return None
+        vector = self.embed(text)
+        with self._lock:
+            entry, score = self._index.nearest(vector)
+        if entry is None or score < self.threshold:
+            return None
+        stored_text, value = entry
+        return value if same_claim_structure(text, stored_text) else None
+
+    def lookup(self, text):
+        """Retorna a resposta armazenada para a mesma entrada (ou uma paráfrase), ou None."""
+        started_at = time.perf_counter()
+        value = self._search(text)
+        with self._lock:
+            self._lookups += 1
+            self._hits += value is not None
+            self._lookup_time_s += time.perf_counter() - started_at
+        return value
+
+    def store(self, text, value):
+        """Armazena a resposta de uma entrada."""
+        vector = self.embed(text) if self._index is not None else None
+        with self._lock:
+            self._exact[" ".join(normalize_words(text))] = value
+            if len(self._exact) > self.capacity:
+                self._exact.popitem(last=False)
+            if vector is not None:
+                self._index.add(vector, (text, value))
+
+    def metrics(self):
+        """Retorna taxa de acerto, latência média de consulta e tamanho do cache."""
+        with self._lock:
+            return {
+                "consultas": self._lookups,
+                "acertos": self._hits,
+                "taxa_de_acerto": self._hits / self._lookups if self._lookups else 0.0,
+                "latencia_media_ms": 1000 * self._lookup_time_s / self._lookups if self._lookups else 0.0,
+                "entradas": len(self._exact),
+            }
@@ -0,0 +1,160 @@
+"""
+Compactação de Contexto entre Etapas
+
+Este módulo foi desenvolvido como exemplo para a sessão "AIM307" do AWS Summit São Paulo 2025.
+
+O texto repassado de uma etapa para a seguinte vira tokens de entrada da próxima
+chamada ao modelo. Resultados grandes da base de conhecimento, ou trechos que a
+pesquisa web e a base repetem, aumentam o custo e a latência das etapas finais.
+
+A compactação:
+1. Divide cada fonte em passagens (parágrafos)
+2. Remove passagens repetidas ou quase idênticas, inclusive entre fontes diferentes;
+   quando a repetição vem de outra fonte, mantém uma nota curta de que ela confirma
+   o trecho, para que a análise ainda possa cruzar as fontes
+3. Mantém as passagens em ordem até esgotar o orçamento de tokens da passagem de etapa
+4. Preserva as URLs citadas nas passagens descartadas ou repetidas, listando-as ao
+   final da fonte
+"""
+
+import re
+import unicodedata
+
+URL_PATTERN = re.compile(r"https?://[^\s<>\"')\]]+")
+
+# Estimativa usual de ~4 caracteres por token
+CHARS_PER_TOKEN = 4
+
+# Passagens com similaridade de Jaccard (sobre trigramas de palavras) acima deste
+# valor são consideradas repetidas
+DUPLICATE_THRESHOLD = 0.8
+
+# Espaço mínimo (em tokens) para incluir uma passagem truncada
+MIN_TRUNCATED_TOKENS = 40
+
+
+def estimate_tokens(text):
+    """Estima a quantidade de tokens de um texto."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def split_passages(text):
+    """Divide um texto em passagens separadas por linhas em branco."""
+    return [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+
+
+def _shingles(passage, size=3):
+    folded = unicodedata.normalize("NFKD", URL_PATTERN.sub(" ", passage).casefold())
+    words = re.findall(r"\w+", "".join(c for c in folded if not unicodedata.combining(c)))
+    if len(words) < size:
+        return {" ".join(words)}
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+# Palavras do início da passagem repetida citadas na nota de confirmação
+CONFIRMATION_WORDS = 8
+
+
+def _find_duplicate(shingles, seen):
+    """Retorna a entrada (shingles, fonte, passagem) já vista que a passagem repete, ou None."""
+    for entry in seen:
+        other = entry[0]
+        union = len(shingles | other)
+        if union and len(shingles & other) / union >= DUPLICATE_THRESHOLD:
+            return entry
+    return None
+
+
+def _confirmation(source_position, passage):
+    words = URL_PATTERN.sub(" ", passage).split()
+    excerpt = " ".join(words[:CONFIRMATION_WORDS])
+    ellipsis = "…" if len(words) > CONFIRMATION_WORDS else ""
+    return f"Confirma o trecho da fonte {source_position + 1}: “{excerpt}{ellipsis}”"
+
+
+def _truncate(passage, token_budget):
+    """Corta a passagem em um limite de palavra; retorna o trecho mantido e o restante."""
+    limit = token_budget * CHARS_PER_TOKEN - 1
+    cut = passage.rfind(" ", 0, limit)
+    if cut <= 0:
+        cut = limit
+    return passage[:cut].rstrip() + "…", passage[cut:]
+
+
+def compact_sources(sources, token_budget):
+    """
+    Deduplica e limita ao orçamento de tokens um conjunto de fontes.
+
+    O orçamento é dividido igualmente entre as fontes; a parte não usada por uma
+    fonte fica disponível para as seguintes.
+
+    Args:
+        sources: Lista de textos (ex: [pesquisa_web, base_de_conhecimento])
+        token_budget: Orçamento total de tokens para todas as fontes
+
+    Returns:
+        tuple: Uma lista com os textos compactados e um dicionário com as
+            estatísticas (tokens antes/depois, passagens duplicadas e descartadas)
+    """
+    stats = {"tokens_antes": 0, "tokens_depois": 0, "duplicadas": 0, "descartadas": 0}
+    seen = []
+    compacted = []
+    remaining_budget = token_budget
+
+    for position, text in enumerate(sources):
+        stats["tokens_antes"] += estimate_tokens(text)
+        source_budget = remaining_budget // (len(sources) - position)
+        used = 0
+        kept = []
+        dropped_urls = []
+
+        for passage in split_passages(text):
+            shingles = _shingles(passage)
+            duplicate = _find_duplicate(shingles, seen)
+            if duplicate is not None:
+                stats["duplicadas"] += 1
+                # A URL da fonte que repete o trecho é mantida em "Fontes adicionais"
+                dropped_urls.extend(URL_PATTERN.findall(passage))
+                _, other_position, other_passage = duplicate
+                if other_position != position:
+                    note = _confirmation(other_position, other_passage)
+                    cost = estimate_tokens(note) + 1
+                    if used + cost <= source_budget:
+                        kept.append(note)
+                        used += cost
+                continue
+            seen.append((shingles, position, passage))
+
+            cost = estimate_tokens(passage) + 1
+            if used + cost <= source_budget:
+                kept.append(passage)
+                used += cost
+                continue
+
+            available = source_budget - used
+            if available >= MIN_TRUNCATED_TOKENS:
+                truncated, passage = _truncate(passage, available - 1)
+                kept.append(truncated)
+                used += estimate_tokens(truncated) + 1
+            stats["descartadas"] += 1
+            dropped_urls.extend(URL_PATTERN.findall(passage))
+
+        # Mantém as fontes citadas nas passagens descartadas
+        kept_text = "\n\n".join(kept)
+        missing_urls = [u for u in dict.fromkeys(dropped_urls) if u not in kept_text]
+        if missing_urls:
+            kept.append("Fontes adicionais: " + ", ".join(missing_urls))
+
+        result = "\n\n".join(kept)
+        used = estimate_tokens(result)
+        compacted.append(result)
+        stats["tokens_depois"] += used
+        remaining_budget = max(remaining_budget - used, 0)
+
+    return compacted, stats
+
+
+def compact_text(text, token_budget):
+    """Deduplica e limita ao orçamento de tokens um único texto."""
+    (compacted,), stats = compact_sources([text], token_budget)
+    return compacted, stats
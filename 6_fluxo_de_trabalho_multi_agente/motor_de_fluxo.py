@@ -0,0 +1,250 @@
+"""
+Motor de Fluxo de Trabalho Declarativo
+
+Este módulo foi desenvolvido como exemplo para a sessão "AIM307" do AWS Summit São Paulo 2025.
+
+Cada etapa do fluxo declara quais valores consome (inputs) e quais produz (outputs).
+A partir dessas declarações o motor monta o grafo de dependências e executa as
+etapas em um pool limitado de threads: assim que uma etapa termina, as etapas
+cujas entradas ficaram disponíveis ocupam os workers livres, aproveitando a capacidade ociosa de
+chamadas ao modelo. Novas etapas (ex: verificação de fatos, tradução) podem ser
+adicionadas sem que o fluxo volte a ser sequencial.
+
+Para cada etapa são registrados o tempo de execução e o uso de tokens, quando a
+etapa retorna um resultado de agente Strands (AgentResult). Um listener opcional
+recebe eventos de início e conclusão de cada etapa, permitindo exibir o
+progresso do fluxo enquanto ele é executado.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class StageTimeoutError(TimeoutError):
+    """Erro lançado quando uma etapa do fluxo excede o tempo máximo permitido."""
+
+
+@dataclass
+class Stage:
+    """
+    Etapa de um fluxo de trabalho.
+
+    Args:
+        name: Nome único da etapa
+        func: Função executada; recebe os valores de `inputs` como argumentos posicionais
+        inputs: Nomes dos valores consumidos pela etapa
+        outputs: Nomes dos valores produzidos; com mais de uma saída a função deve
+            retornar uma tupla na mesma ordem
+        timeout: Tempo máximo de execução em segundos (None para ilimitado)
+    """
+
+    name: str
+    func: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    timeout: Optional[float] = None
+
+
+@dataclass
+class StageMetrics:
+    """Métricas de execução de uma etapa."""
+
+    name: str
+    wall_time_s: float
+    input_tokens: int = 0
+    output_tokens: int = 0
+    total_tokens: int = 0
+
+
+@dataclass
+class WorkflowRun:
+    """Resultado de uma execução do fluxo: valores produzidos e métricas por etapa."""
+
+    values: Dict[str, Any]
+    metrics: List[StageMetrics] = field(default_factory=list)
+    wall_time_s: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(m.total_tokens for m in self.metrics)
+
+    def summary(self) -> str:
+        """Retorna um resumo legível do tempo e dos tokens de cada etapa."""
+        lines = [
+            f"- {m.name}: {m.wall_time_s:.2f}s, "
+            f"{m.input_tokens} tokens de entrada, {m.output_tokens} tokens de saída"
+            for m in self.metrics
+        ]
+        lines.append(f"Total: {self.wall_time_s:.2f}s, {self.total_tokens} tokens")
+        return "\n".join(lines)
+
+
+def _token_usage(result):
+    """Extrai o uso de tokens de um AgentResult; outros valores contam como zero."""
+    usage = getattr(getattr(result, "metrics", None), "accumulated_usage", None) or {}
+    return (
+        usage.get("inputTokens", 0),
+        usage.get("outputTokens", 0),
+        usage.get("totalTokens", 0),
+    )
+
+
+class Workflow:
+    """
+    Fluxo de trabalho montado a partir das dependências declaradas pelas etapas.
+
+    Args:
+        stages: Etapas do fluxo, em qualquer ordem
+        max_workers: Número máximo de etapas executadas simultaneamente
+    """
+
+    def __init__(self, stages: List[Stage], max_workers: int = 4):
+        self.stages = list(stages)
+        self.max_workers = max_workers
+        self._producers = {}
+        for stage in self.stages:
+            for output in stage.outputs:
+                if output in self._producers:
+                    raise ValueError(
+                        f"O valor '{output}' é produzido por mais de uma etapa: "
+                        f"'{self._producers[output].name}' e '{stage.name}'"
+                    )
+                self._producers[output] = stage
+        self._check_acyclic()
+
+    @property
+    def external_inputs(self):
+        """Valores consumidos pelas etapas que precisam ser fornecidos em run()."""
+        return {
+            name
+            for stage in self.stages
+            for name in stage.inputs
+            if name not in self._producers
+        }
+
+    def _check_acyclic(self):
+        visiting, done = set(), set()
+
+        def visit(stage):
+            if stage.name in done:
+                return
+            if stage.name in visiting:
+                raise ValueError(f"Dependência circular envolvendo a etapa '{stage.name}'")
+            visiting.add(stage.name)
+            for name in stage.inputs:
+                if name in self._producers:
+                    visit(self._producers[name])
+            visiting.discard(stage.name)
+            done.add(stage.name)
+
+        for stage in self.stages:
+            visit(stage)
+
+    def run(self, max_workers: Optional[int] = None,
+            listener: Optional[Callable[[Dict[str, Any]], None]] = None,
+            **inputs) -> WorkflowRun:
+        """
+        Executa o fluxo, iniciando cada etapa assim que suas entradas estiverem prontas.
+
+        Args:
+            max_workers: Sobrepõe o limite de etapas simultâneas desta execução
+            listener: Função chamada com um evento ao iniciar e ao concluir cada etapa,
+                ex: {"tipo": "etapa_concluida", "etapa": "analise", "tempo_s": 3.2}
+            **inputs: Valores externos consumidos pelas etapas
+
+        Returns:
+            WorkflowRun: Valores produzidos e métricas de cada etapa
+        """
+        missing = self.external_inputs - inputs.keys()
+        if missing:
+            raise ValueError(f"Entradas ausentes para o fluxo: {', '.join(sorted(missing))}")
+
+        notify = listener or (lambda event: None)
+        values = dict(inputs)
+        run = WorkflowRun(values=values)
+        pending = list(self.stages)
+        running = {}
+        started_at = time.monotonic()
+
+        max_workers = max_workers or self.max_workers
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="etapa")
+        try:
+            while pending or running:
+                # Ocupa os workers livres com as etapas cujas entradas já estão disponíveis.
+                # Só submete o que pode iniciar imediatamente, para que o timeout de
+                # cada etapa seja contado a partir do seu início real.
+                ready = [s for s in pending if all(n in values for n in s.inputs)]
+                for stage in ready[:max_workers - len(running)]:
+                    pending.remove(stage)
+                    args = [values[n] for n in stage.inputs]
+                    future = executor.submit(self._run_stage, stage, args)
+                    running[future] = (stage, time.monotonic())
+                    notify({"tipo": "etapa_iniciada", "etapa": stage.name})
+                if not running:
+                    blocked = ", ".join(s.name for s in pending)
+                    raise RuntimeError(f"Etapas sem entradas disponíveis: {blocked}")
+
+                done, _ = wait(running, timeout=self._next_deadline(running),
+                               return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, _ = running.pop(future)
+                    result, metrics = future.result()
+                    self._store_outputs(stage, result, values)
+                    run.metrics.append(metrics)
+                    notify({"tipo": "etapa_concluida", "etapa": stage.name,
+                            "tempo_s": metrics.wall_time_s})
+
+                now = time.monotonic()
+                for future, (stage, stage_started_at) in running.items():
+                    if stage.timeout is not None and now - stage_started_at >= stage.timeout:
+                        raise StageTimeoutError(
+                            f"A etapa '{stage.name}' excedeu o tempo máximo de {stage.timeout}s"
+                        )
+        except BaseException:
+            for future in running:
+                future.cancel()
+            raise
+        finally:
+            # Não bloqueia aguardando etapas canceladas que ainda estejam em execução
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        run.wall_time_s = time.monotonic() - started_at
+        return run
+
+    @staticmethod
+    def _run_stage(stage, args):
+        stage_started_at = time.monotonic()
+        result = stage.func(*args)
+        input_tokens, output_tokens, total_tokens = _token_usage(result)
+        metrics = StageMetrics(
+            name=stage.name,
+            wall_time_s=time.monotonic() - stage_started_at,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=total_tokens,
+        )
+        return result, metrics
+
+    @staticmethod
+    def _next_deadline(running):
+        """Tempo até o próximo timeout entre as etapas em execução (None se não houver)."""
+        now = time.monotonic()
+        remaining = [
+            stage.timeout - (now - started_at)
+            for stage, started_at in running.values()
+            if stage.timeout is not None
+        ]
+        return max(min(remaining), 0) if remaining else None
+
+    @staticmethod
+    def _store_outputs(stage, result, values):
+        if len(stage.outputs) == 1:
+            values[stage.outputs[0]] = result
+        elif stage.outputs:
+            if len(result) != len(stage.outputs):
+                raise ValueError(
+                    f"A etapa '{stage.name}' deveria produzir {len(stage.outputs)} valores"
+                )
+            values.update(zip(stage.outputs, result))
@@ -0,0 +1,366 @@
+"""
+Avaliador Local de Expressões Matemáticas
+
+Este módulo foi desenvolvido como exemplo para a sessão "AIM307" do AWS Summit São Paulo 2025.
+
+Resolve sem chamar o modelo as consultas de matemática mais simples: expressões
+aritméticas ("quanto é 37*89?") e equações polinomiais de grau 1 ou 2 em x
+("resolva 2x + 3 = 7"), com a resolução passo a passo em frações exatas sempre que
+possível. A expressão é analisada com o módulo ast e avaliada por uma lista fechada de
+operadores, funções e constantes, com limites de tamanho, de expoente e de magnitude;
+nenhum código é executado. Qualquer consulta fora desse escopo retorna None e segue
+para o agente.
+"""
+
+import ast
+import math
+import re
+import unicodedata
+from fractions import Fraction
+
+# Frases comuns antes de uma expressão, removidas antes da análise
+QUERY_PREFIXES = re.compile(
+    r"^(quanto e|quanto da|quanto vale|calcule|calcular|resolva|resolver|"
+    r"qual e o resultado de|qual o resultado de|qual e o valor de|qual o valor de|"
+    r"resolva a equacao|encontre x em|determine x em)\s*:?\s*"
+)
+
+
+def _sqrt(value):
+    """Raiz quadrada exata para quadrados perfeitos de frações; aproximada nos demais casos."""
+    if isinstance(value, Fraction) and value >= 0:
+        numerator, denominator = math.isqrt(value.numerator), math.isqrt(value.denominator)
+        if numerator ** 2 == value.numerator and denominator ** 2 == value.denominator:
+            return Fraction(numerator, denominator)
+    return math.sqrt(value)
+
+
+# Sem funções trigonométricas: "sen(30)" costuma estar em graus para o aluno, mas em
+# radianos para math.sin; a unidade ambígua fica para o agente esclarecer
+FUNCTIONS = {
+    "sqrt": _sqrt, "raiz": _sqrt,
+    "log": math.log10, "ln": math.log, "exp": math.exp, "abs": abs,
+}
+# Funções que preservam frações exatas; as demais recebem ponto flutuante
+EXACT_FUNCTIONS = {"sqrt", "raiz", "abs"}
+CONSTANTS = {"pi": math.pi, "e": math.e}
+VARIABLE = "x"
+
+OPERATORS = {
+    ast.Add: ("+", 1), ast.Sub: ("-", 1),
+    ast.Mult: ("*", 2), ast.Div: ("/", 2), ast.FloorDiv: ("//", 2), ast.Mod: ("%", 2),
+    ast.Pow: ("^", 4),
+}
+
+# Limites que impedem expressões que levariam muito tempo ou memória para avaliar
+MAX_EXPRESSION_LENGTH = 200
+MAX_EXPONENT = 1000
+MAX_MAGNITUDE = 10 ** 100
+MAX_STEPS = 10
+
+# "1.000" é mil no padrão brasileiro, mas um decimal em Python: a consulta vai ao agente
+THOUSANDS_SEPARATOR = re.compile(r"\d\.\d{3}")
+
+
+class UnsupportedExpression(ValueError):
+    """A consulta não é uma expressão que o avaliador local sabe resolver."""
+
+
+def _fold(text):
+    folded = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in folded if not unicodedata.combining(c)).strip()
+
+
+def extract_expression(query):
+    """
+    Extrai uma expressão matemática pura da consulta, em sintaxe Python.
+
+    Returns:
+        str: A expressão, ou None se a consulta contém texto além da expressão ou uma
+            notação ambígua (fatorial, separador de milhar)
+    """
+    text = QUERY_PREFIXES.sub("", _fold(query)).rstrip(" ?.")
+    # "!" depois de um número ou parêntese é o fatorial, não uma exclamação
+    if re.search(r"[\d)x]\s*!", text):
+        return None
+    text = text.rstrip(" ?.!")
+    if not text or len(text) > MAX_EXPRESSION_LENGTH or not re.search(r"\d", text):
+        return None
+    if THOUSANDS_SEPARATOR.search(text):
+        return None
+
+    text = text.replace("×", "*").replace("·", "*").replace("÷", "/").replace("^", "**")
+    text = text.replace("√", "sqrt")
+    text = re.sub(r"(\d),(\d)", r"\1.\2", text)
+    if "=" not in text:
+        # Sem equação, "x" entre números é o sinal de multiplicação
+        text = re.sub(r"(?<=[\d)\s])x(?=[\s\d(])", "*", text)
+
+    words = set(re.findall(r"[a-z_]+", text))
+    if not words <= set(FUNCTIONS) | set(CONSTANTS) | {VARIABLE}:
+        return None
+
+    # Multiplicação implícita: "2x", "3(x+1)", "(a)(b)", "x(2)"
+    text = re.sub(r"(\d)\s*([a-z(])", r"\1*\2", text)
+    text = re.sub(r"\)\s*([\d(a-z])", r")*\1", text)
+    text = re.sub(r"\bx\s*\(", "x*(", text)
+    return text
+
+
+def _check_magnitude(value):
+    if isinstance(value, complex):
+        raise UnsupportedExpression("Resultado complexo não suportado pelo avaliador local")
+    if isinstance(value, Fraction):
+        too_large = abs(value.numerator) > MAX_MAGNITUDE or value.denominator > MAX_MAGNITUDE
+    else:
+        too_large = not math.isfinite(value) or abs(value) > MAX_MAGNITUDE
+    if too_large:
+        raise UnsupportedExpression("Resultado grande demais para o avaliador local")
+    return value
+
+
+def _apply(op, left, right):
+    if isinstance(op, ast.Pow):
+        if abs(right) > MAX_EXPONENT:
+            raise UnsupportedExpression("Expoente grande demais para o avaliador local")
+        if isinstance(right, Fraction) and right.denominator == 1:
+            return left ** int(right)
+        return float(left) ** float(right)
+    if isinstance(op, ast.Add):
+        return left + right
+    if isinstance(op, ast.Sub):
+        return left - right
+    if isinstance(op, ast.Mult):
+        return left * right
+    if isinstance(op, ast.Div):
+        return left / right
+    if isinstance(op, ast.FloorDiv):
+        return Fraction(left // right)
+    if isinstance(op, ast.Mod):
+        return left % right
+    raise UnsupportedExpression("Operador não suportado")
+
+
+def evaluate(node, variable_value=None):
+    """
+    Avalia uma árvore AST permitindo apenas números, operadores aritméticos, as funções
+    de FUNCTIONS, as constantes de CONSTANTS e a variável x. Os números da árvore devem
+    ser frações exatas (ver parse_exact); valores float surgem apenas de funções e raízes.
+    """
+    if isinstance(node, ast.Constant) and type(node.value) in (Fraction, float):
+        return node.value
+    if isinstance(node, ast.Name):
+        if node.id == VARIABLE and variable_value is not None:
+            return variable_value
+        if node.id in CONSTANTS:
+            return CONSTANTS[node.id]
+        raise UnsupportedExpression(f"Nome não suportado: {node.id}")
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        value = evaluate(node.operand, variable_value)
+        return -value if isinstance(node.op, ast.USub) else value
+    if isinstance(node, ast.BinOp) and type(node.op) in OPERATORS:
+        left = evaluate(node.left, variable_value)
+        right = evaluate(node.right, variable_value)
+        return _check_magnitude(_apply(node.op, left, right))
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+            and node.func.id in FUNCTIONS and len(node.args) == 1 and not node.keywords):
+        argument = evaluate(node.args[0], variable_value)
+        if node.func.id not in EXACT_FUNCTIONS:
+            argument = float(argument)
+        return _check_magnitude(FUNCTIONS[node.func.id](argument))
+    raise UnsupportedExpression(f"Construção não suportada: {type(node).__name__}")
+
+
+def parse_exact(expression):
+    """Converte a expressão em árvore AST, trocando os números literais por frações exatas."""
+    tree = ast.parse(expression, mode="eval").body
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant):
+            if type(node.value) not in (int, float):
+                raise UnsupportedExpression("Literal não numérico")
+            node.value = Fraction(str(node.value))
+    return tree
+
+
+def _is_terminating(value):
+    denominator = value.denominator
+    for factor in (2, 5):
+        while denominator % factor == 0:
+            denominator //= factor
+    return denominator == 1
+
+
+def _plain(value):
+    """Formata um número no padrão brasileiro, sem a aproximação decimal das frações."""
+    if isinstance(value, Fraction):
+        if value.denominator == 1:
+            return str(value.numerator)
+        if _is_terminating(value) and value.denominator <= 10 ** 10:
+            return f"{float(value):.10g}".replace(".", ",")
+        return f"{value.numerator}/{value.denominator}"
+    if float(value).is_integer():
+        return str(int(value))
+    return f"{value:.10g}".replace(".", ",")
+
+
+def format_number(value):
+    """Formata um número no padrão brasileiro, com a aproximação decimal de frações."""
+    text = _plain(value)
+    if isinstance(value, Fraction) and "/" in text:
+        text += f" (≈ {_plain(float(value))})"
+    return text
+
+
+def _format_node(node, parent_precedence=0):
+    """Converte a árvore em texto, com parênteses apenas onde a precedência exige."""
+    if isinstance(node, ast.Constant):
+        text = _plain(node.value)
+        if "/" in text:
+            precedence = 2
+        elif node.value < 0:
+            precedence = 3
+        else:
+            precedence = 5
+    elif isinstance(node, ast.Name):
+        text, precedence = node.id, 5
+    elif isinstance(node, ast.UnaryOp):
+        sign = "-" if isinstance(node.op, ast.USub) else "+"
+        text, precedence = sign + _format_node(node.operand, 3), 3
+    elif isinstance(node, ast.BinOp):
+        symbol, precedence = OPERATORS[type(node.op)]
+        # Potência é associativa à direita; os demais operadores, à esquerda
+        left_precedence = precedence + 1 if symbol == "^" else precedence
+        right_precedence = precedence if symbol == "^" else precedence + 1
+        text = f"{_format_node(node.left, left_precedence)} {symbol} {_format_node(node.right, right_precedence)}"
+    elif isinstance(node, ast.Call):
+        text, precedence = f"{node.func.id}({_format_node(node.args[0])})", 5
+    else:
+        raise UnsupportedExpression(f"Construção não suportada: {type(node).__name__}")
+    return f"({text})" if precedence < parent_precedence else text
+
+
+def _is_value(node):
+    return isinstance(node, ast.Constant) or (isinstance(node, ast.Name) and node.id in CONSTANTS)
+
+
+def _reduce_once(node):
+    """Avalia a primeira operação (da esquerda para a direita) cujos operandos já são valores."""
+    if isinstance(node, ast.BinOp):
+        if _is_value(node.left) and _is_value(node.right):
+            return ast.Constant(evaluate(node)), True
+        for field in ("left", "right"):
+            child, reduced = _reduce_once(getattr(node, field))
+            if reduced:
+                setattr(node, field, child)
+                return node, True
+    elif isinstance(node, (ast.UnaryOp, ast.Call)):
+        operand = node.operand if isinstance(node, ast.UnaryOp) else node.args[0]
+        if _is_value(operand):
+            return ast.Constant(evaluate(node)), True
+        child, reduced = _reduce_once(operand)
+        if reduced:
+            if isinstance(node, ast.UnaryOp):
+                node.operand = child
+            else:
+                node.args[0] = child
+            return node, True
+    return node, False
+
+
+def solve_expression(expression):
+    """Avalia uma expressão e retorna o resultado com os passos intermediários."""
+    tree = parse_exact(expression)
+    result = evaluate(tree)
+
+    steps = [_format_node(tree)]
+    while not _is_value(tree) and len(steps) <= MAX_STEPS:
+        tree, _ = _reduce_once(tree)
+        # Sinais unários são reduzidos sem mudar o texto; evita repetir o passo
+        if _format_node(tree) != steps[-1]:
+            steps.append(_format_node(tree))
+
+    lines = ["**Resolução passo a passo:**", ""]
+    lines += [f"{i}. {step}" for i, step in enumerate(steps[:-1], start=1)]
+    lines += ["", f"**Resultado:** {format_number(result)}"]
+    return "\n".join(lines)
+
+
+def solve_equation(expression):
+    """
+    Resolve equações polinomiais de grau 1 ou 2 na variável x.
+
+    O polinômio f(x) = lado esquerdo - lado direito é amostrado em alguns pontos para
+    obter os coeficientes; pontos extras confirmam que f é de fato um polinômio de
+    grau até 2 (caso contrário a consulta é repassada ao agente).
+    """
+    left, right = expression.split("=")
+    tree = parse_exact(f"({left}) - ({right})")
+
+    def f(x):
+        return evaluate(tree, Fraction(x))
+
+    try:
+        c = f(0)
+        a = (f(2) - 2 * f(1) + f(0)) / 2
+        b = f(1) - f(0) - a
+        checks = all(a * x * x + b * x + c == f(x) for x in (3, 7, -5))
+    except (ZeroDivisionError, TypeError):
+        raise UnsupportedExpression("Equação não polinomial") from None
+    if not checks or not all(isinstance(v, Fraction) for v in (a, b, c)):
+        raise UnsupportedExpression("Equação não polinomial de grau até 2")
+
+    lines = ["**Resolução passo a passo:**", "",
+             f"1. Equação: {_format_node(parse_exact(left.strip()))} = {_format_node(parse_exact(right.strip()))}"]
+    if a == 0:
+        lines.append(f"2. Passando todos os termos para o lado esquerdo: "
+                     f"{_plain(b)}x + {_plain(c)} = 0".replace("+ -", "- "))
+        if b == 0:
+            conclusion = ("A equação é verdadeira para qualquer valor de x."
+                          if c == 0 else "A equação não tem solução.")
+            lines += ["", f"**Resultado:** {conclusion}"]
+        else:
+            lines.append(f"3. Isolando x: x = {_plain(-c)} / {_plain(b)}")
+            lines += ["", f"**Resultado:** x = {format_number(-c / b)}"]
+        return "\n".join(lines)
+
+    delta = b * b - 4 * a * c
+    lines.append(f"2. Forma geral ax² + bx + c = 0, com a = {_plain(a)}, "
+                 f"b = {_plain(b)}, c = {_plain(c)}")
+    lines.append(f"3. Δ = b² - 4ac = {_plain(delta)}")
+    if delta < 0:
+        lines += ["", "**Resultado:** Δ < 0, a equação não tem raízes reais."]
+        return "\n".join(lines)
+
+    root = _sqrt(delta)
+    x1, x2 = (-b + root) / (2 * a), (-b - root) / (2 * a)
+    lines.append("4. Fórmula de Bhaskara: x = (-b ± √Δ) / 2a")
+    if delta == 0:
+        lines += ["", f"**Resultado:** x = {format_number(x1)} (raiz dupla)"]
+    else:
+        lines += ["", f"**Resultado:** x₁ = {format_number(x1)}, x₂ = {format_number(x2)}"]
+    return "\n".join(lines)
+
+
+def solve_locally(query):
+    """
+    Resolve localmente, sem chamada ao modelo, expressões e equações simples.
+
+    Args:
+        query: A consulta do aluno
+
+    Returns:
+        str: Resposta formatada passo a passo, ou None se a consulta precisa do agente
+    """
+    expression = extract_expression(query)
+    if expression is None or expression.count("=") > 1:
+        return None
+    has_variable = re.search(rf"\b{VARIABLE}\b", expression) is not None
+    try:
+        if "=" in expression:
+            # Sem x, "2 + 2 = 4" é uma afirmação a conferir, não uma equação
+            return solve_equation(expression) if has_variable else None
+        if has_variable:
+            return None
+        return solve_expression(expression)
+    except (SyntaxError, UnsupportedExpression, ZeroDivisionError, ValueError, OverflowError):
+        return None
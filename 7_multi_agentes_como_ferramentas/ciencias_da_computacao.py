@@ -1,6 +1,7 @@
 from strands import Agent, tool
-from strands.models import BedrockModel
-from strands_tools import python_repl, shell, file_read, file_write, editor
+from registro_de_especialistas import specialists
+from memoizacao import memoized
+from pool_de_interpretadores import interpreter_pool
 
 COMPUTER_SCIENCE_ASSISTANT_SYSTEM_PROMPT = """
 Você é o EspecialistaEmCiênciasDaComputação, um assistente especializado 
@@ -19,8 +20,8 @@ em educação em ciência da computação e programação. Suas capacidades incl
    - Princípios de redes e segurança
 
 3. Assistência Técnica:
-   - Execução e teste de código em tempo real
-   - Orientação e execução de comandos de shell
+   - Execução e teste de código Python em um interpretador isolado (sem rede nem comandos de shell)
+   - Explicação de comandos de shell, sem executá-los
    - Operações e gerenciamento de sistema de arquivos
    - Sugestões de edição e melhoria de código
 
@@ -32,7 +33,49 @@ em educação em ciência da computação e programação. Suas capacidades incl
 
 Concentre-se em fornecer explicações claras e práticas que demonstrem conceitos com exemplos executáveis. Use ferramentas de execução de código para ilustrar conceitos sempre que possível.
 """
+
+@tool
+def run_python(code: str) -> str:
+    """
+    Executa código Python em um interpretador separado e já inicializado, com limites de
+    memória, de tamanho de arquivo e de tempo, sem acesso à rede nem a outros processos;
+    arquivos só podem ser gravados no diretório de trabalho do interpretador. Cada execução começa com um namespace
+    vazio: variáveis de execuções anteriores não ficam disponíveis. Módulos comuns
+    (math, json, collections, itertools, numpy...) já estão importados.
+
+    Args:
+        code: O código Python a ser executado; o valor da última expressão é exibido
+
+    Returns:
+        A saída do código (stdout e stderr) e o traceback, em caso de erro
+    """
+    result = interpreter_pool.run(code)
+    parts = [result.output.rstrip()] if result.output.strip() else []
+    if result.error:
+        parts.append(result.error.rstrip())
+    parts.append(f"(executado em {result.duration * 1000:.1f} ms)")
+    return "\n".join(parts)
+
+def build_computer_science_agent():
+    # As ferramentas são importadas apenas quando o primeiro agente é construído
+    # Sem a ferramenta shell: comandos arbitrários teriam acesso irrestrito à máquina
+    # do usuário; o código Python roda nos workers isolados de pool_de_interpretadores
+    from strands_tools import file_read, file_write, editor
+
+    # Aquece os interpretadores enquanto o agente decide se vai executar código
+    interpreter_pool.start()
+
+    return Agent(
+        system_prompt=COMPUTER_SCIENCE_ASSISTANT_SYSTEM_PROMPT,
+        model=specialists.model(),
+        tools=[run_python, file_read, file_write, editor],
+    )
+
+# Execução de código é mais pesada; limita as consultas simultâneas
+specialists.register("ciencias_da_computacao", build_computer_science_agent, max_concurrency=2)
+
 @tool
+@memoized("computer_science_assistant")
 def computer_science_assistant(query: str) -> str:
     """
     Processa e responde a perguntas relacionadas à ciência da computação e programação usando um agente especializado com capacidades de execução de código.
@@ -48,15 +91,8 @@ def computer_science_assistant(query: str) -> str:
     try:
         print("Encaminhado para o Assistente de Ciências da Computação")
 
-        bedrock_model = BedrockModel(
-            model_id="us.anthropic.claude-3-7-sonnet-20250219-v1:0")
-
-        cs_agent = Agent(
-            system_prompt=COMPUTER_SCIENCE_ASSISTANT_SYSTEM_PROMPT,
-            model=bedrock_model,
-            tools=[python_repl, shell, file_read, file_write, editor],
-        )
-        agent_response = cs_agent(formatted_query)
+        with specialists.agent("ciencias_da_computacao") as cs_agent:
+            agent_response = cs_agent(formatted_query)
         text_response = str(agent_response)
 
         if len(text_response) > 0:
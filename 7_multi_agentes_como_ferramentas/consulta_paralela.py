@@ -0,0 +1,70 @@
+"""
+Consulta Paralela a Vários Especialistas
+
+Este módulo foi desenvolvido como exemplo para a sessão "AIM307" do AWS Summit São Paulo 2025.
+
+Perguntas multidisciplinares ("calcule a área e escreva uma redação sobre ela")
+exigiriam que o orquestrador chamasse um especialista de cada vez, somando os tempos de
+resposta. A ferramenta multi_specialist_assistant recebe a parte da pergunta destinada
+a cada especialista e os consulta em paralelo, de modo que o tempo total fica próximo
+ao do especialista mais lento. Os módulos dos especialistas são importados apenas
+quando consultados.
+"""
+
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+
+from strands import tool
+
+# Especialistas disponíveis para consulta simultânea (módulo, ferramenta), na ordem em que
+# as respostas são apresentadas. Os módulos são importados apenas quando consultados.
+SPECIALISTS = {
+    "Matemática": ("matematica", "math_assistant"),
+    "Português": ("portugues", "portuguese_assistant"),
+    "Idiomas": ("idiomas", "language_assistant"),
+    "Ciências da Computação": ("ciencias_da_computacao", "computer_science_assistant"),
+    "Conhecimento Geral": ("generalista", "general_assistant"),
+}
+
+
+def _load_specialist(name):
+    module_name, tool_name = SPECIALISTS[name]
+    return getattr(importlib.import_module(module_name), tool_name)
+
+
+@tool
+def multi_specialist_assistant(math_query: str = "",
+                               portuguese_query: str = "",
+                               language_query: str = "",
+                               computer_science_query: str = "",
+                               general_query: str = "") -> str:
+    """
+    Consulta vários especialistas ao mesmo tempo para perguntas que envolvem mais de uma disciplina.
+    Preencha apenas os campos das disciplinas necessárias, cada um com a parte da pergunta que cabe
+    àquele especialista. As consultas são executadas em paralelo e as respostas são reunidas.
+
+    Args:
+        math_query: Parte da pergunta destinada ao Assistente de Matemática
+        portuguese_query: Parte da pergunta destinada ao Assistente de Português
+        language_query: Parte da pergunta destinada ao Assistente de Idiomas
+        computer_science_query: Parte da pergunta destinada ao Assistente de Ciências da Computação
+        general_query: Parte da pergunta destinada ao Assistente Geral
+
+    Returns:
+        As respostas de cada especialista consultado, separadas por disciplina
+    """
+    queries = dict(zip(SPECIALISTS, [math_query, portuguese_query, language_query,
+                                     computer_science_query, general_query]))
+    queries = {name: query for name, query in queries.items() if query.strip()}
+
+    if not queries:
+        return "Nenhuma consulta foi informada para os especialistas."
+
+    print(f"Encaminhado para {len(queries)} especialistas em paralelo")
+
+    with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+        futures = {name: executor.submit(_load_specialist(name), query)
+                   for name, query in queries.items()}
+
+    # Cada especialista já converte suas falhas em uma mensagem de erro
+    return "\n\n".join(f"## {name}\n\n{future.result()}" for name, future in futures.items())
@@ -1,5 +1,6 @@
 from strands import Agent, tool
-from strands.models import BedrockModel
+from registro_de_especialistas import specialists
+from memoizacao import memoized
 
 GENERAL_ASSISTANT_SYSTEM_PROMPT = """
 Você é o AssistenteGeral, um assistente conciso de conhecimento geral 
@@ -29,7 +30,17 @@ para tópicos fora de domínios especializados. Suas características principais
 Sempre mantenha a precisão enquanto prioriza a concisão e clareza em cada resposta, e nunca se esqueça de reconhecer seu status de não-especialista no início de suas respostas.
 """
 
+def build_general_agent():
+    return Agent(
+        system_prompt=GENERAL_ASSISTANT_SYSTEM_PROMPT,
+        model=specialists.model(),
+        tools=[],
+    )
+
+specialists.register("generalista", build_general_agent)
+
 @tool
+@memoized("general_assistant")
 def general_assistant(query: str) -> str:
     """
     Lida com consultas de conhecimento geral que estão fora de domínios especializados.
@@ -47,15 +58,8 @@ def general_assistant(query: str) -> str:
     try:
         print("Encaminhado para o Assistente Geral")
 
-        bedrock_model = BedrockModel(
-            model_id="us.anthropic.claude-3-7-sonnet-20250219-v1:0")
-
-        general_agent = Agent(
-            system_prompt=GENERAL_ASSISTANT_SYSTEM_PROMPT,
-            model=bedrock_model,
-            tools=[],  
-        )
-        agent_response = general_agent(formatted_query)
+        with specialists.agent("generalista") as general_agent:
+            agent_response = general_agent(formatted_query)
         text_response = str(agent_response)
 
         if len(text_response) > 0:
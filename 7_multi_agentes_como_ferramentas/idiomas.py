@@ -1,6 +1,10 @@
+import json
+
 from strands import Agent, tool
-from strands.models import BedrockModel
-from strands_tools import http_request
+from registro_de_especialistas import specialists
+from memoizacao import memoized
+from memoria_de_traducao import (LANGUAGES, join_segments, parse_translation_request,
+                                 split_segments, translation_memory)
 
 LANGUAGE_ASSISTANT_SYSTEM_PROMPT = """
 Você é o AssistenteDeIdiomas, um assistente especializado em 
@@ -29,7 +33,94 @@ Mantenha a precisão enquanto garante que as traduções sejam naturais e contex
 """
 
 
+def build_language_agent():
+    # As ferramentas são importadas apenas quando o primeiro agente é construído
+    from strands_tools import http_request
+
+    return Agent(
+        system_prompt=LANGUAGE_ASSISTANT_SYSTEM_PROMPT,
+        model=specialists.model(),
+        tools=[http_request],
+    )
+
+specialists.register("idiomas", build_language_agent)
+
+def parse_segment_translations(response, expected):
+    """Extrai do texto do agente o array JSON com uma tradução por segmento."""
+    text = str(response)
+    start, end = text.find("["), text.rfind("]")
+    if start == -1 or end < start:
+        return None
+    try:
+        translations = json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return None
+    if (not isinstance(translations, list) or len(translations) != expected
+            or not all(isinstance(t, str) for t in translations)):
+        return None
+    return translations
+
+def translate_with_memory(request):
+    """
+    Traduz segmento a segmento, reutilizando localmente apenas os segmentos presentes
+    na memória de tradução de forma exata. Os demais vão ao agente; quando a memória
+    tem um segmento parecido, a tradução dele segue como sugestão para pós-edição.
+
+    Returns:
+        str: A tradução formatada, ou None se o agente não devolveu as traduções no
+            formato esperado
+    """
+    memory = translation_memory()
+    segments, separators = split_segments(request.text)
+    translations = [None] * len(segments)
+    suggestions = {}
+
+    for i, segment in enumerate(segments):
+        match = memory.lookup(request.source_language, request.target_language, segment)
+        if match is None:
+            continue
+        translation, score, source_text = match
+        if score == 1.0:
+            translations[i] = translation
+        else:
+            suggestions[i] = {"segmento_parecido": source_text, "traducao_do_parecido": translation}
+
+    novel = [i for i, translation in enumerate(translations) if translation is None]
+    source_name = LANGUAGES.get(request.source_language, ("idioma detectado",))[0]
+    target_name = LANGUAGES[request.target_language][0]
+
+    if novel:
+        segment_query = (
+            f"Traduza cada segmento a seguir do {source_name} para o {target_name}. "
+            "Alguns segmentos trazem a tradução de um segmento parecido da memória de "
+            "tradução: use-a como ponto de partida, mas corrija tudo o que difere do novo "
+            "segmento (números, horários, nomes, negações). Responda apenas com um array "
+            "JSON de strings, na mesma ordem, com uma tradução por segmento e sem "
+            "comentários.\n\n"
+            + json.dumps([{"segmento": segments[i], **suggestions.get(i, {})} for i in novel],
+                         ensure_ascii=False)
+        )
+        with specialists.agent("idiomas") as language_agent:
+            agent_response = language_agent(segment_query)
+
+        novel_translations = parse_segment_translations(agent_response, len(novel))
+        if novel_translations is None:
+            return None
+        for i, translation in zip(novel, novel_translations):
+            translations[i] = translation
+            memory.store(request.source_language, request.target_language, segments[i], translation)
+
+    print(f"Memória de tradução: {len(segments) - len(novel)} de {len(segments)} segmentos reutilizados")
+    return (
+        f"**Tradução ({source_name} → {target_name}):**\n\n"
+        f"{join_segments(translations, separators)}\n\n"
+        f"_Memória de tradução: {len(segments) - len(novel)} segmentos exatos, "
+        f"{len(suggestions)} revisados a partir de sugestões e "
+        f"{len(novel) - len(suggestions)} traduzidos pelo modelo._"
+    )
+
 @tool
+@memoized("language_assistant")
 def language_assistant(query: str) -> str:
     """
     Processa e responde a consultas de tradução e aprendizado de idiomas estrangeiros.
@@ -45,15 +136,15 @@ def language_assistant(query: str) -> str:
     try:
         print("Encaminhado para o Assistente de Idiomas")
 
-        bedrock_model = BedrockModel(
-            model_id="us.anthropic.claude-3-7-sonnet-20250219-v1:0")
+        # Pedidos de tradução explícitos passam pela memória de tradução
+        request = parse_translation_request(query)
+        if request is not None:
+            translated = translate_with_memory(request)
+            if translated is not None:
+                return translated
 
-        language_agent = Agent(
-            system_prompt=LANGUAGE_ASSISTANT_SYSTEM_PROMPT,
-            model=bedrock_model,
-            tools=[http_request],
-        )
-        agent_response = language_agent(formatted_query)
+        with specialists.agent("idiomas") as language_agent:
+            agent_response = language_agent(formatted_query)
         text_response = str(agent_response)
 
         if len(text_response) > 0:
@@ -1,6 +1,7 @@
 from strands import Agent, tool
-from strands.models import BedrockModel
-from strands_tools import calculator
+from registro_de_especialistas import specialists
+from memoizacao import memoized
+from avaliador_local import solve_locally
 
 MATH_ASSISTANT_SYSTEM_PROMPT = """
 Você é o mago da matemática, um assistente especializado em educação matemática. Suas capacidades incluem:
@@ -26,7 +27,20 @@ Você é o mago da matemática, um assistente especializado em educação matem
 Concentre-se na clareza e na resolução sistemática de problemas, garantindo que os alunos entendam os conceitos subjacentes.
 """
 
+def build_math_agent():
+    # As ferramentas são importadas apenas quando o primeiro agente é construído
+    from strands_tools import calculator
+
+    return Agent(
+        system_prompt=MATH_ASSISTANT_SYSTEM_PROMPT,
+        model=specialists.model(),
+        tools=[calculator],
+    )
+
+specialists.register("matematica", build_math_agent)
+
 @tool
+@memoized("math_assistant")
 def math_assistant(query: str) -> str:
     """
     Processa e responde a consultas relacionadas à matemática usando um agente especializado em matemática.
@@ -43,15 +57,14 @@ def math_assistant(query: str) -> str:
     try:
         print("Encaminhado para o Assistente de Matemática")
 
-        bedrock_model = BedrockModel(
-            model_id="us.anthropic.claude-3-7-sonnet-20250219-v1:0")
+        # Expressões e equações simples são resolvidas sem chamada ao modelo
+        local_answer = solve_locally(query)
+        if local_answer is not None:
+            print("Resolvido localmente pelo avaliador determinístico")
+            return local_answer
 
-        math_agent = Agent(
-            system_prompt=MATH_ASSISTANT_SYSTEM_PROMPT,
-            model=bedrock_model,
-            tools=[calculator],
-        )
-        agent_response = math_agent(formatted_query)
+        with specialists.agent("matematica") as math_agent:
+            agent_response = math_agent(formatted_query)
         text_response = str(agent_response)
 
         if len(text_response) > 0:
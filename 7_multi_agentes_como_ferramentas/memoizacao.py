@@ -0,0 +1,173 @@
+"""
+Memoização de Respostas dos Especialistas
+
+Este módulo foi desenvolvido como exemplo para a sessão "AIM307" do AWS Summit São Paulo 2025.
+
+Perguntas repetidas (ignorando maiúsculas e espaços) a um mesmo especialista são
+respondidas pela memória, sem chamar o modelo. As respostas ficam em memória, com
+validade (TTL) e descarte das menos usadas recentemente (LRU), e opcionalmente em um
+arquivo SQLite que sobrevive a reinicializações. Respostas de falha nunca são
+memorizadas.
+
+A memoização vale apenas para os especialistas listados em ESPECIALISTAS_MEMOIZADOS
+(desabilitada por padrão): especialistas com efeitos colaterais, como execução de
+código e escrita de arquivos, não devem ser memorizados.
+"""
+
+import functools
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+# Respostas que indicam falha do especialista nunca são memorizadas
+FAILURE_PREFIXES = ("Erro ao processar", "Peço desculpas", "Desculpe")
+
+
+def normalize_query(query):
+    """Normaliza a consulta: Unicode NFKC, minúsculas e espaços colapsados."""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", query).casefold()).strip()
+
+
+class AnswerMemo:
+    """
+    Memória de respostas dos especialistas, com LRU e TTL em memória e uma camada
+    opcional em disco (SQLite) que sobrevive a reinicializações.
+
+    Args:
+        allowlist: Nomes das ferramentas cujas respostas podem ser memorizadas
+        ttl_seconds: Tempo de validade de cada resposta
+        max_entries: Número máximo de respostas mantidas em memória
+        disk_path: Arquivo SQLite da camada em disco (None para desabilitar)
+    """
+
+    def __init__(self, allowlist=(), ttl_seconds=3600, max_entries=1000, disk_path=None):
+        self.allowlist = set(allowlist)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = None
+
+        if disk_path:
+            directory = os.path.dirname(disk_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._disk = sqlite3.connect(disk_path, check_same_thread=False)
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS specialist_answers ("
+                " key TEXT PRIMARY KEY, answer TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._disk.commit()
+
+    @staticmethod
+    def _key(specialist, query):
+        payload = f"{specialist}\n{normalize_query(query)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, specialist, query):
+        """Retorna a resposta memorizada, ou None se ausente ou expirada."""
+        key = self._key(specialist, query)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and now - entry[1] <= self.ttl_seconds:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self._memory.pop(key, None)
+
+            if self._disk is not None:
+                row = self._disk.execute(
+                    "SELECT answer, created_at FROM specialist_answers WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] <= self.ttl_seconds:
+                    self._remember(key, row[0], row[1])
+                    self.hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, specialist, query, answer):
+        key = self._key(specialist, query)
+        now = time.time()
+        with self._lock:
+            self._remember(key, answer, now)
+            if self._disk is not None:
+                self._disk.execute(
+                    "INSERT OR REPLACE INTO specialist_answers (key, answer, created_at)"
+                    " VALUES (?, ?, ?)",
+                    (key, answer, now),
+                )
+                self._disk.execute(
+                    "DELETE FROM specialist_answers WHERE created_at < ?",
+                    (now - self.ttl_seconds,),
+                )
+                self._disk.commit()
+
+    def _remember(self, key, answer, created_at):
+        self._memory[key] = (answer, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+
+def _memo_from_environment():
+    """
+    Configura a memória a partir de variáveis de ambiente (desabilitada por padrão):
+      ESPECIALISTAS_MEMOIZADOS: ferramentas memorizadas, separadas por vírgula; apenas
+          especialistas sem efeitos colaterais (ex: "math_assistant,language_assistant"),
+          nunca portuguese_assistant ou computer_science_assistant, que alteram arquivos
+      MEMOIZACAO_TTL: validade das respostas em segundos (padrão: 3600)
+      MEMOIZACAO_MAX_ENTRADAS: respostas mantidas em memória (padrão: 1000)
+      MEMOIZACAO_DISCO: arquivo SQLite da camada em disco (padrão: desabilitada)
+    """
+    allowlist = [name.strip() for name in os.environ.get("ESPECIALISTAS_MEMOIZADOS", "").split(",")]
+    return AnswerMemo(
+        allowlist=[name for name in allowlist if name],
+        ttl_seconds=float(os.environ.get("MEMOIZACAO_TTL", 3600)),
+        max_entries=int(os.environ.get("MEMOIZACAO_MAX_ENTRADAS", 1000)),
+        disk_path=os.environ.get("MEMOIZACAO_DISCO") or None,
+    )
+
+
+answer_memo = _memo_from_environment()
+
+
+def memoized(specialist, bypass=None):
+    """
+    Memoriza as respostas de uma ferramenta especialista, se ela estiver na allowlist.
+
+    Deve ser aplicado abaixo de @tool, preservando assinatura e docstring da função.
+    Especialistas com efeitos colaterais (ex: execução de código e escrita de arquivos)
+    devem ficar fora da allowlist.
+
+    Args:
+        specialist: Nome da ferramenta, usado na allowlist e na chave da memória
+        bypass: Função opcional que recebe a consulta e retorna verdadeiro quando ela
+            não deve ser memorizada (ex: consultas que alteram arquivos)
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(query):
+            if specialist not in answer_memo.allowlist or (bypass and bypass(query)):
+                return func(query)
+
+            answer = answer_memo.get(specialist, query)
+            if answer is not None:
+                print(f"Resposta memorizada de {specialist}")
+                return answer
+
+            answer = func(query)
+            if answer and not answer.startswith(FAILURE_PREFIXES):
+                answer_memo.put(specialist, query, answer)
+            return answer
+        return wrapper
+    return decorator
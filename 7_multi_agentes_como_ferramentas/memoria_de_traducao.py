@@ -0,0 +1,273 @@
+"""
+Memória de Tradução
+
+Este módulo foi desenvolvido como exemplo para a sessão "AIM307" do AWS Summit São Paulo 2025.
+
+Guarda em SQLite a tradução de cada segmento (frase ou linha) já traduzido, por par
+de idiomas. Uma solicitação de tradução é dividida em segmentos: os já conhecidos são
+reaproveitados e apenas os demais vão ao modelo. Segmentos parecidos com outros já
+traduzidos (similaridade acima do limiar) não são reutilizados diretamente, pois podem
+diferir em números, nomes ou negações; a tradução existente segue ao modelo como
+sugestão a revisar.
+"""
+
+import difflib
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass
+
+# Idiomas reconhecidos nas solicitações de tradução: código -> nomes aceitos
+LANGUAGES = {
+    "pt": ("português", "portugues", "portuguese"),
+    "en": ("inglês", "ingles", "english"),
+    "es": ("espanhol", "castelhano", "spanish"),
+    "fr": ("francês", "frances", "french"),
+    "de": ("alemão", "alemao", "german"),
+    "it": ("italiano", "italian"),
+}
+LANGUAGE_CODES = {name: code for code, names in LANGUAGES.items() for name in names}
+
+# Palavras frequentes usadas para detectar o idioma de origem quando ele não é informado
+STOPWORDS = {
+    "pt": {"o", "os", "as", "do", "da", "que", "não", "é", "um", "uma", "para", "com", "em", "você", "eu", "isso"},
+    "en": {"the", "is", "are", "of", "and", "to", "you", "i", "it", "in", "that", "what", "this", "my"},
+    "es": {"el", "los", "las", "que", "y", "es", "un", "una", "por", "para", "con", "usted", "yo", "muy"},
+    "fr": {"le", "les", "des", "et", "est", "un", "une", "que", "je", "vous", "pas", "suis", "nous"},
+    "de": {"der", "die", "das", "und", "ist", "ein", "eine", "nicht", "ich", "sie", "zu", "mit", "bin"},
+    "it": {"il", "lo", "gli", "di", "che", "è", "un", "una", "non", "per", "sono", "io", "della"},
+}
+
+_LANGUAGE = "|".join(sorted(map(re.escape, LANGUAGE_CODES), key=len, reverse=True))
+_VERB = r"(?:traduza|traduzir|traduz|translate)"
+_TO = r"(?:para o|para|pro|pra|ao|em|to)"
+_FROM = r"(?:do|de|from)"
+
+# Formas usuais de pedir uma tradução; os grupos nomeados extraem texto e idiomas
+REQUEST_PATTERNS = [
+    re.compile(rf"^{_VERB}(?:\s+{_FROM}\s+(?P<source>{_LANGUAGE}))?\s+{_TO}\s+(?P<target>{_LANGUAGE})\s*[:\-]\s*(?P<text>.+)$",
+               re.IGNORECASE | re.DOTALL),
+    re.compile(rf"^{_VERB}\s*:?\s+(?P<text>.+?)(?:\s+{_FROM}\s+(?P<source>{_LANGUAGE}))?\s+{_TO}\s+(?P<target>{_LANGUAGE})\s*[.?!]?$",
+               re.IGNORECASE | re.DOTALL),
+    re.compile(rf"^como (?:se )?diz(?:er)?\s+(?P<text>.+?)\s+em\s+(?P<target>{_LANGUAGE})\s*\??$",
+               re.IGNORECASE | re.DOTALL),
+]
+
+# Separadores entre segmentos: quebras de linha e espaços após fim de frase
+SEGMENT_SEPARATOR = re.compile(r"(\s*\n\s*|(?<=[.!?])\s+)")
+
+
+@dataclass
+class TranslationRequest:
+    """Solicitação de tradução extraída da consulta do usuário."""
+    text: str
+    source_language: str
+    target_language: str
+
+
+def normalize_segment(text):
+    """Normaliza um segmento: Unicode NFKC, minúsculas e espaços colapsados."""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text).casefold()).strip()
+
+
+def detect_language(text):
+    """Detecta o idioma pelas palavras frequentes; retorna "auto" se nenhum se destacar."""
+    words = re.findall(r"\w+", normalize_segment(text))
+    scores = {code: sum(word in stopwords for word in words) for code, stopwords in STOPWORDS.items()}
+    best = max(scores, key=scores.get)
+    ties = [code for code, score in scores.items() if score == scores[best]]
+    return best if scores[best] > 0 and len(ties) == 1 else "auto"
+
+
+def parse_translation_request(query):
+    """
+    Reconhece pedidos de tradução explícitos, como 'traduza "bom dia" para o inglês'.
+
+    Returns:
+        TranslationRequest: O texto e os idiomas, ou None se a consulta não é um pedido
+            de tradução reconhecido (ex: dúvidas de gramática ou de pronúncia)
+    """
+    for pattern in REQUEST_PATTERNS:
+        match = pattern.match(query.strip())
+        if not match:
+            continue
+        text = match.group("text").strip().strip("\"'“”‘’«»").strip()
+        if not text:
+            return None
+        target = LANGUAGE_CODES[match.group("target").lower()]
+        source = match.groupdict().get("source")
+        source = LANGUAGE_CODES[source.lower()] if source else detect_language(text)
+        if source == target:
+            return None
+        return TranslationRequest(text, source, target)
+    return None
+
+
+def split_segments(text):
+    """
+    Divide o texto em frases, preservando os separadores originais.
+
+    Returns:
+        tuple: Lista de segmentos e lista de separadores (um a menos que os segmentos)
+    """
+    parts = SEGMENT_SEPARATOR.split(text.strip())
+    return parts[0::2], parts[1::2]
+
+
+def join_segments(segments, separators):
+    """Reconstrói o texto a partir dos segmentos e dos separadores originais."""
+    pieces = [segments[0]]
+    for separator, segment in zip(separators, segments[1:]):
+        pieces += [separator, segment]
+    return "".join(pieces)
+
+
+class TranslationMemory:
+    """
+    Memória de tradução em SQLite, indexada por idioma de origem, idioma de destino e
+    texto normalizado de cada segmento.
+
+    Além da correspondência exata, busca segmentos parecidos entre os de tamanho
+    compatível com o limiar de similaridade (difflib.SequenceMatcher). Uma
+    correspondência aproximada pode diferir em números, nomes ou negações, então serve
+    apenas de sugestão para o modelo revisar, nunca de tradução pronta.
+
+    Args:
+        path: Arquivo SQLite da memória
+        threshold: Similaridade mínima (0 a 1) para aceitar uma correspondência aproximada
+        max_candidates: Número máximo de segmentos comparados em cada busca aproximada
+    """
+
+    def __init__(self, path, threshold=0.9, max_candidates=500):
+        self.threshold = threshold
+        self.max_candidates = max_candidates
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS segments ("
+            " source_language TEXT NOT NULL, target_language TEXT NOT NULL,"
+            " normalized TEXT NOT NULL, length INTEGER NOT NULL,"
+            " source_text TEXT NOT NULL, translation TEXT NOT NULL,"
+            " created_at REAL NOT NULL, uses INTEGER NOT NULL DEFAULT 0,"
+            " PRIMARY KEY (source_language, target_language, normalized))"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS segments_by_length"
+            " ON segments (source_language, target_language, length)"
+        )
+        self._connection.commit()
+
+    def lookup(self, source_language, target_language, segment):
+        """
+        Procura a tradução de um segmento.
+
+        Returns:
+            tuple: Tradução, similaridade (1.0 para correspondência exata) e segmento de
+                origem armazenado, ou None se não houver segmento parecido o suficiente
+        """
+        normalized = normalize_segment(segment)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT translation, source_text FROM segments"
+                " WHERE source_language = ? AND target_language = ? AND normalized = ?",
+                (source_language, target_language, normalized),
+            ).fetchone()
+            if row is not None:
+                self._touch(source_language, target_language, normalized)
+                self.exact_hits += 1
+                return row[0], 1.0, row[1]
+
+            match = self._fuzzy_match(source_language, target_language, normalized)
+            if match is None:
+                self.misses += 1
+                return None
+            candidate, source_text, translation, score = match
+            self._touch(source_language, target_language, candidate)
+            self.fuzzy_hits += 1
+            return translation, score, source_text
+
+    def _fuzzy_match(self, source_language, target_language, normalized):
+        # ratio = 2M / (a + b) só alcança o limiar se a razão entre os tamanhos for
+        # ao menos threshold / (2 - threshold), o que restringe os candidatos pelo índice
+        length = len(normalized)
+        bound = self.threshold / (2 - self.threshold)
+        rows = self._connection.execute(
+            "SELECT normalized, source_text, translation FROM segments"
+            " WHERE source_language = ? AND target_language = ? AND length BETWEEN ? AND ?"
+            " ORDER BY uses DESC LIMIT ?",
+            (source_language, target_language, math.ceil(length * bound),
+             math.floor(length / bound), self.max_candidates),
+        ).fetchall()
+
+        best = None
+        matcher = difflib.SequenceMatcher(autojunk=False)
+        matcher.set_seq2(normalized)
+        for candidate, source_text, translation in rows:
+            matcher.set_seq1(candidate)
+            if matcher.real_quick_ratio() < self.threshold or matcher.quick_ratio() < self.threshold:
+                continue
+            score = matcher.ratio()
+            if score >= self.threshold and (best is None or score > best[2]):
+                best = (candidate, source_text, translation, score)
+        return best
+
+    def _touch(self, source_language, target_language, normalized):
+        self._connection.execute(
+            "UPDATE segments SET uses = uses + 1"
+            " WHERE source_language = ? AND target_language = ? AND normalized = ?",
+            (source_language, target_language, normalized),
+        )
+        self._connection.commit()
+
+    def store(self, source_language, target_language, segment, translation):
+        normalized = normalize_segment(segment)
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO segments (source_language, target_language, normalized,"
+                " length, source_text, translation, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (source_language, target_language, normalized, len(normalized),
+                 segment, translation, time.time()),
+            )
+            self._connection.commit()
+
+    def metrics(self):
+        return {
+            "exatos": self.exact_hits,
+            "aproximados": self.fuzzy_hits,
+            "novos": self.misses,
+        }
+
+    def close(self):
+        self._connection.close()
+
+
+_translation_memory = None
+_translation_memory_lock = threading.Lock()
+
+
+def translation_memory():
+    """
+    Retorna a memória de tradução compartilhada, aberta no primeiro uso e configurada
+    por variáveis de ambiente:
+      MEMORIA_DE_TRADUCAO: arquivo SQLite (padrão: cache/memoria_de_traducao.sqlite3)
+      MEMORIA_DE_TRADUCAO_LIMIAR: similaridade mínima das sugestões aproximadas (padrão: 0.9)
+    """
+    global _translation_memory
+    with _translation_memory_lock:
+        if _translation_memory is None:
+            _translation_memory = TranslationMemory(
+                os.environ.get("MEMORIA_DE_TRADUCAO", os.path.join("cache", "memoria_de_traducao.sqlite3")),
+                threshold=float(os.environ.get("MEMORIA_DE_TRADUCAO_LIMIAR", 0.9)),
+            )
+        return _translation_memory
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Perfil de Inicialização
+
+Mede o custo de importar um módulo (por padrão, o professor) em um processo Python
+novo, usando a opção -X importtime do interpretador, e exibe os imports mais caros.
+Útil para acompanhar o tempo de cold start de workers de curta duração.
+
+Uso:
+    python perfil_inicializacao.py [modulo] [--top N]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S.*)$")
+
+
+def profile_imports(module_name, cwd=None):
+    """
+    Importa o módulo em um processo novo e coleta o custo de cada import.
+
+    Args:
+        module_name: Nome do módulo a ser importado
+        cwd: Diretório de trabalho do processo (padrão: diretório deste arquivo)
+
+    Returns:
+        tuple: Tempo total do processo em segundos e lista de dicionários com
+            "modulo", "proprio_us", "acumulado_us" e "nivel" de cada import
+    """
+    cwd = cwd or os.path.dirname(os.path.abspath(__file__))
+    started_at = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        cwd=cwd, capture_output=True, text=True,
+    )
+    elapsed = time.perf_counter() - started_at
+    if completed.returncode != 0:
+        raise RuntimeError(f"Falha ao importar '{module_name}':\n{completed.stderr[-2000:]}")
+
+    imports = []
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports.append({
+                "modulo": name.strip(),
+                "proprio_us": int(self_us),
+                "acumulado_us": int(cumulative_us),
+                "nivel": (len(indent) - 1) // 2,
+            })
+    return elapsed, imports
+
+
+def format_report(module_name, elapsed, imports, top=20):
+    """Monta o relatório com o tempo total e os imports de maior custo acumulado."""
+    top_level = [i for i in imports if i["nivel"] == 0]
+    total_us = sum(i["acumulado_us"] for i in top_level)
+    lines = [
+        f"Perfil de inicialização de '{module_name}'",
+        f"Processo completo: {elapsed * 1000:.0f} ms | imports: {total_us / 1000:.0f} ms "
+        f"| módulos importados: {len(imports)}",
+        "",
+        f"{'acumulado (ms)':>15} {'próprio (ms)':>13}  módulo",
+    ]
+    for entry in sorted(imports, key=lambda i: i["acumulado_us"], reverse=True)[:top]:
+        lines.append(
+            f"{entry['acumulado_us'] / 1000:>15.1f} {entry['proprio_us'] / 1000:>13.1f}  "
+            f"{'  ' * entry['nivel']}{entry['modulo']}"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Perfil de tempo de import na inicialização")
+    parser.add_argument("modulo", nargs="?", default="professor",
+                        help="Módulo a ser importado (padrão: professor)")
+    parser.add_argument("--top", type=int, default=20,
+                        help="Quantidade de imports exibidos")
+    args = parser.parse_args()
+
+    elapsed, imports = profile_imports(args.modulo)
+    print(format_report(args.modulo, elapsed, imports, args.top))
@@ -0,0 +1,405 @@
+"""
+Pool de Interpretadores Python
+
+Este módulo foi desenvolvido como exemplo para a sessão "AIM307" do AWS Summit São Paulo 2025.
+
+Executa o código do Assistente de Ciências da Computação em processos Python
+separados e já inicializados, em vez de iniciar um interpretador (e importar numpy e
+afins) a cada execução. Cada worker roda isolado em um diretório temporário próprio,
+sem herdar o ambiente do processo principal, com limites de memória, arquivos e tempo
+de CPU e um hook de auditoria que recusa rede, novos processos e escrita fora desse
+diretório. Cada execução começa com um namespace vazio; um worker que estoura o tempo
+limite é encerrado e substituído.
+"""
+
+import ast
+import atexit
+import contextlib
+import importlib
+import io
+import multiprocessing
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+
+try:
+    import resource
+except ImportError:  # Windows: os workers rodam sem limites de recursos
+    resource = None
+
+# Módulos importados na inicialização de cada worker; imports do código executado
+# também permanecem em sys.modules e são reaproveitados nas execuções seguintes
+PREWARM_MODULES = (
+    "collections", "datetime", "decimal", "fractions", "functools", "heapq", "itertools",
+    "json", "math", "random", "re", "statistics", "string", "numpy",
+)
+
+MAX_OUTPUT_CHARS = 10000
+
+# Eventos de auditoria (PEP 578) sempre recusados no worker: rede, novos processos,
+# sinais para outros processos e código nativo via ctypes
+BLOCKED_EVENTS = {
+    "socket.connect", "socket.bind", "socket.sendto", "socket.sendmsg",
+    "socket.getaddrinfo", "socket.gethostbyname", "socket.gethostbyaddr",
+    "subprocess.Popen", "os.system", "os.exec", "os.posix_spawn", "os.spawn",
+    "os.fork", "os.forkpty", "os.kill", "os.killpg", "pty.spawn",
+    "ctypes.dlopen", "ctypes.dlsym", "ctypes.cdata", "ctypes.call_function",
+    "webbrowser.open",
+}
+# Eventos que alteram o sistema de arquivos: permitidos apenas no diretório do worker
+# (nome do evento -> posições dos argumentos que são caminhos)
+WRITE_EVENTS = {
+    "os.remove": (0,), "os.rmdir": (0,), "os.mkdir": (0,), "os.rename": (0, 1),
+    "os.chmod": (0,), "os.chown": (0,), "os.symlink": (0, 1), "os.link": (0, 1),
+    "os.truncate": (0,), "os.utime": (0,), "shutil.rmtree": (0,), "shutil.move": (0, 1),
+}
+WRITE_FLAGS = os.O_WRONLY | os.O_RDWR | os.O_CREAT | os.O_APPEND | os.O_TRUNC
+
+# Comando do processo worker: um interpretador novo, que não reimporta o script principal
+WORKER_COMMAND = (
+    "import sys; sys.path.insert(0, {directory!r}); import pool_de_interpretadores; "
+    "pool_de_interpretadores._worker_main({fd}, {workdir!r}, {modules!r}, {memory}, {file_size})"
+)
+
+# Variáveis de ambiente repassadas ao worker; as demais (credenciais da AWS, chaves
+# de API, PYTHONPATH...) não são herdadas
+INHERITED_ENVIRONMENT = ("PATH", "LANG", "LC_ALL", "TZ", "SYSTEMROOT")
+
+
+@dataclass
+class ExecutionResult:
+    """Resultado de uma execução de código em um worker."""
+    output: str
+    error: str = ""
+    duration: float = 0.0
+    timed_out: bool = False
+
+
+def _apply_limits(memory_limit_mb, file_size_limit_mb):
+    if resource is None:
+        return
+    memory = memory_limit_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+    file_size = file_size_limit_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_FSIZE, (file_size, file_size))
+    resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+    resource.setrlimit(resource.RLIMIT_NOFILE, (64, 64))
+
+
+def _limit_cpu_time(seconds):
+    """Limita o tempo de CPU da próxima execução; ao estourar, o worker recebe SIGXCPU."""
+    if resource is None:
+        return
+    used = resource.getrusage(resource.RUSAGE_SELF)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    limit = int(used.ru_utime + used.ru_stime + seconds) + 1
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+
+
+def _install_audit_hook(workdir):
+    """
+    Recusa, no processo worker, rede, novos processos, ctypes e escrita fora de workdir.
+
+    Um hook de auditoria não pode ser removido depois de instalado, nem pelo código
+    executado; as leituras continuam permitidas (necessárias para os imports).
+    """
+    root = os.path.realpath(workdir)
+
+    def inside(path):
+        if isinstance(path, int):  # descritor de arquivo já aberto
+            return True
+        path = os.fsdecode(path)
+        return os.path.commonpath([root, os.path.realpath(path)]) == root
+
+    def hook(event, args):
+        if event in BLOCKED_EVENTS:
+            raise PermissionError(f"Operação não permitida no interpretador: {event}")
+        if event == "open":
+            path, mode, flags = args
+            writing = (mode is not None and any(c in mode for c in "wax+")) or (flags & WRITE_FLAGS)
+            if path is not None and writing and not inside(path):
+                raise PermissionError(f"Escrita permitida apenas no diretório de trabalho: {path}")
+        elif event in WRITE_EVENTS:
+            for position in WRITE_EVENTS[event]:
+                if not inside(args[position]):
+                    raise PermissionError(
+                        f"Alterações permitidas apenas no diretório de trabalho: {args[position]}")
+
+    sys.addaudithook(hook)
+
+
+def _execute(code, preloaded):
+    """Executa o código em um namespace novo, exibindo o valor da última expressão como no REPL."""
+    namespace = {"__name__": "__main__", "__builtins__": __builtins__, **preloaded}
+    tree = ast.parse(code, filename="<interpretador>", mode="exec")
+    last_expression = None
+    if tree.body and isinstance(tree.body[-1], ast.Expr):
+        last_expression = ast.Expression(tree.body.pop().value)
+
+    exec(compile(tree, "<interpretador>", "exec"), namespace)
+    if last_expression is not None:
+        value = eval(compile(last_expression, "<interpretador>", "eval"), namespace)
+        if value is not None:
+            print(repr(value))
+
+
+def _format_error(error):
+    """Formata o traceback mostrando apenas os quadros do código executado."""
+    frames = error.__traceback__
+    while frames is not None and frames.tb_frame.f_code.co_filename != "<interpretador>":
+        frames = frames.tb_next
+    return "".join(traceback.format_exception(type(error), error, frames))
+
+
+def _worker_main(fd, workdir, prewarm_modules, memory_limit_mb, file_size_limit_mb):
+    """Laço do processo worker: pré-importa os módulos e executa cada código recebido."""
+    connection = Connection(fd)
+    os.chdir(workdir)
+    # Bibliotecas numéricas com uma única thread cabem no limite de memória virtual
+    for variable in ("OPENBLAS_NUM_THREADS", "OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ.setdefault(variable, "1")
+    preloaded = {}
+    for name in prewarm_modules:
+        try:
+            preloaded[name] = importlib.import_module(name)
+        except ImportError:
+            pass
+    _apply_limits(memory_limit_mb, file_size_limit_mb)
+    _install_audit_hook(workdir)
+    connection.send("pronto")
+
+    while True:
+        try:
+            code, cpu_seconds = connection.recv()
+        except EOFError:
+            break
+        _limit_cpu_time(cpu_seconds)
+        output = io.StringIO()
+        error = ""
+        started_at = time.perf_counter()
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            try:
+                _execute(code, preloaded)
+            except BaseException as e:  # inclui SystemExit e KeyboardInterrupt do código do usuário
+                error = _format_error(e)
+        connection.send((output.getvalue()[-MAX_OUTPUT_CHARS:], error, time.perf_counter() - started_at))
+
+
+class _Worker:
+    def __init__(self, prewarm_modules, memory_limit_mb, file_size_limit_mb):
+        self.connection, child_connection = multiprocessing.Pipe()
+        # Criado pelo processo principal, que o remove ao encerrar o worker
+        self.workdir = tempfile.mkdtemp(prefix="interpretador_")
+        command = WORKER_COMMAND.format(
+            directory=os.path.dirname(os.path.abspath(__file__)), fd=child_connection.fileno(),
+            workdir=self.workdir, modules=tuple(prewarm_modules), memory=memory_limit_mb,
+            file_size=file_size_limit_mb,
+        )
+        # O worker não herda o terminal nem o ambiente: roda em modo isolado (-I, sem
+        # PYTHONPATH nem site do usuário), com HOME e TMPDIR no seu diretório de trabalho
+        environment = {name: os.environ[name] for name in INHERITED_ENVIRONMENT if name in os.environ}
+        environment.update(HOME=self.workdir, TMPDIR=self.workdir)
+        try:
+            self.process = subprocess.Popen(
+                [sys.executable, "-I", "-c", command], pass_fds=(child_connection.fileno(),),
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                env=environment, cwd=self.workdir,
+            )
+        except OSError:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+            raise
+        finally:
+            child_connection.close()
+        self.executions = 0
+
+    def wait_ready(self, timeout):
+        if not self.connection.poll(timeout) or self.connection.recv() != "pronto":
+            raise RuntimeError("O worker do interpretador não inicializou a tempo")
+
+    def kill(self):
+        self.process.kill()
+        self.process.wait(timeout=1)
+        self.connection.close()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+# Colocado na fila por close() para acordar as chamadas de run() que aguardam um worker
+_CLOSED = object()
+
+
+class InterpreterPool:
+    """
+    Pool de processos Python pré-aquecidos para executar o código gerado pelos agentes.
+
+    Cada worker importa PREWARM_MODULES ao iniciar e roda isolado (ver abaixo), com
+    limites de memória, de arquivos abertos e de tamanho de arquivo (e de CPU por
+    execução), em um diretório temporário próprio, removido ao encerrar o worker. Cada
+    execução recebe um namespace novo, mas os módulos já importados são reaproveitados,
+    de modo que nem a inicialização do interpretador nem os imports pesados ficam no
+    caminho da consulta. Workers que estouram o tempo limite, morrem ou atingem o número
+    máximo de execuções são substituídos em segundo plano.
+
+    Isolamento dos workers:
+    - Ambiente mínimo: nenhuma variável do processo principal é herdada além de
+      INHERITED_ENVIRONMENT (sem credenciais nem chaves de API), e o interpretador
+      roda em modo isolado (-I)
+    - Um hook de auditoria (PEP 578) recusa rede, novos processos, sinais, ctypes e
+      qualquer escrita ou remoção de arquivos fora do diretório de trabalho
+
+    O isolamento é feito dentro do próprio interpretador e pelo sistema operacional
+    (rlimits), sem namespaces ou contêineres: basta para o código gerado pelos agentes
+    em uma demo, mas não é uma fronteira de segurança contra código malicioso
+    elaborado. Nesse caso, rode o exemplo dentro de um contêiner ou máquina virtual.
+
+    Args:
+        size: Número de workers
+        prewarm_modules: Módulos importados na inicialização de cada worker
+        memory_limit_mb: Limite de memória virtual de cada worker
+        file_size_limit_mb: Tamanho máximo dos arquivos escritos pelo código
+        timeout: Tempo máximo de cada execução em segundos
+        max_executions: Execuções por worker antes de ele ser reciclado
+    """
+
+    def __init__(self, size=2, prewarm_modules=PREWARM_MODULES, memory_limit_mb=1024,
+                 file_size_limit_mb=16, timeout=10, max_executions=100):
+        self.size = size
+        self.prewarm_modules = tuple(prewarm_modules)
+        self.memory_limit_mb = memory_limit_mb
+        self.file_size_limit_mb = file_size_limit_mb
+        self.timeout = timeout
+        self.max_executions = max_executions
+        self.executions = 0
+        self.replacements = 0
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+
+    def start(self):
+        """Inicia os workers em segundo plano; chamadas repetidas não têm efeito."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        for _ in range(self.size):
+            self._replace()
+        atexit.register(self.close)
+
+    def _spawn(self):
+        worker = None
+        try:
+            worker = _Worker(self.prewarm_modules, self.memory_limit_mb, self.file_size_limit_mb)
+            worker.wait_ready(timeout=60)
+        except Exception as e:
+            print(f"Falha ao iniciar worker do interpretador: {e}")
+            if worker is not None:
+                worker.kill()
+            worker = None
+        if self._closed:
+            if worker is not None:
+                worker.kill()
+            return
+        # None na fila sinaliza a run() que o worker não pôde ser criado
+        self._idle.put(worker)
+
+    def _replace(self, worker=None):
+        if worker is not None:
+            worker.kill()
+            self.replacements += 1
+        if not self._closed:
+            threading.Thread(target=self._spawn, daemon=True).start()
+
+    def run(self, code, timeout=None):
+        """
+        Executa o código em um worker livre, aguardando um se todos estiverem ocupados.
+
+        Returns:
+            ExecutionResult: Saída (stdout e stderr), traceback em caso de erro e duração
+
+        Raises:
+            RuntimeError: Se o pool foi encerrado
+        """
+        if self._closed:
+            raise RuntimeError("O pool de interpretadores foi encerrado")
+        self.start()
+        timeout = timeout or self.timeout
+        worker = self._idle.get()
+        if worker is _CLOSED:
+            self._idle.put(_CLOSED)
+            raise RuntimeError("O pool de interpretadores foi encerrado")
+        if worker is None:
+            self._replace()
+            return ExecutionResult("", "Não foi possível iniciar o interpretador.")
+
+        started_at = time.perf_counter()
+        try:
+            worker.connection.send((code, timeout))
+            if not worker.connection.poll(timeout):
+                self._replace(worker)
+                return ExecutionResult("", f"Execução interrompida após {timeout} segundos.",
+                                       time.perf_counter() - started_at, timed_out=True)
+            output, error, duration = worker.connection.recv()
+        except (EOFError, OSError, BrokenPipeError):
+            # O worker morreu (ex: limite de CPU ou falha do interpretador)
+            self._replace(worker)
+            return ExecutionResult("", "O interpretador foi encerrado durante a execução "
+                                       "(limite de recursos excedido?).",
+                                   time.perf_counter() - started_at)
+
+        self.executions += 1
+        worker.executions += 1
+        if self._closed:
+            worker.kill()
+        elif worker.executions >= self.max_executions:
+            self._replace(worker)
+        else:
+            self._idle.put(worker)
+        return ExecutionResult(output, error, duration)
+
+    def stats(self):
+        return {
+            "workers": self.size,
+            "ociosos": 0 if self._closed else self._idle.qsize(),
+            "execucoes": self.executions,
+            "substituicoes": self.replacements,
+        }
+
+    def close(self):
+        """Encerra os workers ociosos; os que estão em execução são encerrados ao terminar."""
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if worker is not None and worker is not _CLOSED:
+                worker.kill()
+        self._idle.put(_CLOSED)
+
+
+def _pool_from_environment():
+    """
+    Configura o pool a partir de variáveis de ambiente:
+      INTERPRETADORES: número de workers (padrão: 2)
+      INTERPRETADOR_MEMORIA_MB: limite de memória de cada worker (padrão: 1024)
+      INTERPRETADOR_TIMEOUT: tempo máximo de cada execução em segundos (padrão: 10)
+    """
+    return InterpreterPool(
+        size=int(os.environ.get("INTERPRETADORES", 2)),
+        memory_limit_mb=int(os.environ.get("INTERPRETADOR_MEMORIA_MB", 1024)),
+        timeout=float(os.environ.get("INTERPRETADOR_TIMEOUT", 10)),
+    )
+
+
+# Os workers só são iniciados no primeiro uso (ou ao construir o agente de computação)
+interpreter_pool = _pool_from_environment()
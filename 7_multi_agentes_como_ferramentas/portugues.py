@@ -1,6 +1,11 @@
+import json
+import os
+import re
+
 from strands import Agent, tool
-from strands.models import BedrockModel
-from strands_tools import file_read, file_write, editor
+from registro_de_especialistas import specialists
+from memoizacao import memoized
+from revisao_incremental import DocumentReviewer
 
 PORTUGUESE_ASSISTANT_SYSTEM_PROMPT = """
 Você é o mestre de Português, um assistente avançado de educação em língua portuguesa. Suas capacidades incluem:
@@ -28,7 +33,110 @@ Concentre-se em ser claro, encorajador e educativo em todas as interações. Sem
 """
 
 
+PARAGRAPH_REVIEWER_SYSTEM_PROMPT = """
+Você é um revisor de textos em língua portuguesa. Você recebe um array JSON de parágrafos
+de um documento e corrige ortografia, gramática, concordância, pontuação e clareza,
+preservando o sentido, o estilo do autor e a formatação (Markdown, citações, listas).
+Responda apenas com um array JSON, na mesma ordem e com o mesmo número de itens, em que
+cada item é um objeto {"texto": parágrafo revisado, "comentario": explicação breve das
+correções ou "" se o parágrafo já estava correto}.
+"""
+
+# Documentos com estas extensões podem ser revisados parágrafo a parágrafo
+REVIEWABLE_EXTENSIONS = (".txt", ".md", ".tex", ".rst")
+REVIEW_REQUEST = re.compile(r"\b(revis\w*|corrij\w*|corrigir|corre[cç][aã]o)\b", re.IGNORECASE)
+# Pedidos explícitos para gravar as correções no arquivo, e não apenas apresentá-las
+APPLY_REQUEST = re.compile(
+    r"\b(aplique|aplica|aplicar|grave|grava|gravar|salve|salva|salvar|sobrescreva|sobrescrever)\b",
+    re.IGNORECASE,
+)
+
+def build_portuguese_agent():
+    # As ferramentas são importadas apenas quando o primeiro agente é construído
+    from strands_tools import file_read, file_write, editor
+
+    return Agent(
+        system_prompt=PORTUGUESE_ASSISTANT_SYSTEM_PROMPT,
+        model=specialists.model(),
+        tools=[review_document, editor, file_read, file_write],
+    )
+
+def build_paragraph_reviewer_agent():
+    return Agent(
+        system_prompt=PARAGRAPH_REVIEWER_SYSTEM_PROMPT,
+        model=specialists.model(),
+        callback_handler=None,
+    )
+
+specialists.register("portugues", build_portuguese_agent)
+specialists.register("revisor_de_paragrafos", build_paragraph_reviewer_agent)
+
+def review_paragraphs(paragraphs):
+    """Revisa um lote de parágrafos; retorna pares (texto, comentário) ou None se a resposta for inválida."""
+    with specialists.agent("revisor_de_paragrafos") as reviewer:
+        response = str(reviewer(json.dumps(paragraphs, ensure_ascii=False)))
+
+    start, end = response.find("["), response.rfind("]")
+    try:
+        items = json.loads(response[start:end + 1]) if start != -1 else None
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        return None
+    return [(str(item.get("texto", "")), str(item.get("comentario", ""))) for item in items]
+
+document_reviewer = None
+
+def get_document_reviewer():
+    """Cria o revisor de documentos no primeiro uso (o registro de revisões fica em cache/)."""
+    global document_reviewer
+    if document_reviewer is None:
+        document_reviewer = DocumentReviewer(
+            review_paragraphs,
+            os.path.join("cache", "revisoes.sqlite3"),
+            instructions=PARAGRAPH_REVIEWER_SYSTEM_PROMPT,
+        )
+    return document_reviewer
+
+@tool
+def review_document(path: str, apply: bool = False) -> str:
+    """
+    Revisa um documento de texto (.txt, .md, .tex, .rst) parágrafo a parágrafo. Apenas os
+    parágrafos novos ou alterados desde a última revisão são analisados, em paralelo. Por
+    padrão as correções são apenas apresentadas; com apply=True, são gravadas substituindo
+    somente os parágrafos alterados. Prefira esta ferramenta a ler e reescrever documentos
+    longos inteiros.
+
+    Args:
+        path: Caminho do documento
+        apply: Se True, grava as correções no arquivo. Use True apenas quando o usuário
+            pedir explicitamente para aplicar ou gravar as correções
+
+    Returns:
+        Resumo da revisão com as alterações de cada parágrafo no formato [-antes-]{+depois+}
+    """
+    if not os.path.isfile(path):
+        return f"Arquivo não encontrado: {path}"
+    return get_document_reviewer().review(path, apply=apply).summary()
+
+def find_document_to_review(query):
+    """Retorna o caminho do documento, se a consulta pede a revisão de um arquivo existente."""
+    if not REVIEW_REQUEST.search(query):
+        return None
+    for candidate in re.findall(r"[\w./\\~-]+", query):
+        candidate = os.path.expanduser(candidate.rstrip(".,;:"))
+        if candidate.lower().endswith(REVIEWABLE_EXTENSIONS) and os.path.isfile(candidate):
+            return candidate
+    return None
+
+def asks_to_apply(query):
+    """Indica se a consulta pede explicitamente para gravar as correções no arquivo."""
+    # Ignora os nomes de arquivo, que podem conter as mesmas palavras ("salva.md")
+    without_paths = re.sub(r"[\w./\\~-]+\.(?:txt|md|tex|rst)\b", " ", query, flags=re.IGNORECASE)
+    return APPLY_REQUEST.search(without_paths) is not None
+
 @tool
+@memoized("portuguese_assistant", bypass=find_document_to_review)
 def portuguese_assistant(query: str) -> str:
     """
     Processa e responde a consultas relacionadas à língua portuguesa, literatura e escrita.
@@ -44,15 +152,14 @@ def portuguese_assistant(query: str) -> str:
     try:
         print("Encaminhado para o Assistente de Português")
 
-        bedrock_model = BedrockModel(
-            model_id="us.anthropic.claude-3-7-sonnet-20250219-v1:0")
+        # Revisão de documentos vai direto para a revisão incremental, sem reenviar o texto todo;
+        # o arquivo só é regravado quando o pedido diz explicitamente para aplicar as correções
+        document = find_document_to_review(query)
+        if document is not None:
+            return review_document(document, apply=asks_to_apply(query))
 
-        portuguese_agent = Agent(
-            system_prompt=PORTUGUESE_ASSISTANT_SYSTEM_PROMPT,
-            model=bedrock_model,
-            tools=[editor, file_read, file_write],
-        )
-        agent_response = portuguese_agent(formatted_query)
+        with specialists.agent("portugues") as portuguese_agent:
+            agent_response = portuguese_agent(formatted_query)
         text_response = str(agent_response)
 
         if len(text_response) > 0:
@@ -0,0 +1,243 @@
+"""
+Pré-Roteador Local de Consultas
+
+Este módulo foi desenvolvido como exemplo para a sessão "AIM307" do AWS Summit São Paulo 2025.
+
+Decide localmente, sem chamar o modelo, para qual especialista vai uma consulta óbvia:
+
+1. Regras de palavras-chave por especialista: um padrão forte, ou dois termos fracos
+   distintos, encaminham a consulta diretamente
+2. Um classificador TF-IDF por centroides, treinado com as rotas já escolhidas pelo
+   orquestrador (registradas em logs/rotas_professor.jsonl), decide as demais quando
+   está confiante
+
+Consultas ambíguas ou sem decisão confiante seguem para o orquestrador, cuja escolha é
+registrada para treinar o classificador.
+"""
+
+import json
+import math
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+
+# Regras de palavras-chave por especialista (nome da ferramenta → padrões).
+# Padrões fortes são inequívocos e bastam para rotear a consulta. Padrões fracos também
+# aparecem no português do dia a dia ("programa de TV", "ilha de Java", "leite
+# integral"): sozinhos, um único termo fraco só roteia se o classificador concordar.
+# Consultas que acionam regras de mais de um especialista ficam com o orquestrador.
+ROUTING_RULES = {
+    "math_assistant": {
+        "strong": [
+            # Expressões puras, ex: "quanto é 37*89?", "calcule (2+3)^2"
+            r"^(?=.*\d)(quanto e|quanto da|calcule|resolva|qual o resultado de)?[\s\d+\-*/x×÷^().,=%]+\??$",
+            r"\b(equacao|derivada|fatorial|raiz quadrada|logaritmo|bhaskara|"
+            r"teorema de pitagoras|mmc|mdc)\b",
+        ],
+        "weak": [
+            r"\b(integral|porcentagem|fracao|fracoes|calcule|resolva)\b",
+        ],
+    },
+    "computer_science_assistant": {
+        "strong": [
+            r"```",
+            # Lookarounds em vez de \b, que não casa depois de "+" e nunca aceitaria "c++"
+            r"(?<!\w)(python|javascript|typescript|c\+\+|golang|sql|html|css)(?!\w)",
+            r"\b(algoritmo|recursao|recursiva|compilador|estrutura de dados|lista encadeada|"
+            r"arvore binaria|big o)\b",
+        ],
+        "weak": [
+            r"\b(java|rust|codigo|programa|programacao|complexidade|debug|bug|funcao|variavel)\b",
+        ],
+    },
+    "language_assistant": {
+        "strong": [
+            r"\b(traduza|traduzir|traducao|translate|como se diz|como se fala)\b",
+        ],
+        "weak": [
+            r"\bem (ingles|espanhol|frances|alemao|italiano|japones|chines|mandarim|coreano)\b",
+        ],
+    },
+    "portuguese_assistant": {
+        "strong": [
+            r"\b(gramatica|crase|concordancia verbal|concordancia nominal|regencia|ortografia|"
+            r"acentuacao|redacao|analise sintatica|figura de linguagem|soneto|"
+            r"machado de assis|clarice lispector)\b",
+        ],
+        "weak": [
+            r"\b(pontuacao|dissertacao|literatura|poema)\b",
+        ],
+    },
+}
+
+# Confiança das decisões por regras: um padrão forte, ou dois termos fracos distintos
+STRONG_RULE_CONFIDENCE = 0.9
+WEAK_RULES_CONFIDENCE = 0.8
+
+# Rotas registradas das decisões do orquestrador, usadas para treinar o classificador
+ROUTES_LOG = os.path.join("logs", "rotas_professor.jsonl")
+
+# Parâmetros do classificador TF-IDF
+MIN_TRAINING_EXAMPLES = 20
+MIN_SIMILARITY = 0.3
+CONFIDENCE_THRESHOLD = 0.75
+
+
+def _fold(text):
+    """Minúsculas e sem acentos, para que as regras e o classificador ignorem acentuação."""
+    folded = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in folded if not unicodedata.combining(c)).strip()
+
+
+def _tokenize(text):
+    return re.findall(r"\w+", _fold(text))
+
+
+def _normalize(vector):
+    norm = math.sqrt(sum(v * v for v in vector.values()))
+    return {k: v / norm for k, v in vector.items()} if norm else vector
+
+
+@dataclass
+class Route:
+    """Decisão do pré-roteador: especialista escolhido, confiança e origem da decisão."""
+
+    specialist: str
+    confidence: float
+    source: str
+
+
+class TfidfRouteClassifier:
+    """Classificador leve por centroides TF-IDF, treinado a partir das rotas registradas."""
+
+    def __init__(self):
+        self.examples = []
+        self._idf = {}
+        self._centroids = {}
+        self._dirty = False
+
+    def add(self, query, specialist):
+        self.examples.append((_tokenize(query), specialist))
+        self._dirty = True
+
+    def _fit(self):
+        document_frequency = Counter()
+        for tokens, _ in self.examples:
+            document_frequency.update(set(tokens))
+        total = len(self.examples)
+        self._idf = {t: math.log((1 + total) / (1 + df)) + 1
+                     for t, df in document_frequency.items()}
+
+        sums = defaultdict(Counter)
+        for tokens, specialist in self.examples:
+            for token, weight in self._vectorize(tokens).items():
+                sums[specialist][token] += weight
+        self._centroids = {s: _normalize(dict(v)) for s, v in sums.items()}
+        self._dirty = False
+
+    def _vectorize(self, tokens):
+        counts = Counter(t for t in tokens if t in self._idf)
+        return _normalize({t: c * self._idf[t] for t, c in counts.items()})
+
+    def predict(self, query):
+        """Retorna a rota mais provável, ou None se não houver dados ou confiança suficientes."""
+        if len(self.examples) < MIN_TRAINING_EXAMPLES:
+            return None
+        if self._dirty:
+            self._fit()
+        if len(self._centroids) < 2:
+            return None
+
+        vector = self._vectorize(_tokenize(query))
+        scores = sorted(
+            ((sum(w * centroid.get(t, 0.0) for t, w in vector.items()), specialist)
+             for specialist, centroid in self._centroids.items()),
+            reverse=True,
+        )
+        (best, specialist), (second, _) = scores[0], scores[1]
+        confidence = best / (best + second) if best + second else 0.0
+        if best < MIN_SIMILARITY or confidence < CONFIDENCE_THRESHOLD:
+            return None
+        return Route(specialist, confidence, "classificador")
+
+
+class PreRouter:
+    """
+    Roteador local executado antes do orquestrador.
+
+    Primeiro aplica as regras de palavras-chave: se exatamente um especialista for
+    acionado, por um padrão forte ou por dois termos fracos distintos, a consulta vai
+    direto para ele. Caso contrário, consulta o classificador TF-IDF treinado com as
+    rotas já decididas pelo orquestrador; se as regras apontaram um especialista com
+    um único termo fraco, a rota só é aceita quando o classificador concorda. Sem uma
+    decisão confiante, retorna None e a consulta segue para o LLM.
+
+    Linhas inválidas do registro de rotas são ignoradas.
+
+    Args:
+        routes_log: Arquivo JSONL com as rotas registradas ({"query", "specialist"})
+    """
+
+    def __init__(self, routes_log=ROUTES_LOG):
+        self.routes_log = routes_log
+        self.classifier = TfidfRouteClassifier()
+        self._rules = {name: ([re.compile(p) for p in rules["strong"]],
+                              [re.compile(p) for p in rules["weak"]])
+                       for name, rules in ROUTING_RULES.items()}
+        self._lock = threading.Lock()
+
+        if os.path.exists(routes_log):
+            with open(routes_log, encoding="utf-8") as log_file:
+                for line in log_file:
+                    if not line.strip():
+                        continue
+                    # Uma linha truncada (ex: interrupção durante a escrita) não impede a carga
+                    try:
+                        record = json.loads(line)
+                        query, specialist = record["query"], record["specialist"]
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    self.classifier.add(query, specialist)
+
+    def _signals(self, folded):
+        """Retorna, por especialista acionado, se houve padrão forte e os termos fracos."""
+        signals = {}
+        for name, (strong, weak) in self._rules.items():
+            has_strong = any(p.search(folded) for p in strong)
+            weak_terms = {m.group(0) for p in weak for m in p.finditer(folded)}
+            if has_strong or weak_terms:
+                signals[name] = (has_strong, weak_terms)
+        return signals
+
+    def route(self, query):
+        """Retorna a rota local para a consulta, ou None se o orquestrador deve decidir."""
+        signals = self._signals(_fold(query))
+        if len(signals) > 1:
+            return None
+        if signals:
+            (name, (has_strong, weak_terms)), = signals.items()
+            if has_strong:
+                return Route(name, STRONG_RULE_CONFIDENCE, "regras")
+            if len(weak_terms) >= 2:
+                return Route(name, WEAK_RULES_CONFIDENCE, "regras")
+
+        with self._lock:
+            prediction = self.classifier.predict(query)
+        # Um único termo fraco não decide, mas também não pode ser contrariado
+        if prediction is not None and signals and prediction.specialist not in signals:
+            return None
+        return prediction
+
+    def record(self, query, specialist):
+        """Registra a rota escolhida pelo orquestrador e a usa para treinar o classificador."""
+        with self._lock:
+            self.classifier.add(query, specialist)
+            directory = os.path.dirname(self.routes_log)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.routes_log, "a", encoding="utf-8") as log_file:
+                log_file.write(json.dumps({"query": query, "specialist": specialist},
+                                          ensure_ascii=False) + "\n")
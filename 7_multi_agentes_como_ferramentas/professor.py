@@ -21,6 +21,19 @@ independentemente sem afetar todo o sistema.
 Melhor desempenho: Cada agente pode ter prompts do sistema personalizados e 
 ferramentas otimizadas para sua tarefa específica.
 
+Pré-roteamento local: Consultas óbvias (ex: "quanto é 37*89?", perguntas sobre Python)
+são encaminhadas diretamente ao especialista por regras de palavras-chave ou por um
+classificador TF-IDF treinado com as rotas já escolhidas pelo orquestrador, evitando
+uma ida e volta ao modelo só para decidir o roteamento.
+
+Consultas multidisciplinares: A ferramenta multi_specialist_assistant consulta vários
+especialistas em paralelo, de modo que o tempo de resposta não cresce com o número
+de disciplinas envolvidas.
+
+Inicialização rápida: Os módulos dos especialistas, suas ferramentas, o cliente de
+modelo e o orquestrador são carregados apenas no primeiro uso. Para ver o custo de
+cada import na inicialização, execute: python perfil_inicializacao.py professor
+
 Exemplos do mundo real que poderiam se beneficiar de uma arquitetura como essa:
 
 Atendimento ao cliente em empresas de telecomunicações:
@@ -59,13 +72,11 @@ Sistema de planejamento financeiro:
  - Agente de Recomendação: Sugere estratégias financeiras personalizadas
 """
 
+import importlib
+
 from strands import Agent
-from strands.models import BedrockModel
-from portugues import portuguese_assistant
-from idiomas import language_assistant
-from matematica import math_assistant
-from ciencias_da_computacao import computer_science_assistant
-from generalista import general_assistant
+from registro_de_especialistas import specialists
+from pre_roteador import PreRouter
 
 
 # Define a focused system prompt for file operations
@@ -92,24 +103,95 @@ suporte educacional em várias disciplinas. Seu papel é:
    - Se a consulta envolve tradução → Agente de Idiomas
    - Se a consulta envolve programação/codificação/algoritmos/ciência da computação → Agente de Ciências da Computação
    - Se a consulta está fora dessas áreas especializadas → Assistente Geral
-   - Para consultas complexas, coordene vários agentes conforme necessário
+   - Para consultas que envolvem várias disciplinas → use multi_specialist_assistant em uma
+     única chamada, preenchendo a parte da consulta de cada especialista necessário, para que
+     eles trabalhem em paralelo; depois integre as respostas em uma resposta final coesa
 
 Sempre confirme sua compreensão antes de encaminhar para garantir assistência precisa.
 """
 
-bedrock_model = BedrockModel(
-    model_id="us.anthropic.claude-3-7-sonnet-20250219-v1:0")
-
-teacher_agent = Agent(
-    system_prompt=TEACHER_SYSTEM_PROMPT,
-    model=bedrock_model,
-    callback_handler=None,
-    tools=[math_assistant, 
-           language_assistant, 
-           portuguese_assistant, 
-           computer_science_assistant, 
-           general_assistant],
-)
+# Módulo de cada especialista, importado apenas quando o especialista é usado
+SPECIALIST_MODULES = {
+    "math_assistant": "matematica",
+    "language_assistant": "idiomas",
+    "portuguese_assistant": "portugues",
+    "computer_science_assistant": "ciencias_da_computacao",
+    "general_assistant": "generalista",
+}
+
+# Ferramentas do orquestrador: os especialistas e a consulta paralela a vários deles
+TEACHER_TOOL_MODULES = {
+    **SPECIALIST_MODULES,
+    "multi_specialist_assistant": "consulta_paralela",
+}
+
+pre_router = PreRouter()
+
+teacher_agent = None
+
+# Trocas respondidas pelo pré-roteador antes de o orquestrador existir
+pending_history = []
+
+def load_tool(tool_name):
+    """Importa o módulo da ferramenta na primeira vez e retorna a ferramenta."""
+    return getattr(importlib.import_module(TEACHER_TOOL_MODULES[tool_name]), tool_name)
+
+def get_teacher_agent():
+    """Retorna o orquestrador, construindo-o (com todos os especialistas) no primeiro uso."""
+    global teacher_agent
+    if teacher_agent is None:
+        # O orquestrador compartilha o cliente de modelo com os especialistas
+        teacher_agent = Agent(
+            system_prompt=TEACHER_SYSTEM_PROMPT,
+            model=specialists.model(),
+            callback_handler=None,
+            messages=pending_history,
+            tools=[load_tool(name) for name in TEACHER_TOOL_MODULES],
+        )
+    return teacher_agent
+
+def used_specialists(messages):
+    """Retorna os nomes dos especialistas chamados pelo orquestrador nas mensagens."""
+    return [
+        block["toolUse"]["name"]
+        for message in messages
+        if message["role"] == "assistant"
+        for block in message["content"]
+        if "toolUse" in block and block["toolUse"]["name"] in SPECIALIST_MODULES
+    ]
+
+def answer(user_input):
+    """
+    Responde a uma consulta, usando o pré-roteador local quando ele estiver confiante
+    e o orquestrador LLM nos demais casos.
+
+    Args:
+        user_input: A consulta do aluno
+
+    Returns:
+        str: A resposta do especialista ou do orquestrador
+    """
+    route = pre_router.route(user_input)
+    if route is not None:
+        print(f"Pré-roteador local ({route.source}, confiança {route.confidence:.2f}): {route.specialist}")
+        content = load_tool(route.specialist)(user_input)
+
+        # Mantém o contexto da conversa do orquestrador para as próximas perguntas
+        history = teacher_agent.messages if teacher_agent is not None else pending_history
+        history.append({"role": "user", "content": [{"text": user_input}]})
+        history.append({"role": "assistant", "content": [{"text": content}]})
+        return content
+
+    agent = get_teacher_agent()
+    messages_before = len(agent.messages)
+    response = agent(user_input)
+
+    # Rotas com um único especialista alimentam o classificador do pré-roteador
+    specialists_used = set(used_specialists(agent.messages[messages_before:]))
+    if len(specialists_used) == 1:
+        pre_router.record(user_input, specialists_used.pop())
+
+    return str(response)
 
 if __name__ == "__main__":
     print("\n📁 Assistente de Professor com Agentes Strands 📁\n")
@@ -123,11 +205,7 @@ if __name__ == "__main__":
                 print("\nAté logo! 👋")
                 break
 
-            response = teacher_agent(
-                user_input, 
-            )
-            
-            content = str(response)
+            content = answer(user_input)
             print(content)
             
         except KeyboardInterrupt:
@@ -0,0 +1,73 @@
+"""
+Registro de Agentes Especialistas
+
+Este módulo foi desenvolvido como exemplo para a sessão "AIM307" do AWS Summit São Paulo 2025.
+
+Centraliza a construção dos agentes especialistas do professor. Cada módulo de
+especialista registra uma função que constrói seu agente; o agente só é construído na
+primeira consulta e depois é reutilizado (pool_de_agentes.py, na raiz do repositório),
+com um limite de consultas simultâneas por especialista. Os clientes de modelo
+(BedrockModel) são compartilhados por todos os agentes que usam o mesmo model_id.
+"""
+
+import os
+import sys
+import threading
+
+from strands.models import BedrockModel
+
+# Módulos compartilhados entre as demos (pool_de_agentes.py) ficam na raiz do repositório
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pool_de_agentes import AgentPool
+
+MODEL_ID = "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
+
+
+class SpecialistRegistry:
+    """
+    Registro compartilhado de agentes especialistas e clientes de modelo.
+
+    Os agentes ficam em um AgentPool (pool_de_agentes.py, compartilhado com a
+    demo 6), com um papel por especialista: são construídos sob demanda, na
+    primeira consulta, e reutilizados nas seguintes; os clientes de modelo são
+    compartilhados por todos os agentes que usam o mesmo model_id. Cada
+    especialista tem um limite de consultas simultâneas: cada consulta em
+    andamento usa um agente exclusivo, e quem excede o limite aguarda a devolução
+    de um agente. O histórico de conversa é apagado na devolução, então nenhuma
+    consulta enxerga as anteriores e agentes ociosos não mantêm conversas
+    antigas em memória.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._models = {}
+        self._pool = AgentPool()
+
+    def model(self, model_id=MODEL_ID):
+        """Retorna o cliente de modelo compartilhado para o model_id, criando-o na primeira vez."""
+        with self._lock:
+            if model_id not in self._models:
+                self._models[model_id] = BedrockModel(model_id=model_id)
+            return self._models[model_id]
+
+    def register(self, name, factory, max_concurrency=4):
+        """
+        Registra a fábrica de agentes de um especialista; nenhum agente é construído agora.
+
+        Args:
+            name: Nome do especialista
+            factory: Função sem argumentos que constrói um novo Agent
+            max_concurrency: Número máximo de consultas simultâneas ao especialista
+        """
+        self._pool.register(name, factory, max_agents=max_concurrency)
+
+    def agent(self, name):
+        """Empresta um agente do especialista, com histórico vazio, durante o bloco `with`."""
+        return self._pool.agent(name)
+
+    def stats(self):
+        """Retorna, por especialista, quantos agentes foram construídos e quantos estão livres."""
+        return self._pool.stats()
+
+
+specialists = SpecialistRegistry()
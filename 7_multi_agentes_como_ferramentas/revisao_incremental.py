@@ -0,0 +1,262 @@
+"""
+Revisão Incremental de Documentos
+
+Este módulo foi desenvolvido como exemplo para a sessão "AIM307" do AWS Summit São Paulo 2025.
+
+Revisar de novo um documento longo a cada pequena alteração reenviaria ao modelo
+parágrafos que não mudaram. O revisor divide o documento em parágrafos e registra em
+SQLite o hash de cada parágrafo já revisado; a cada revisão, apenas os parágrafos novos
+ou alterados são enviados ao modelo, em lotes processados em paralelo. Ao aplicar as
+correções, somente os parágrafos alterados são substituídos e o restante do arquivo
+permanece igual.
+"""
+
+import difflib
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+# Parágrafos são separados por linhas em branco
+PARAGRAPH_SEPARATOR = re.compile(r"(\n[ \t]*\n\s*)")
+
+
+def split_paragraphs(text):
+    """
+    Divide o documento em parágrafos, preservando os separadores originais.
+
+    Returns:
+        tuple: Lista de parágrafos e lista de separadores (um a menos que os parágrafos)
+    """
+    parts = PARAGRAPH_SEPARATOR.split(text)
+    return parts[0::2], parts[1::2]
+
+
+def join_paragraphs(paragraphs, separators):
+    """Reconstrói o documento a partir dos parágrafos e dos separadores originais."""
+    pieces = [paragraphs[0]]
+    for separator, paragraph in zip(separators, paragraphs[1:]):
+        pieces += [separator, paragraph]
+    return "".join(pieces)
+
+
+def inline_diff(original, revised):
+    """Diferença palavra a palavra, no formato [-removido-]{+inserido+}."""
+    before, after = re.findall(r"\S+|\s+", original), re.findall(r"\S+|\s+", revised)
+    pieces = []
+    for op, i1, i2, j1, j2 in difflib.SequenceMatcher(None, before, after, autojunk=False).get_opcodes():
+        if op == "equal":
+            pieces.append("".join(before[i1:i2]))
+            continue
+        if i2 > i1:
+            pieces.append(f"[-{''.join(before[i1:i2])}-]")
+        if j2 > j1:
+            pieces.append(f"{{+{''.join(after[j1:j2])}+}}")
+    return "".join(pieces)
+
+
+@dataclass
+class ParagraphEdit:
+    """Alteração proposta para um parágrafo do documento."""
+    index: int
+    original: str
+    revised: str
+    comment: str = ""
+
+
+@dataclass
+class ReviewReport:
+    """Resultado de uma passada de revisão incremental."""
+    path: str
+    paragraphs: int = 0
+    reused: int = 0
+    sent: int = 0  # revisados pelo modelo nesta passada
+    failed: int = 0
+    batches: int = 0
+    applied: bool = False
+    duration: float = 0.0
+    edits: list = field(default_factory=list)
+
+    def summary(self, max_edits=30):
+        lines = [
+            f"**Revisão de {self.path}**",
+            f"Parágrafos: {self.paragraphs} | já revisados: {self.reused} | revisados pelo modelo: "
+            f"{self.sent} ({self.batches} lotes) | com falha: {self.failed} | "
+            f"alterados: {len(self.edits)} | tempo: {self.duration:.1f}s",
+        ]
+        if self.edits:
+            lines.append("Alterações aplicadas ao arquivo." if self.applied
+                         else "Alterações não aplicadas ao arquivo. Para gravá-las, confirme a "
+                              "aplicação; a nova passada reaproveita as revisões já feitas.")
+        for edit in self.edits[:max_edits]:
+            lines += ["", f"§{edit.index + 1}: {inline_diff(edit.original, edit.revised)}"]
+            if edit.comment:
+                lines.append(f"  ↳ {edit.comment}")
+        if len(self.edits) > max_edits:
+            lines += ["", f"... e mais {len(self.edits) - max_edits} parágrafos alterados."]
+        if self.failed:
+            lines += ["", "Os parágrafos com falha serão enviados novamente na próxima revisão."]
+        return "\n".join(lines)
+
+
+class DocumentReviewer:
+    """
+    Revisão incremental de documentos, parágrafo a parágrafo.
+
+    Cada parágrafo é identificado pelo hash do seu texto (e das instruções de revisão).
+    Parágrafos já revisados, inclusive os que resultaram de revisões anteriores, são
+    reaproveitados do registro em SQLite; apenas os novos ou alterados são agrupados em
+    lotes de até max_chunk_chars caracteres e enviados ao modelo, em paralelo. Por
+    padrão as correções são apenas apresentadas; quando aplicadas, substituem somente
+    os parágrafos alterados, de modo que o restante do arquivo permanece byte a byte igual.
+
+    Args:
+        review_batch: Função que recebe uma lista de parágrafos e retorna uma lista de
+            pares (texto revisado, comentário) na mesma ordem
+        path: Arquivo SQLite com o registro de parágrafos revisados
+        instructions: Texto das instruções de revisão, incluído no hash dos parágrafos
+        max_chunk_chars: Tamanho máximo de cada lote enviado ao modelo
+        max_workers: Número de lotes revisados simultaneamente
+    """
+
+    def __init__(self, review_batch, path, instructions="", max_chunk_chars=4000, max_workers=4):
+        self.review_batch = review_batch
+        self.instructions = instructions
+        self.max_chunk_chars = max_chunk_chars
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS reviewed_paragraphs ("
+            " hash TEXT PRIMARY KEY, revised TEXT NOT NULL, comment TEXT NOT NULL,"
+            " reviewed_at REAL NOT NULL)"
+        )
+        self._connection.commit()
+
+    def _hash(self, paragraph):
+        payload = f"{self.instructions}\n{' '.join(paragraph.split())}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _reviewed(self, paragraph):
+        with self._lock:
+            return self._connection.execute(
+                "SELECT revised, comment FROM reviewed_paragraphs WHERE hash = ?",
+                (self._hash(paragraph),),
+            ).fetchone()
+
+    def _record(self, paragraph, revised, comment):
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO reviewed_paragraphs VALUES (?, ?, ?, ?)",
+                (self._hash(paragraph), revised, comment, now),
+            )
+            # O texto revisado também conta como revisado na próxima passada
+            self._connection.execute(
+                "INSERT OR IGNORE INTO reviewed_paragraphs VALUES (?, ?, '', ?)",
+                (self._hash(revised), revised, now),
+            )
+            self._connection.commit()
+
+    def _batches(self, indexes, paragraphs):
+        batch, size = [], 0
+        for index in indexes:
+            length = len(paragraphs[index])
+            if batch and size + length > self.max_chunk_chars:
+                yield batch
+                batch, size = [], 0
+            batch.append(index)
+            size += length
+        if batch:
+            yield batch
+
+    def _review(self, batch, paragraphs):
+        results = self.review_batch([paragraphs[i].strip() for i in batch])
+        if results is None or len(results) != len(batch):
+            return batch, None
+        for index, (revised, comment) in zip(batch, results):
+            self._record(paragraphs[index], revised, comment)
+        return batch, results
+
+    def review(self, path, apply=False):
+        """
+        Revisa o documento, enviando ao modelo apenas os parágrafos ainda não revisados.
+
+        Args:
+            path: Caminho do documento de texto
+            apply: Se True, grava as correções no arquivo; se False, apenas as apresenta
+
+        Returns:
+            ReviewReport: Contagens da passada e as alterações por parágrafo
+        """
+        started_at = time.perf_counter()
+        with open(path, encoding="utf-8") as file:
+            original_text = file.read()
+        paragraphs, separators = split_paragraphs(original_text)
+        report = ReviewReport(path=path, paragraphs=sum(1 for p in paragraphs if p.strip()))
+
+        revisions = {}
+        pending = []
+        for index, paragraph in enumerate(paragraphs):
+            if not paragraph.strip():
+                continue
+            reviewed = self._reviewed(paragraph)
+            if reviewed is None:
+                pending.append(index)
+            else:
+                revisions[index] = reviewed
+                report.reused += 1
+
+        batches = list(self._batches(pending, paragraphs))
+        report.batches = len(batches)
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+                futures = [executor.submit(self._review, batch, paragraphs) for batch in batches]
+            for future in futures:
+                try:
+                    batch, results = future.result()
+                except Exception as e:
+                    print(f"Falha ao revisar um lote de parágrafos: {e}")
+                    continue
+                if results is not None:
+                    report.sent += len(batch)
+                    revisions.update(zip(batch, results))
+        report.failed = len(pending) - report.sent
+
+        revised_paragraphs = list(paragraphs)
+        for index, (revised, comment) in sorted(revisions.items()):
+            if revised.strip() and revised.strip() != paragraphs[index].strip():
+                # Mantém os espaços das bordas do parágrafo original
+                leading = paragraphs[index][:len(paragraphs[index]) - len(paragraphs[index].lstrip())]
+                trailing = paragraphs[index][len(paragraphs[index].rstrip()):]
+                revised_paragraphs[index] = leading + revised.strip() + trailing
+                report.edits.append(ParagraphEdit(index, paragraphs[index].strip(), revised.strip(), comment))
+
+        if apply and report.edits:
+            report.applied = self._write(path, original_text, join_paragraphs(revised_paragraphs, separators))
+        report.duration = time.perf_counter() - started_at
+        return report
+
+    @staticmethod
+    def _write(path, original_text, revised_text):
+        # Não sobrescreve alterações feitas no arquivo durante a revisão
+        with open(path, encoding="utf-8") as file:
+            if file.read() != original_text:
+                print(f"{path} foi alterado durante a revisão; as correções não foram aplicadas")
+                return False
+        temporary_path = f"{path}.revisao.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            file.write(revised_text)
+        os.replace(temporary_path, path)
+        return True
+
+    def close(self):
+        self._connection.close()
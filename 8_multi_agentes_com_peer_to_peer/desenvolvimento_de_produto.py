@@ -7,7 +7,11 @@ especializados trabalhando em colaboração peer-to-peer para criar planos abran
 desenvolvimento.
 
 Componentes Principais:
-- Agent Coordinator: Coordena uma equipe de especialistas usando a ferramenta swarm
+- Executor Peer-to-Peer: Executa os especialistas em paralelo a cada rodada, sobre um
+  quadro compartilhado (blackboard), e para mais cedo quando as contribuições convergem
+- Quadro Compartilhado: Seções versionadas (personas, arquitetura, plano de testes,
+  riscos...); cada especialista recebe só as alterações desde a sua última rodada
+- Agent Coordinator: Alternativa que coordena a equipe usando a ferramenta swarm
 - Equipe de 3 Especialistas:
   * UX/UI Product Designer: Foca em experiência do usuário e design de interfaces
   * Senior Software Developer: Avalia viabilidade técnica e arquitetura
@@ -17,7 +21,8 @@ Processo Colaborativo:
 1. Designer cria pesquisa inicial de usuários e conceitos de design
 2. Developer revisa viabilidade e sugere abordagens técnicas
 3. Tester identifica problemas potenciais e requisitos de teste
-4. Todos colaboram em 2 rodadas de refinamento
+4. Todos colaboram em rodadas de refinamento (2 por padrão), trabalhando ao mesmo tempo
+   e lendo as contribuições dos colegas no quadro compartilhado
 5. Plano integrado final é criado
 
 Entregáveis:
@@ -39,8 +44,58 @@ Casos de Uso do Mundo Real:
 - Healthtech: Aplicações médicas considerando regulamentações e usabilidade
 """
 
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from strands import Agent
 from strands_tools import swarm
+from quadro_compartilhado import Blackboard, parse_sections
+
+MODEL_ID = "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
+
+DELIVERABLES = """
+    - Pesquisa de usuários e personas
+    - Especificações de funcionalidades
+    - Visão geral da arquitetura técnica
+    - Cronograma de desenvolvimento e marcos
+    - Estratégia de testes e métricas de qualidade
+    - Avaliação de riscos e planos de mitigação
+"""
+
+# Especialistas da equipe: papel -> (nome, prompt do sistema)
+SPECIALISTS = {
+    "designer": ("Designer de Produto UX/UI", """Você é um Designer de Produto UX/UI em uma equipe
+    de desenvolvimento de produtos. Você analisa necessidades e pontos de dor dos usuários, cria
+    personas e mapas de jornada, projeta interfaces intuitivas, foca em acessibilidade e
+    usabilidade e considera sistemas de design e consistência."""),
+    "desenvolvedor": ("Desenvolvedor de Software Sênior", """Você é um Desenvolvedor de Software
+    Sênior em uma equipe de desenvolvimento de produtos. Você avalia viabilidade técnica, projeta
+    a arquitetura do sistema, identifica tecnologias e frameworks necessários, considera
+    escalabilidade e performance e estima esforço e cronograma de desenvolvimento."""),
+    "testador": ("Testador de Garantia de Qualidade", """Você é um Testador de Garantia de
+    Qualidade em uma equipe de desenvolvimento de produtos. Você identifica potenciais problemas
+    de experiência do usuário, planeja estratégias e cenários de teste, considera casos extremos
+    e tratamento de erros, avalia segurança e privacidade e sugere métricas de qualidade."""),
+}
+
+# Seções do quadro compartilhado e o especialista responsável por cada uma
+SECTION_OWNERS = {
+    "Personas": "designer",
+    "Funcionalidades": "designer",
+    "Arquitetura": "desenvolvedor",
+    "Cronograma": "desenvolvedor",
+    "Plano de Testes": "testador",
+    "Riscos": "testador",
+}
+
+INTEGRATOR_PROMPT = """Você é um coordenador de desenvolvimento de produtos. Você recebe as
+    seções finais escritas por um Designer, um Desenvolvedor e um Testador e as integra em
+    um único plano de desenvolvimento de produto coeso, resolvendo conflitos entre elas."""
 
 SYSTEM_PROMPT = """Você é um coordenador de desenvolvimento de produtos que facilita o 
     desenvolvimento colaborativo de produtos usando grupos de agentes especializados (swarms).
@@ -56,25 +111,152 @@ SYSTEM_PROMPT = """Você é um coordenador de desenvolvimento de produtos que fa
     - Colaboração multifuncional
     """
 
-product_swarm_coordinator = Agent(
-    model="us.anthropic.claude-3-7-sonnet-20250219-v1:0",
-    tools=[swarm],
-    system_prompt=SYSTEM_PROMPT
-)
+# Briefing usado quando o módulo é executado sem argumentos
+EXAMPLE_BRIEF = {
+    "product_idea": """Um aplicativo inteligente de gerenciamento de tarefas que usa 
+IA para priorizar tarefas e sugerir cronogramas de trabalho otimizados""",
+    "target_users": "profissionais ocupados e trabalhadores remotos",
+    "platform": "aplicação mobile (iOS e Android)",
+}
+
+def build_swarm_coordinator():
+    """Cria um coordenador com a ferramenta swarm (um por execução, para permitir lotes paralelos)."""
+    return Agent(
+        model=MODEL_ID,
+        tools=[swarm],
+        system_prompt=SYSTEM_PROMPT
+    )
+
+def owned_sections(role):
+    """Seções que o especialista escreve: as suas e as notas para os colegas."""
+    return [title for title, owner in SECTION_OWNERS.items() if owner == role] + [notes_title(role)]
+
+def notes_title(role):
+    return f"Notas do {SPECIALISTS[role][0]}"
+
+def run_peer_to_peer(brief, rounds=2, convergence_threshold=0.9):
+    """
+    Executa a equipe de especialistas em rodadas paralelas sobre um quadro compartilhado.
+
+    O quadro tem seções estruturadas e versionadas (personas, arquitetura, plano de testes,
+    riscos...), cada uma escrita por um especialista, além das notas de cada um para os
+    colegas. Na rodada inicial cada especialista escreve suas seções a partir do briefing;
+    nas rodadas de refinamento, todos trabalham ao mesmo tempo e recebem apenas suas seções
+    atuais e as alterações dos colegas desde a sua última rodada, de modo que o tamanho dos
+    prompts não cresce com o número de rodadas. Se nenhuma seção mudar significativamente
+    (similaridade acima do limiar) em uma rodada, a equipe convergiu e as rodadas restantes
+    são puladas.
+
+    Args:
+        brief: Descrição do produto, usuários-alvo e plataforma
+        rounds: Número máximo de rodadas de refinamento
+        convergence_threshold: Similaridade mínima para considerar que uma seção não mudou
+
+    Returns:
+        dict: O quadro final, as rodadas de refinamento executadas, se a equipe convergiu
+            antes do limite e o tamanho médio dos prompts (em caracteres) de cada rodada
+    """
+    agents = {
+        role: Agent(model=MODEL_ID, system_prompt=prompt, callback_handler=None)
+        for role, (_, prompt) in SPECIALISTS.items()
+    }
+    board = Blackboard(list(SECTION_OWNERS) + [notes_title(role) for role in SPECIALISTS])
+
+    def contribute(role, prompt):
+        # O estado do especialista está nas suas seções do quadro; o histórico é descartado
+        agent = agents[role]
+        agent.messages.clear()
+        response = str(agent(prompt))
+        sections = parse_sections(response, owned_sections(role))
+        if not sections and "SEM ALTERAÇÕES" not in response:
+            # Resposta fora do formato de seções: preservada nas notas do especialista
+            sections = {notes_title(role): response}
+        return [board.write(title, content, role) for title, content in sections.items()]
+
+    def run_round(prompts):
+        with ThreadPoolExecutor(max_workers=len(prompts)) as executor:
+            similarities = list(executor.map(lambda item: contribute(*item), prompts.items()))
+        prompt_sizes.append(sum(map(len, prompts.values())) // len(prompts))
+        return [value for values in similarities for value in values]
+
+    prompt_sizes = []
+    run_round({
+        role: f"""Briefing do produto:\n{brief}\n\nEscreva, do ponto de vista de {name}, as seções
+abaixo do plano de desenvolvimento, usando exatamente estes títulos:
+{chr(10).join(f"## {title}" for title in owned_sections(role))}"""
+        for role, (name, _) in SPECIALISTS.items()
+    })
+
+    rounds_run, converged = 0, False
+    for round_number in range(1, rounds + 1):
+        prompts = {}
+        for role, (name, _) in SPECIALISTS.items():
+            own = "\n\n".join(f"## {title}\n{board.read(title)}" for title in owned_sections(role))
+            others = [title for title in board.titles if title not in owned_sections(role)]
+            deltas = Blackboard.render_deltas(board.deltas_for(role, others)) or "Nenhuma."
+            prompts[role] = f"""Briefing do produto:\n{brief}
+
+Rodada de refinamento {round_number}. Suas seções atuais, como {name}:
+
+{own}
+
+Alterações dos colegas desde a sua última rodada:
+
+{deltas}
+
+Reescreva por completo, com o mesmo título (## ...), apenas as suas seções que precisam
+mudar para incorporar as contribuições dos colegas ou resolver conflitos e lacunas. Se nada
+precisar mudar, responda apenas: SEM ALTERAÇÕES"""
+
+        similarities = run_round(prompts)
+        rounds_run = round_number
+        converged = all(value >= convergence_threshold for value in similarities)
+        if converged:
+            print(f"🔁 Equipe convergiu na rodada {round_number}; rodadas restantes puladas")
+            break
+
+    return {"board": board, "rounds": rounds_run, "converged": converged, "prompt_sizes": prompt_sizes}
+
+def integrate_plan(brief, board):
+    """Integra as seções finais do quadro em um plano de desenvolvimento único."""
+    integrator = Agent(model=MODEL_ID, system_prompt=INTEGRATOR_PROMPT, callback_handler=None)
+    contributions = "\n\n".join(f"## {title}\n{content}" for title, content in board.snapshot().items())
+    return integrator(f"""Briefing do produto:\n{brief}\n\nQuadro da equipe:\n\n{contributions}
+
+Crie o plano integrado final de desenvolvimento de produto. Os entregáveis devem incluir:
+{DELIVERABLES}""")
 
 def collaborative_product_development(product_idea: str, 
                                       target_users: str, 
-                                      platform: str = "aplicação web") -> str:
-    """Desenvolve um conceito de produto colaborativamente usando uma equipe de especialistas (swarm).
+                                      platform: str = "aplicação web",
+                                      rounds: int = 2,
+                                      use_swarm_tool: bool = False) -> str:
+    """Desenvolve um conceito de produto colaborativamente usando uma equipe de especialistas.
     
     Args:
         product_idea: Descrição do produto a ser desenvolvido
         target_users: Os usuários pretendidos do produto
         platform: A plataforma alvo (web, mobile, desktop, etc.)
+        rounds: Número máximo de rodadas de refinamento
+        use_swarm_tool: Se True, delega a colaboração à ferramenta swarm em vez do
+            executor peer-to-peer paralelo
     
     Returns:
         Plano abrangente de desenvolvimento de produto
     """
+    print(f"🚀 Iniciando desenvolvimento colaborativo de produto para: {product_idea}")
+    print(f"👥 Usuários-alvo: {target_users}")
+    print(f"💻 Plataforma: {platform}")
+    print("⏳ Equipe de desenvolvimento está colaborando...\n")
+
+    if not use_swarm_tool:
+        brief = f"Produto: {product_idea}\nUsuários-alvo: {target_users}\nPlataforma: {platform}"
+        started_at = time.perf_counter()
+        run = run_peer_to_peer(brief, rounds=rounds)
+        print(f"⏱️ {run['rounds']} rodadas de refinamento em {time.perf_counter() - started_at:.1f}s "
+              f"(prompt médio por rodada: {', '.join(map(str, run['prompt_sizes']))} caracteres)")
+        return integrate_plan(brief, run["board"])
+
     swarm_request = f"""
     Crie uma equipe de três especialistas em desenvolvimento de produtos para desenvolver 
     colaborativamente: {product_idea}
@@ -108,36 +290,190 @@ def collaborative_product_development(product_idea: str,
     - Designer cria pesquisa inicial de usuários e conceitos de design
     - Desenvolvedor revisa viabilidade e sugere abordagens técnicas
     - Testador identifica problemas potenciais e requisitos de teste
-    - Todos os membros da equipe colaboram por 2 rodadas de refinamento
+    - Todos os membros da equipe colaboram por {rounds} rodadas de refinamento
     - Plano integrado final de desenvolvimento de produto é criado
     
-    Os entregáveis devem incluir:
-    - Pesquisa de usuários e personas
-    - Especificações de funcionalidades
-    - Visão geral da arquitetura técnica
-    - Cronograma de desenvolvimento e marcos
-    - Estratégia de testes e métricas de qualidade
-    - Avaliação de riscos e planos de mitigação
-    """
-    
-    print(f"🚀 Iniciando desenvolvimento colaborativo de produto para: {product_idea}")
-    print(f"👥 Usuários-alvo: {target_users}")
-    print(f"💻 Plataforma: {platform}")
-    print("⏳ Equipe de desenvolvimento está colaborando...\n")
+    Os entregáveis devem incluir:{DELIVERABLES}"""
     
-    result = product_swarm_coordinator(swarm_request)
+    result = build_swarm_coordinator()(swarm_request)
     return result
 
-print("✅ Coordenador de equipe de desenvolvimento de produto pronto!")
+class InvalidBrief(ValueError):
+    """Linha do arquivo de briefings que não é um objeto JSON válido."""
+
+    def __init__(self, line_number, message):
+        super().__init__(f"Linha {line_number}: {message}")
+        self.line_number = line_number
+
+def brief_id(brief):
+    """Identificador do briefing: o campo "id" ou um hash do conteúdo."""
+    if brief.get("id") is not None:
+        return str(brief["id"])
+    payload = json.dumps(brief, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+def read_briefs(input_path):
+    """
+    Lê briefings de produto de um arquivo JSONL, um por linha, sem carregar o arquivo inteiro.
+
+    Cada linha é um objeto com "product_idea", "target_users" e, opcionalmente, "id",
+    "platform" e "rounds".
+
+    Yields:
+        dict: O briefing de cada linha, ou InvalidBrief se a linha não é um objeto JSON
+            válido (a leitura continua nas linhas seguintes)
+    """
+    with open(input_path, encoding="utf-8") as input_file:
+        for line_number, line in enumerate(input_file, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                brief = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield InvalidBrief(line_number, f"JSON inválido ({e})")
+                continue
+            yield brief if isinstance(brief, dict) else InvalidBrief(line_number, "esperado um objeto JSON")
+
+def completed_brief_ids(output_path):
+    """Identificadores dos briefings com plano já gravado no arquivo de saída (sem erro)."""
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, encoding="utf-8") as output_file:
+        for line in output_file:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # linha incompleta de uma execução interrompida
+            if isinstance(record, dict) and "plan" in record and "error" not in record and "id" in record:
+                completed.add(record["id"])
+    return completed
+
+def run_briefs(briefs, output_path, workers=2, rounds=2, use_swarm_tool=False):
+    """
+    Gera planos de produto para uma sequência de briefings.
+
+    Até `workers` briefings são processados simultaneamente; novos briefings só são
+    consumidos quando há um worker livre, e cada plano é acrescentado ao arquivo de
+    saída assim que fica pronto. Briefings que já têm plano no arquivo de saída são
+    pulados, de modo que uma execução interrompida pode ser retomada com o mesmo
+    comando; briefings que falharam são tentados novamente.
+
+    Itens que não são briefings (InvalidBrief ou valores que não são objetos JSON)
+    são gravados como registros de erro, sem interromper o lote.
+
+    Args:
+        briefs: Iterável de dicionários com "product_idea", "target_users" e,
+            opcionalmente, "id", "platform" e "rounds"
+        output_path: Caminho do arquivo JSONL de saída
+        workers: Número de briefings processados simultaneamente
+        rounds: Rodadas de refinamento para briefings que não definem "rounds"
+        use_swarm_tool: Se True, usa a ferramenta swarm em vez do executor peer-to-peer
+
+    Returns:
+        dict: Quantidade de planos concluídos, de erros e de briefings pulados
+    """
+    done = completed_brief_ids(output_path)
+    slots = threading.BoundedSemaphore(workers)
+    write_lock = threading.Lock()
+    counts = {"concluidos": 0, "erros": 0, "pulados": 0}
+
+    with open(output_path, "a", encoding="utf-8") as output_file:
+
+        def write_result(result):
+            with write_lock:
+                output_file.write(json.dumps(result, ensure_ascii=False) + "\n")
+                output_file.flush()
+                counts["erros" if "error" in result else "concluidos"] += 1
+
+        def process(identifier, brief):
+            started_at = time.monotonic()
+            result = {"id": identifier, "brief": brief}
+            missing = [field for field in ("product_idea", "target_users") if field not in brief]
+            if missing:
+                result["error"] = f"Campo obrigatório ausente no briefing: {', '.join(missing)}"
+                result["elapsed_s"] = 0.0
+                write_result(result)
+                return
+            try:
+                result["plan"] = str(collaborative_product_development(
+                    brief["product_idea"],
+                    brief["target_users"],
+                    brief.get("platform", "aplicação web"),
+                    rounds=int(brief.get("rounds", rounds)),
+                    use_swarm_tool=use_swarm_tool,
+                ))
+            except Exception as e:
+                result["error"] = str(e)
+            result["elapsed_s"] = round(time.monotonic() - started_at, 3)
+            write_result(result)
+
+        def release_slot(_future):
+            slots.release()
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="briefing") as executor:
+            for position, brief in enumerate(briefs, start=1):
+                if isinstance(brief, InvalidBrief):
+                    write_result({"id": f"linha-{brief.line_number}", "brief": None,
+                                  "error": str(brief), "elapsed_s": 0.0})
+                    continue
+                if not isinstance(brief, dict):
+                    write_result({"id": f"item-{position}", "brief": brief,
+                                  "error": f"Item {position}: o briefing deve ser um objeto JSON",
+                                  "elapsed_s": 0.0})
+                    continue
+                identifier = brief_id(brief)
+                if identifier in done:
+                    counts["pulados"] += 1
+                    continue
+                done.add(identifier)  # ignora briefings repetidos na mesma entrada
+                slots.acquire()
+                executor.submit(process, identifier, brief).add_done_callback(release_slot)
+
+    return counts
+
+def run_batch(input_path, output_path, workers=2, rounds=2, use_swarm_tool=False):
+    """Gera planos para todos os briefings de um arquivo JSONL (ver run_briefs)."""
+    return run_briefs(read_briefs(input_path), output_path, workers, rounds, use_swarm_tool)
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Desenvolvimento colaborativo de produtos com uma equipe de agentes especialistas")
+    parser.add_argument("--lote", metavar="ENTRADA",
+                        help="Arquivo JSONL de briefings de produto a processar em lote")
+    parser.add_argument("--saida", metavar="SAIDA", default="planos.jsonl",
+                        help="Arquivo JSONL onde os planos do lote são acrescentados (e retomados)")
+    parser.add_argument("--workers", type=int, default=2,
+                        help="Número de briefings processados simultaneamente no modo em lote")
+    parser.add_argument("--rodadas", type=int, default=2,
+                        help="Número máximo de rodadas de refinamento da equipe")
+    parser.add_argument("--swarm", action="store_true",
+                        help="Usa a ferramenta swarm em vez do executor peer-to-peer paralelo")
+    parser.add_argument("--ideia", help="Descrição do produto (padrão: exemplo de gerenciador de tarefas)")
+    parser.add_argument("--usuarios", help="Usuários-alvo do produto")
+    parser.add_argument("--plataforma", help="Plataforma alvo do produto")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
 
-# Teste da equipe de desenvolvimento de produto
-product_idea = """Um aplicativo inteligente de gerenciamento de tarefas que usa 
-IA para priorizar tarefas e sugerir cronogramas de trabalho otimizados"""
+    if args.lote:
+        print(f"Processando lote '{args.lote}' com {args.workers} workers...")
+        counts = run_batch(args.lote, args.saida, args.workers, args.rodadas, args.swarm)
+        print(f"\nLote concluído: {counts['concluidos']} planos, {counts['erros']} erros, "
+              f"{counts['pulados']} já concluídos anteriormente. Resultados em: {args.saida}")
+        raise SystemExit(1 if counts["erros"] else 0)
 
-target_users = "profissionais ocupados e trabalhadores remotos"
-platform = "aplicação mobile (iOS e Android)"
+    print("✅ Coordenador de equipe de desenvolvimento de produto pronto!")
 
-product_result = collaborative_product_development(product_idea, target_users, platform)
-print("📋 Plano de Desenvolvimento de Produto:")
-print("=" * 50)
-print(product_result)
\ No newline at end of file
+    product_result = collaborative_product_development(
+        args.ideia or EXAMPLE_BRIEF["product_idea"],
+        args.usuarios or EXAMPLE_BRIEF["target_users"],
+        args.plataforma or EXAMPLE_BRIEF["platform"],
+        rounds=args.rodadas,
+        use_swarm_tool=args.swarm,
+    )
+    print("📋 Plano de Desenvolvimento de Produto:")
+    print("=" * 50)
+    print(product_result)
@@ -0,0 +1,155 @@
+"""
+Quadro Compartilhado entre Agentes
+
+Este módulo foi desenvolvido como exemplo para a sessão "AIM307" do AWS Summit São Paulo 2025.
+
+Em vez de repassar a cada agente o histórico completo das respostas dos demais, a
+equipe escreve em um quadro com seções fixas ("## Título") e versionadas. Cada agente
+recebe apenas as seções alteradas por outros desde a sua última leitura, como diff
+unificado quando ele é menor que a seção, reduzindo os tokens enviados a cada rodada.
+"""
+
+import difflib
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass
+
+# Linhas de título de seção nas respostas dos agentes: "## Título"
+SECTION_HEADING = re.compile(r"^##\s+(.+?)\s*:?\s*$", re.MULTILINE)
+
+
+def _fold(text):
+    folded = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in folded if not unicodedata.combining(c)).strip()
+
+
+@dataclass
+class Section:
+    """Seção do quadro, com o texto atual, a versão e o autor da última alteração."""
+    title: str
+    content: str = ""
+    version: int = 0
+    author: str = ""
+
+
+@dataclass
+class Delta:
+    """Alteração de uma seção desde a última leitura de um agente."""
+    title: str
+    version: int
+    author: str
+    text: str
+    is_diff: bool
+
+
+def parse_sections(text, titles):
+    """
+    Extrai de uma resposta as seções com títulos conhecidos ("## Título").
+
+    Args:
+        text: A resposta do agente
+        titles: Títulos aceitos; a comparação ignora maiúsculas e acentos
+
+    Returns:
+        dict: Título -> conteúdo, apenas para as seções presentes na resposta
+    """
+    known = {_fold(title): title for title in titles}
+    matches = [m for m in SECTION_HEADING.finditer(text) if _fold(m.group(1)) in known]
+    sections = {}
+    for match, following in zip(matches, matches[1:] + [None]):
+        end = following.start() if following else len(text)
+        sections[known[_fold(match.group(1))]] = text[match.end():end].strip()
+    return sections
+
+
+class Blackboard:
+    """
+    Quadro compartilhado com seções estruturadas e versionadas.
+
+    Cada escrita que muda o conteúdo de uma seção incrementa sua versão. O quadro guarda,
+    para cada leitor, a versão e o texto de cada seção na última vez em que ele as leu,
+    de modo que deltas_for entrega apenas as seções alteradas desde então: como diff
+    unificado quando ele é menor que a seção, ou a seção inteira caso contrário.
+
+    Args:
+        titles: Títulos das seções do quadro, na ordem de apresentação
+    """
+
+    def __init__(self, titles):
+        self._sections = {title: Section(title) for title in titles}
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    @property
+    def titles(self):
+        return list(self._sections)
+
+    def write(self, title, content, author):
+        """
+        Atualiza uma seção.
+
+        Returns:
+            float: Similaridade (0 a 1) entre o conteúdo anterior e o novo
+        """
+        content = content.strip()
+        with self._lock:
+            section = self._sections[title]
+            if content == section.content:
+                return 1.0
+            similarity = difflib.SequenceMatcher(None, section.content, content, autojunk=False).ratio()
+            section.content, section.author = content, author
+            section.version += 1
+            # O autor já conhece o próprio texto
+            self._seen.setdefault(author, {})[title] = (section.version, content)
+            return similarity
+
+    def read(self, title):
+        return self._sections[title].content
+
+    def snapshot(self):
+        """Retorna as seções preenchidas (título -> conteúdo), na ordem do quadro."""
+        with self._lock:
+            return {title: s.content for title, s in self._sections.items() if s.content}
+
+    def versions(self):
+        with self._lock:
+            return {title: s.version for title, s in self._sections.items()}
+
+    def deltas_for(self, reader, titles=None):
+        """
+        Retorna as alterações feitas por outros autores desde a última leitura do leitor
+        e as marca como lidas.
+
+        Args:
+            reader: Identificador do leitor (ex: o papel do agente)
+            titles: Seções de interesse (padrão: todas)
+        """
+        deltas = []
+        with self._lock:
+            seen = self._seen.setdefault(reader, {})
+            for title in titles or self._sections:
+                section = self._sections[title]
+                seen_version, seen_content = seen.get(title, (0, ""))
+                if section.version == seen_version or not section.content:
+                    continue
+                text, is_diff = section.content, False
+                if seen_content:
+                    diff = "\n".join(difflib.unified_diff(
+                        seen_content.splitlines(), section.content.splitlines(),
+                        f"v{seen_version}", f"v{section.version}", lineterm="", n=1,
+                    ))
+                    if len(diff) < len(section.content):
+                        text, is_diff = diff, True
+                deltas.append(Delta(title, section.version, section.author, text, is_diff))
+                seen[title] = (section.version, section.content)
+        return deltas
+
+    @staticmethod
+    def render_deltas(deltas):
+        """Formata os deltas para o prompt de um agente."""
+        blocks = []
+        for delta in deltas:
+            kind = "diff em relação à versão que você leu" if delta.is_diff else "conteúdo completo"
+            blocks.append(f"## {delta.title} (v{delta.version}, por {delta.author}; {kind})\n{delta.text}")
+        return "\n\n".join(blocks)
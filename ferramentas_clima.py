@@ -0,0 +1,501 @@
+"""
+Ferramentas Meteorológicas Nativas para o OpenWeatherMap
+
+Ferramentas tipadas usadas pelos agentes meteorológicos (exemplos 4 e 5) no lugar das
+ferramentas genéricas http_request e shell. Com elas, cada pergunta sobre o clima é
+respondida com uma única chamada de ferramenta, em vez de um turno para ler a chave da
+API, outro para montar a URL e outro para interpretar o JSON bruto.
+
+- A chave da API (OPENWEATHER_API_KEY) é lida uma única vez, na criação do cliente
+- Os nomes das cidades são resolvidos em coordenadas pelo índice local de cidades
+  (indice_de_cidades.py), antes de qualquer chamada HTTP, quando a correspondência é
+  exata (sem acentos) ou inequívoca; os demais nomes são enviados ao geocodificador do
+  próprio OpenWeatherMap, junto com as cidades parecidas do índice para o agente conferir
+- As requisições reutilizam conexões HTTP de um pool (urllib3.PoolManager)
+- As respostas são guardadas em cache por (cidade, unidades), com validade igual ao
+  intervalo de atualização do provedor
+- A URL base pode ser trocada (OPENWEATHER_BASE_URL) para apontar para um servidor
+  local que simula a API, por exemplo em testes
+- Várias cidades podem ser consultadas de uma só vez (get_current_weather_bulk), em
+  paralelo e respeitando o limite de requisições por minuto do plano
+  (OPENWEATHER_REQUISICOES_POR_MINUTO, padrão 60)
+
+Para painéis, o modo em lote também pode ser executado pela linha de comando:
+
+    python ferramentas_clima.py --arquivo cidades.txt --formato jsonl --intervalo 300
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import urllib3
+from strands import tool
+from indice_de_cidades import city_index
+
+DEFAULT_BASE_URL = "https://api.openweathermap.org/data/2.5"
+
+# Intervalos de atualização do OpenWeatherMap: as condições atuais são atualizadas a
+# cada ~10 minutos e a previsão de 5 dias (pontos a cada 3 horas) a cada 3 horas
+CURRENT_WEATHER_TTL = 10 * 60
+FORECAST_TTL = 3 * 60 * 60
+
+# Respostas mantidas em cache por cliente; ao atingir o limite, as expiradas são
+# descartadas primeiro e depois as usadas há mais tempo
+CACHE_MAX_ENTRIES = 2048
+
+UNITS = {"metric": "°C", "imperial": "°F", "standard": "K"}
+
+# Limite do plano gratuito do OpenWeatherMap
+DEFAULT_REQUESTS_PER_MINUTE = 60
+
+# Similaridade mínima para usar as coordenadas de uma correspondência não exata do índice
+LOCATE_MIN_SCORE = 0.9
+
+
+class WeatherError(Exception):
+    """Falha ao consultar o clima (chave ausente, cidade não encontrada, erro HTTP...)."""
+
+
+@contextlib.contextmanager
+def _provider_response(endpoint):
+    """Converte respostas sem os campos esperados em WeatherError, em vez de KeyError/TypeError."""
+    try:
+        yield
+    except (KeyError, IndexError, TypeError, ValueError, AttributeError) as e:
+        raise WeatherError(f"Resposta inesperada do OpenWeatherMap ({endpoint}): "
+                           f"campo ausente ou inválido ({e!r}).") from e
+
+
+def _timestamp(seconds, offset=0):
+    """Converte um horário Unix (UTC) para ISO 8601 no fuso da cidade."""
+    local_time = datetime.fromtimestamp(seconds + offset, tz=timezone.utc).replace(tzinfo=None)
+    return local_time.isoformat(timespec="minutes")
+
+
+class RateLimiter:
+    """
+    Limita a taxa de requisições (token bucket), compartilhado entre threads.
+
+    Args:
+        per_minute: Requisições permitidas por minuto
+        burst: Requisições que podem ser feitas de uma vez antes de aplicar o limite
+    """
+
+    def __init__(self, per_minute, burst=10):
+        self.rate = per_minute / 60
+        self.capacity = min(burst, per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserva a vez: com o saldo negativo, as threads seguintes esperam mais
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+class WeatherClient:
+    """
+    Cliente do OpenWeatherMap com pool de conexões e cache por (cidade, unidades).
+
+    Args:
+        api_key: Chave da API (padrão: variável de ambiente OPENWEATHER_API_KEY)
+        base_url: URL base da API (padrão: OPENWEATHER_BASE_URL ou a API pública)
+        timeout: Tempo máximo de cada requisição em segundos
+        max_connections: Conexões mantidas abertas por host
+        index: Índice local de cidades (padrão: o índice compartilhado de indice_de_cidades.py)
+        requests_per_minute: Limite de requisições HTTP por minuto (padrão:
+            OPENWEATHER_REQUISICOES_POR_MINUTO ou 60; 0 desativa o limite)
+        cache_size: Número máximo de respostas mantidas em cache
+    """
+
+    def __init__(self, api_key=None, base_url=None, timeout=5.0, max_connections=10, index=None,
+                 requests_per_minute=None, cache_size=CACHE_MAX_ENTRIES):
+        self.api_key = api_key or os.environ.get("OPENWEATHER_API_KEY")
+        self.index = index if index is not None else city_index()
+        if requests_per_minute is None:
+            requests_per_minute = int(os.environ.get("OPENWEATHER_REQUISICOES_POR_MINUTO",
+                                                     DEFAULT_REQUESTS_PER_MINUTE))
+        self.max_connections = max_connections
+        self._rate_limiter = RateLimiter(requests_per_minute) if requests_per_minute > 0 else None
+        self.base_url = (base_url or os.environ.get("OPENWEATHER_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
+        self.requests = 0
+        self.cache_hits = 0
+        self._http = urllib3.PoolManager(
+            maxsize=max_connections,
+            timeout=urllib3.Timeout(total=timeout),
+            retries=urllib3.Retry(total=2, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504)),
+        )
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, endpoint, params, ttl, cache_key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(cache_key)
+            if entry is not None and entry[0] > now:
+                self._cache.move_to_end(cache_key)
+                self.cache_hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._cache[cache_key]
+
+        if not self.api_key:
+            raise WeatherError("A variável de ambiente OPENWEATHER_API_KEY não está configurada.")
+
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire()
+        response = self._http.request(
+            "GET", f"{self.base_url}/{endpoint}",
+            fields={**params, "appid": self.api_key, "lang": "pt_br"},
+        )
+        with self._lock:
+            self.requests += 1
+        if response.status == 404:
+            raise WeatherError(f"Localização não encontrada: {params.get('q', params)}")
+        if response.status == 401:
+            raise WeatherError("Chave da API do OpenWeatherMap inválida.")
+        if response.status != 200:
+            raise WeatherError(f"Erro {response.status} do OpenWeatherMap.")
+
+        try:
+            data = json.loads(response.data)
+        except ValueError as e:
+            raise WeatherError(f"Resposta inválida do OpenWeatherMap ({endpoint}): não é JSON.") from e
+        if not isinstance(data, dict):
+            raise WeatherError(f"Resposta inválida do OpenWeatherMap ({endpoint}): objeto JSON esperado.")
+        with self._lock:
+            self._store(cache_key, (now + ttl, data), now)
+        return data
+
+    def _store(self, cache_key, entry, now):
+        """Guarda uma resposta no cache, respeitando cache_size (chamado com _lock)."""
+        self._cache[cache_key] = entry
+        self._cache.move_to_end(cache_key)
+        if len(self._cache) <= self.cache_size:
+            return
+        for key in [key for key, (expires_at, _) in self._cache.items() if expires_at <= now]:
+            del self._cache[key]
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _locate(self, city):
+        """
+        Resolve a cidade no índice local. Correspondências exatas, ou aproximadas com
+        similaridade de ao menos LOCATE_MIN_SCORE e sem outra candidata, são consultadas por
+        coordenadas (e compartilham o cache entre grafias diferentes, como "Joao Pessoa" e
+        "João Pessoa"). As demais são enviadas pelo nome ao geocodificador do OpenWeatherMap:
+        um prefixo ou nome parecido ("Porto", "Santa Maria Madalena") pode ser outra cidade,
+        fora do índice.
+
+        Returns:
+            tuple: Parâmetros de localização, chave de cache e campos que descrevem a cidade
+        """
+        matches = self.index.search(city) if self.index is not None else []
+        best = matches[0] if matches else None
+        unambiguous = best is not None and (
+            best.method == "exata"
+            or (best.score >= LOCATE_MIN_SCORE
+                and all(m.score < LOCATE_MIN_SCORE for m in matches[1:]))
+        )
+        if not unambiguous:
+            fields = {}
+            if matches:
+                # O agente pode conferir se o usuário queria uma destas
+                fields["cidades_parecidas_no_indice"] = [m.place.label for m in matches]
+            return {"q": city.strip()}, city.strip().casefold(), fields
+
+        place = best.place
+        fields = {"cidade": place.name, "uf": place.state or None, "pais": place.country,
+                  "latitude": place.latitude, "longitude": place.longitude}
+        # Homônimos: a consulta usa o mais populoso, mas o agente pode perguntar qual era o desejado
+        namesakes = [m.place.label for m in matches[1:] if m.method == "exata"]
+        if best.method == "exata" and namesakes:
+            fields["outras_cidades_com_o_mesmo_nome"] = namesakes
+        params = {"lat": f"{place.latitude:.4f}", "lon": f"{place.longitude:.4f}"}
+        return params, f"{params['lat']},{params['lon']}", fields
+
+    def current(self, city, units="metric"):
+        """Condições atuais resumidas da cidade."""
+        units = units if units in UNITS else "metric"
+        params, location_key, location = self._locate(city)
+        data = self._get("weather", {**params, "units": units},
+                         CURRENT_WEATHER_TTL, ("weather", location_key, units))
+        with _provider_response("weather"):
+            return self._summarize_current(data, units, location)
+
+    @staticmethod
+    def _summarize_current(data, units, location):
+        offset = data.get("timezone", 0)
+        return {
+            "cidade": data.get("name"),
+            "pais": data.get("sys", {}).get("country"),
+            **location,
+            "descricao": ", ".join(w["description"] for w in data.get("weather", [])),
+            "temperatura": data["main"]["temp"],
+            "sensacao_termica": data["main"].get("feels_like"),
+            "minima": data["main"].get("temp_min"),
+            "maxima": data["main"].get("temp_max"),
+            "umidade_pct": data["main"].get("humidity"),
+            "vento": data.get("wind", {}).get("speed"),
+            "unidade_vento": "mph" if units == "imperial" else "m/s",
+            "nebulosidade_pct": data.get("clouds", {}).get("all"),
+            "unidade_temperatura": UNITS[units],
+            "observado_em_hora_local": _timestamp(data["dt"], offset) if "dt" in data else None,
+            "fonte": "OpenWeatherMap",
+        }
+
+    def forecast(self, city, units="metric", hours=24):
+        """Previsão em intervalos de 3 horas para as próximas `hours` horas."""
+        units = units if units in UNITS else "metric"
+        params, location_key, location = self._locate(city)
+        data = self._get("forecast", {**params, "units": units},
+                         FORECAST_TTL, ("forecast", location_key, units))
+        with _provider_response("forecast"):
+            return self._summarize_forecast(data, units, location, hours)
+
+    @staticmethod
+    def _summarize_forecast(data, units, location, hours):
+        city_data = data.get("city", {})
+        offset = city_data.get("timezone", 0)
+        points = max(1, min(40, round(hours / 3)))
+        return {
+            "cidade": city_data.get("name"),
+            "pais": city_data.get("country"),
+            **location,
+            "unidade_temperatura": UNITS[units],
+            "previsao": [
+                {
+                    "horario_local": _timestamp(item["dt"], offset),
+                    "temperatura": item["main"]["temp"],
+                    "descricao": ", ".join(w["description"] for w in item.get("weather", [])),
+                    "probabilidade_chuva_pct": round(item.get("pop", 0) * 100),
+                    "umidade_pct": item["main"].get("humidity"),
+                }
+                for item in data["list"][:points]
+            ],
+            "fonte": "OpenWeatherMap",
+        }
+
+    def current_many(self, cities, units="metric", max_workers=None):
+        """
+        Condições atuais de várias cidades, consultadas em paralelo pelo pool de conexões.
+
+        Nomes repetidos ou que resolvem para a mesma cidade ("Sampa" e "São Paulo") são
+        consultados uma única vez.
+
+        Args:
+            cities: Nomes das cidades
+            units: Unidades de medida
+            max_workers: Consultas simultâneas (padrão: o número de conexões do pool)
+
+        Returns:
+            list[dict]: Uma linha por cidade distinta, na ordem da primeira ocorrência; as
+            consultas que falharam têm apenas as chaves "consulta" e "erro"
+        """
+        unique = {}
+        for city in cities:
+            if city.strip():
+                unique.setdefault(self._locate(city)[1], city.strip())
+        if not unique:
+            return []
+
+        def fetch(city):
+            # Qualquer falha vira uma linha de erro, sem interromper as demais cidades
+            try:
+                return self.current(city, units)
+            except Exception as e:
+                return {"consulta": city, "erro": str(e) or type(e).__name__}
+
+        workers = min(max_workers or self.max_connections, len(unique))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(fetch, unique.values()))
+
+    def stats(self):
+        return {"requisicoes": self.requests, "acertos_cache": self.cache_hits}
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def weather_client():
+    """Retorna o cliente compartilhado, criado (e com a chave lida) no primeiro uso."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = WeatherClient()
+        return _client
+
+
+def _cell(value, spec="", suffix=""):
+    """Formata um valor da tabela; valores ausentes na resposta aparecem como "–"."""
+    if value is None or value == "":
+        return "–"
+    try:
+        return f"{value:{spec}}{suffix}"
+    except (TypeError, ValueError):
+        return f"{value}{suffix}"
+
+
+def format_table(rows):
+    """Tabela compacta (Markdown) com uma linha por cidade."""
+    lines = [
+        "| Cidade | Temp. | Sensação | Mín/Máx | Umidade | Vento | Condição |",
+        "|---|---|---|---|---|---|---|",
+    ]
+    for row in rows:
+        if "erro" in row:
+            lines.append(f"| {row['consulta']} | erro: {row['erro']} | | | | | |")
+            continue
+        unit = f" {row.get('unidade_temperatura', '')}"
+        name = row.get("cidade") or row.get("consulta") or "–"
+        if row.get("uf"):
+            name = f"{name}/{row['uf']}"
+        lines.append(
+            f"| {name} | {_cell(row.get('temperatura'), '.1f', unit)} | "
+            f"{_cell(row.get('sensacao_termica'), '.1f', unit)} | "
+            f"{_cell(row.get('minima'), '.0f')}/{_cell(row.get('maxima'), '.0f')} | "
+            f"{_cell(row.get('umidade_pct'), '', '%')} | "
+            f"{_cell(row.get('vento'), '', ' ' + row.get('unidade_vento', ''))} | "
+            f"{_cell(row.get('descricao'))} |"
+        )
+    return "\n".join(lines)
+
+
+def bulk_report(cities, units="metric", max_workers=None):
+    """Consulta várias cidades e retorna a tabela seguida de um resumo da consulta."""
+    client = weather_client()
+    started_at = time.perf_counter()
+    before = client.stats()
+    rows = client.current_many(cities, units, max_workers)
+    after = client.stats()
+    repeated = sum(1 for city in cities if city.strip()) - len(rows)
+    errors = sum(1 for row in rows if "erro" in row)
+    summary = (
+        f"{len(rows)} cidades ({repeated} repetidas ignoradas): "
+        f"{after['requisicoes'] - before['requisicoes']} consultas ao OpenWeatherMap, "
+        f"{after['acertos_cache'] - before['acertos_cache']} respostas do cache, {errors} com erro, "
+        f"em {time.perf_counter() - started_at:.2f}s"
+    )
+    return f"{format_table(rows)}\n\n{summary}"
+
+
+def _tool_result(fetch):
+    try:
+        return json.dumps(fetch(), ensure_ascii=False)
+    except WeatherError as e:
+        return f"Erro: {e}"
+    except urllib3.exceptions.HTTPError as e:
+        return f"Erro de conexão com o OpenWeatherMap: {e}"
+
+
+@tool
+def get_current_weather(city: str, units: str = "metric") -> str:
+    """
+    Consulta as condições meteorológicas atuais de uma cidade no OpenWeatherMap.
+
+    Args:
+        city: Nome da cidade como escrito pelo usuário, opcionalmente com a UF ou o país
+            (ex: "João Pessoa" ou "Bom Jesus, RS")
+        units: "metric" (°C, m/s), "imperial" (°F, mph) ou "standard" (K)
+
+    Returns:
+        JSON com descrição, temperatura, sensação térmica, mínima, máxima, umidade,
+        vento, nebulosidade e horário local da observação (e, se houver, as outras
+        cidades com o mesmo nome ou as cidades parecidas do índice local)
+    """
+    return _tool_result(lambda: weather_client().current(city, units))
+
+
+@tool
+def get_forecast(city: str, units: str = "metric", hours: int = 24) -> str:
+    """
+    Consulta a previsão do tempo de uma cidade no OpenWeatherMap, em intervalos de 3 horas.
+
+    Args:
+        city: Nome da cidade como escrito pelo usuário, opcionalmente com a UF ou o país
+            (ex: "Recife" ou "Bom Jesus, RS")
+        units: "metric" (°C, m/s), "imperial" (°F, mph) ou "standard" (K)
+        hours: Horizonte da previsão em horas (até 120)
+
+    Returns:
+        JSON com horário local, temperatura, descrição, probabilidade de chuva e umidade
+        de cada intervalo
+    """
+    return _tool_result(lambda: weather_client().forecast(city, units, hours))
+
+
+@tool
+def get_current_weather_bulk(cities: list[str], units: str = "metric") -> str:
+    """
+    Consulta as condições meteorológicas atuais de várias cidades de uma só vez, em
+    paralelo. Use esta ferramenta, em vez de várias chamadas de get_current_weather,
+    sempre que a pergunta envolver mais de uma cidade.
+
+    Args:
+        cities: Nomes das cidades como escritos pelo usuário, opcionalmente com a UF ou o
+            país (ex: ["João Pessoa", "Recife", "Bom Jesus, RS"])
+        units: "metric" (°C, m/s), "imperial" (°F, mph) ou "standard" (K)
+
+    Returns:
+        Tabela com temperatura, sensação térmica, mínima/máxima, umidade, vento e condição
+        de cada cidade, seguida de um resumo da consulta
+    """
+    return bulk_report(cities, units)
+
+
+def read_cities(path):
+    """Lê um arquivo com uma cidade por linha (linhas vazias e iniciadas por # são ignoradas)."""
+    with open(path, encoding="utf-8") as file:
+        return [line.strip() for line in file if line.strip() and not line.lstrip().startswith("#")]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Condições meteorológicas atuais de várias cidades, para painéis e monitoramento")
+    parser.add_argument("cidades", nargs="*", help='Nomes das cidades (ex: "João Pessoa" "Bom Jesus, RS")')
+    parser.add_argument("--arquivo", help="Arquivo com uma cidade por linha")
+    parser.add_argument("--unidades", default="metric", choices=sorted(UNITS), help="Unidades de medida")
+    parser.add_argument("--formato", default="tabela", choices=["tabela", "jsonl"],
+                        help="Tabela com resumo ou uma linha JSON por cidade")
+    parser.add_argument("--intervalo", type=float, default=0,
+                        help="Repete a consulta a cada N segundos (padrão: consulta uma única vez)")
+    parser.add_argument("--workers", type=int, help="Consultas simultâneas (padrão: 10)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    cities = args.cidades + (read_cities(args.arquivo) if args.arquivo else [])
+    if not cities:
+        raise SystemExit("Informe as cidades na linha de comando ou com --arquivo")
+
+    try:
+        while True:
+            started_at = time.monotonic()
+            if args.formato == "jsonl":
+                consulted_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+                for row in weather_client().current_many(cities, args.unidades, args.workers):
+                    print(json.dumps({"consultado_em": consulted_at, **row}, ensure_ascii=False), flush=True)
+            else:
+                print(bulk_report(cities, args.unidades, args.workers), flush=True)
+            if not args.intervalo:
+                break
+            time.sleep(max(0.0, args.intervalo - (time.monotonic() - started_at)))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Índice Local de Cidades
+
+Resolve nomes de cidades em coordenadas sem chamadas remotas, para que as ferramentas
+meteorológicas (ferramentas_clima.py) consultem o OpenWeatherMap diretamente por latitude
+e longitude. O índice é um arquivo binário lido por mapeamento em memória (mmap), com:
+
+- Chaves normalizadas (sem acentos, em minúsculas) em ordem, para busca exata e por
+  prefixo com busca binária
+- Listas de chaves por trigrama, para tolerar erros de digitação ("Joao Pesoa")
+- Nomes alternativos ("Sampa", "BH", "Floripa") apontando para a mesma cidade
+- Desempate entre homônimos pela UF ou país informado ("Bom Jesus, RS") ou, na ausência
+  deles, pela população
+
+O índice é construído a partir de um CSV no formato de dados/cidades_brasil.csv (capitais e
+maiores cidades do país, usado por padrão) ou de um arquivo do GeoNames (cities15000.txt):
+
+    python indice_de_cidades.py construir --fonte dados/cidades_brasil.csv
+    python indice_de_cidades.py buscar "joao pesoa"
+"""
+
+import argparse
+import csv
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+import unicodedata
+import zlib
+from dataclasses import dataclass
+
+SEED_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dados", "cidades_brasil.csv")
+DEFAULT_INDEX_PATH = os.path.join("cache", "indice_de_cidades.bin")
+
+# Formato do arquivo: cabeçalho, cidades, chaves, trigramas, listas de chaves e textos
+MAGIC = b"CIDADES1"
+HEADER = struct.Struct("<8sIIII")  # assinatura e quantidade de cidades, chaves, trigramas e entradas
+PLACE = struct.Struct("<ddIII")    # latitude, longitude, população, início e tamanho do texto
+KEY = struct.Struct("<III")        # início e tamanho da chave, cidade
+TRIGRAM = struct.Struct("<III")    # hash do trigrama, início e tamanho da lista de chaves
+POSTING = struct.Struct("<I")      # chave
+
+# Qualificador ao final da consulta: "Cidade, UF", "Cidade/UF" ou "Cidade - UF"
+QUALIFIER = re.compile(r"^(.+?)\s*(?:,|/|\s-)\s*([A-Za-z]{2})\s*$")
+
+# Limite de chaves percorridas na busca por prefixo
+MAX_PREFIX_KEYS = 200
+
+
+def fold(text):
+    """Normaliza um nome para comparação: sem acentos, pontuação e maiúsculas."""
+    folded = unicodedata.normalize("NFKD", text.casefold())
+    folded = "".join(c for c in folded if not unicodedata.combining(c))
+    return " ".join(re.sub(r"[^\w\s]", " ", folded).split())
+
+
+def trigrams(folded):
+    padded = f"  {folded} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _trigram_hash(trigram):
+    return zlib.crc32(trigram.encode("utf-8"))
+
+
+def split_qualifier(query):
+    """Separa "Cidade, UF" em ("Cidade", "UF"); sem qualificador, retorna (consulta, None)."""
+    match = QUALIFIER.match(query.strip())
+    if match is None:
+        return query.strip(), None
+    return match.group(1), match.group(2).upper()
+
+
+@dataclass(frozen=True)
+class Place:
+    """Cidade do índice."""
+    name: str
+    state: str
+    country: str
+    latitude: float
+    longitude: float
+    population: int = 0
+
+    @property
+    def label(self):
+        return ", ".join(part for part in (self.name, self.state, self.country) if part)
+
+
+@dataclass(frozen=True)
+class Match:
+    """Resultado de uma busca: a cidade, a similaridade (0 a 1) e o tipo de busca."""
+    place: Place
+    score: float
+    method: str  # "exata", "prefixo" ou "trigramas"
+
+
+def _read_csv(file):
+    for row in csv.DictReader(file):
+        place = Place(
+            row["nome"].strip(), (row.get("uf") or "").strip(), (row.get("pais") or "BR").strip(),
+            float(row["latitude"]), float(row["longitude"]), int(row.get("populacao") or 0),
+        )
+        alternates = [name.strip() for name in (row.get("nomes_alternativos") or "").split("|")]
+        yield place, [name for name in alternates if name]
+
+
+# Códigos admin1 do GeoNames (FIPS 10-4, numéricos) das unidades federativas brasileiras
+GEONAMES_BR_ADMIN1 = {
+    "01": "AC", "02": "AL", "03": "AP", "04": "AM", "05": "BA", "06": "CE", "07": "DF",
+    "08": "ES", "11": "MS", "13": "MA", "14": "MT", "15": "MG", "16": "PA", "17": "PB",
+    "18": "PR", "20": "PI", "21": "RJ", "22": "RN", "23": "RS", "24": "RO", "25": "RR",
+    "26": "SC", "27": "SP", "28": "SE", "29": "GO", "30": "PE", "31": "TO",
+}
+
+
+def _read_geonames(file):
+    # Colunas usadas do GeoNames: nome (1), nome ASCII (2), latitude (4), longitude (5),
+    # país (8), código da divisão administrativa (10) e população (14). O código da
+    # divisão é numérico; no Brasil, é convertido na sigla da UF para que qualificadores
+    # como "Bom Jesus, RS" funcionem. Nos demais países, fica vazio (desempate pelo país).
+    for line in file:
+        columns = line.rstrip("\n").split("\t")
+        if len(columns) < 15:
+            continue
+        state = GEONAMES_BR_ADMIN1.get(columns[10], "") if columns[8] == "BR" else ""
+        place = Place(columns[1], state, columns[8], float(columns[4]), float(columns[5]),
+                      int(columns[14] or 0))
+        yield place, [columns[2]]
+
+
+def read_places(path):
+    """
+    Lê as cidades de um CSV (colunas nome, uf, pais, latitude, longitude, populacao e
+    nomes_alternativos separados por "|") ou de um arquivo do GeoNames, separado por tabulações.
+
+    Returns:
+        list: Pares (Place, lista de nomes alternativos)
+    """
+    with open(path, encoding="utf-8", newline="") as file:
+        first_line = file.readline()
+        file.seek(0)
+        reader = _read_geonames if "\t" in first_line else _read_csv
+        return list(reader(file))
+
+
+def build_index(sources, output_path):
+    """
+    Constrói o arquivo do índice a partir de um ou mais arquivos de cidades.
+
+    Args:
+        sources: Caminhos dos arquivos de cidades (CSV ou GeoNames)
+        output_path: Caminho do índice, substituído atomicamente
+
+    Returns:
+        dict: Quantidade de cidades, chaves e trigramas do índice
+    """
+    places, keys = [], {}
+    for source in sources:
+        for place, alternates in read_places(source):
+            place_id = len(places)
+            places.append(place)
+            for name in [place.name, *alternates]:
+                if fold(name):
+                    keys[(fold(name), place_id)] = None
+
+    # Chaves em ordem de bytes; para o mesmo nome, a cidade mais populosa primeiro
+    ordered = sorted(keys, key=lambda k: (k[0].encode("utf-8"), -places[k[1]].population))
+    postings = {}
+    for key_id, (key, _) in enumerate(ordered):
+        for trigram in trigrams(key):
+            postings.setdefault(_trigram_hash(trigram), []).append(key_id)
+
+    blob = bytearray()
+
+    def add_text(text):
+        data = text.encode("utf-8")
+        blob.extend(data)
+        return len(blob) - len(data), len(data)
+
+    place_records = [
+        PLACE.pack(p.latitude, p.longitude, p.population, *add_text(f"{p.name}\t{p.state}\t{p.country}"))
+        for p in places
+    ]
+    key_records = [KEY.pack(*add_text(key), place_id) for key, place_id in ordered]
+    trigram_records, posting_records = [], []
+    for trigram_hash in sorted(postings):
+        trigram_records.append(TRIGRAM.pack(trigram_hash, len(posting_records), len(postings[trigram_hash])))
+        posting_records += [POSTING.pack(key_id) for key_id in postings[trigram_hash]]
+
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary_path = f"{output_path}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, len(place_records), len(key_records), len(trigram_records),
+                               len(posting_records)))
+        for records in (place_records, key_records, trigram_records, posting_records):
+            file.write(b"".join(records))
+        file.write(blob)
+    os.replace(temporary_path, output_path)
+    return {"cidades": len(place_records), "chaves": len(key_records), "trigramas": len(trigram_records)}
+
+
+class CityIndex:
+    """
+    Leitor do índice de cidades, mapeado em memória.
+
+    Nenhuma estrutura é carregada na abertura: as buscas binárias e as listas de
+    trigramas são lidas diretamente do arquivo mapeado, de modo que abrir o índice é
+    instantâneo e várias instâncias (ou processos) compartilham as mesmas páginas.
+
+    Args:
+        path: Caminho do arquivo gerado por build_index
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.place_count, self.key_count, self.trigram_count, posting_count = \
+            HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} não é um índice de cidades válido")
+        self._places_at = HEADER.size
+        self._keys_at = self._places_at + self.place_count * PLACE.size
+        self._trigrams_at = self._keys_at + self.key_count * KEY.size
+        self._postings_at = self._trigrams_at + self.trigram_count * TRIGRAM.size
+        self._blob_at = self._postings_at + posting_count * POSTING.size
+
+    def _text(self, offset, length):
+        start = self._blob_at + offset
+        return self._data[start:start + length]
+
+    def _key(self, key_id):
+        offset, length, place_id = KEY.unpack_from(self._data, self._keys_at + key_id * KEY.size)
+        return self._text(offset, length), place_id
+
+    def place(self, place_id):
+        latitude, longitude, population, offset, length = \
+            PLACE.unpack_from(self._data, self._places_at + place_id * PLACE.size)
+        name, state, country = self._text(offset, length).decode("utf-8").split("\t")
+        return Place(name, state, country, latitude, longitude, population)
+
+    def _prefixed(self, prefix):
+        """Chaves que começam com o prefixo, a partir da primeira encontrada por busca binária."""
+        low, high = 0, self.key_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle)[0] < prefix:
+                low = middle + 1
+            else:
+                high = middle
+        for key_id in range(low, min(low + MAX_PREFIX_KEYS, self.key_count)):
+            key, place_id = self._key(key_id)
+            if not key.startswith(prefix):
+                break
+            yield key, place_id
+
+    def _postings(self, trigram):
+        target = _trigram_hash(trigram)
+        low, high = 0, self.trigram_count
+        while low < high:
+            middle = (low + high) // 2
+            trigram_hash, start, count = TRIGRAM.unpack_from(self._data, self._trigrams_at + middle * TRIGRAM.size)
+            if trigram_hash == target:
+                return [POSTING.unpack_from(self._data, self._postings_at + (start + i) * POSTING.size)[0]
+                        for i in range(count)]
+            if trigram_hash < target:
+                low = middle + 1
+            else:
+                high = middle
+        return []
+
+    def _similar(self, folded, min_similarity):
+        """Chaves com similaridade de Jaccard entre trigramas de pelo menos min_similarity."""
+        query = trigrams(folded)
+        shared = {}
+        for trigram in query:
+            for key_id in self._postings(trigram):
+                shared[key_id] = shared.get(key_id, 0) + 1
+        # Limite superior da similaridade usando apenas as contagens, antes de ler as chaves
+        candidates = sorted(shared, key=shared.get, reverse=True)
+        for key_id in candidates:
+            if shared[key_id] / len(query) < min_similarity:
+                break
+            key, place_id = self._key(key_id)
+            key_trigrams = trigrams(key.decode("utf-8"))
+            similarity = len(query & key_trigrams) / len(query | key_trigrams)
+            if similarity >= min_similarity:
+                yield place_id, similarity
+
+    def search(self, query, limit=5, min_similarity=0.5):
+        """
+        Busca cidades pelo nome: primeiro a correspondência exata, depois por prefixo e,
+        por último, por similaridade de trigramas.
+
+        Args:
+            query: Nome da cidade, opcionalmente com a UF ou o país ("Bom Jesus, RS")
+            limit: Número máximo de resultados
+            min_similarity: Similaridade mínima das buscas por prefixo e por trigramas
+
+        Returns:
+            list[Match]: Resultados do mais ao menos provável
+        """
+        name, qualifier = split_qualifier(query)
+        folded = fold(name)
+        if not folded:
+            return []
+
+        found = {}
+
+        def collect(place_id, score, method):
+            if place_id in found and found[place_id].score >= score:
+                return
+            place = self.place(place_id)
+            if qualifier is None or qualifier in (place.state.upper(), place.country.upper()):
+                found[place_id] = Match(place, score, method)
+
+        encoded = folded.encode("utf-8")
+        for key, place_id in self._prefixed(encoded):
+            if key == encoded:
+                collect(place_id, 1.0, "exata")
+            elif len(encoded) / len(key) >= min_similarity:
+                collect(place_id, len(encoded) / len(key), "prefixo")
+        if not any(match.method == "exata" for match in found.values()):
+            for place_id, similarity in self._similar(folded, min_similarity):
+                collect(place_id, similarity, "trigramas")
+
+        ranked = sorted(found.values(), key=lambda m: (-m.score, -m.place.population))
+        return ranked[:limit]
+
+    def resolve(self, query):
+        """Retorna a cidade mais provável para a consulta, ou None."""
+        matches = self.search(query, limit=1)
+        return matches[0].place if matches else None
+
+    def close(self):
+        self._data.close()
+
+
+_index = None
+_index_loaded = False
+_index_lock = threading.Lock()
+
+
+def city_index():
+    """
+    Retorna o índice compartilhado, aberto no primeiro uso.
+
+    O caminho vem da variável de ambiente INDICE_DE_CIDADES; sem ela, usa
+    cache/indice_de_cidades.bin, construído a partir de dados/cidades_brasil.csv quando
+    não existe ou está desatualizado. Retorna None se o índice não puder ser aberto.
+    """
+    global _index, _index_loaded
+    with _index_lock:
+        if not _index_loaded:
+            _index_loaded = True
+            path = os.environ.get("INDICE_DE_CIDADES")
+            try:
+                if path is None:
+                    path = DEFAULT_INDEX_PATH
+                    if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(SEED_PATH):
+                        build_index([SEED_PATH], path)
+                _index = CityIndex(path)
+            except (OSError, ValueError) as e:
+                print(f"Índice de cidades indisponível ({e}); os nomes serão resolvidos pelo OpenWeatherMap")
+        return _index
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Índice local de cidades para as ferramentas meteorológicas")
+    commands = parser.add_subparsers(dest="comando", required=True)
+
+    build = commands.add_parser("construir", help="Constrói o índice a partir de arquivos de cidades")
+    build.add_argument("--fonte", nargs="+", default=[SEED_PATH],
+                       help="Arquivos CSV ou do GeoNames (padrão: dados/cidades_brasil.csv)")
+    build.add_argument("--saida", default=DEFAULT_INDEX_PATH, help="Caminho do índice gerado")
+
+    search = commands.add_parser("buscar", help="Busca uma cidade no índice")
+    search.add_argument("consulta", help='Nome da cidade, opcionalmente com a UF (ex: "Bom Jesus, RS")')
+    search.add_argument("--indice", default=DEFAULT_INDEX_PATH, help="Caminho do índice")
+    search.add_argument("--limite", type=int, default=5, help="Número máximo de resultados")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    if args.comando == "construir":
+        counts = build_index(args.fonte, args.saida)
+        print(f"Índice gravado em {args.saida}: {counts['cidades']} cidades, {counts['chaves']} nomes "
+              f"e {counts['trigramas']} trigramas")
+    else:
+        index = CityIndex(args.indice)
+        started_at = time.perf_counter()
+        matches = index.search(args.consulta, limit=args.limite)
+        elapsed = time.perf_counter() - started_at
+        for match in matches:
+            print(f"{match.place.label}: {match.place.latitude:.4f}, {match.place.longitude:.4f} "
+                  f"({match.method}, similaridade {match.score:.2f})")
+        if not matches:
+            print("Nenhuma cidade encontrada.")
+        print(f"Busca em {elapsed * 1e6:.0f} µs")
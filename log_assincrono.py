@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Logging Assíncrono e Estruturado
+
+Pipeline de logging que tira a escrita em arquivo da thread do agente, para que o log em
+nível DEBUG possa ficar ligado em produção sem aumentar a latência das respostas:
+
+- A thread que registra a mensagem apenas a coloca em uma fila (QueueHandler); se a fila
+  estiver cheia, o registro é descartado e contado, em vez de bloquear o agente
+- Uma thread em segundo plano consome a fila e grava em lotes, com uma única escrita e
+  um único flush por lote, em JSON lines (um objeto JSON por linha)
+- O arquivo é rotacionado por tamanho e/ou por tempo, mantendo os arquivos anteriores
+  numerados (arquivo.1, arquivo.2, ...)
+- Loggers muito verbosos podem ser amostrados (ex: manter 10% das mensagens de
+  strands.event_loop); avisos e erros nunca são descartados
+
+Para comparar a latência do FileHandler síncrono com a do pipeline em fila:
+
+    python log_assincrono.py --benchmark
+"""
+
+import argparse
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+# Atributos padrão de um LogRecord; os demais são campos extras (logger.info(..., extra={...}))
+STANDARD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+# Marca o fim da fila para a thread de escrita
+_STOP = object()
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formata cada registro como um objeto JSON em uma linha."""
+
+    def format(self, record):
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in STANDARD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Mantém apenas uma fração dos registros de cada logger.
+
+    Args:
+        rates: Nome do logger -> fração mantida (0 a 1); vale também para os loggers
+            filhos, e o nome mais específico prevalece
+        min_level: Registros deste nível em diante nunca são descartados
+    """
+
+    def __init__(self, rates, min_level=logging.WARNING):
+        super().__init__()
+        # Do nome mais específico para o mais genérico
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+        self.min_level = min_level
+
+    def filter(self, record):
+        if record.levelno >= self.min_level:
+            return True
+        for name, rate in self.rates:
+            if record.name == name or record.name.startswith(name + "."):
+                return random.random() < rate
+        return True
+
+
+def parse_sample_rates(text):
+    """Converte "strands.event_loop=0.1,urllib3=0.5" em {"strands.event_loop": 0.1, "urllib3": 0.5}."""
+    rates = {}
+    for item in (text or "").split(","):
+        if "=" in item:
+            name, rate = item.split("=", 1)
+            rates[name.strip()] = float(rate)
+    return rates
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler com o mínimo de trabalho na thread que registra a mensagem.
+
+    A mensagem é apenas interpolada (os argumentos podem mudar depois da chamada) e a
+    formatação em JSON fica para a thread de escrita. Quando a fila atinge max_size
+    registros, os novos são descartados e contados, em vez de bloquear quem registra.
+
+    Args:
+        log_queue: Fila consumida pela thread de escrita (queue.SimpleQueue)
+        max_size: Número máximo de registros pendentes
+    """
+
+    def __init__(self, log_queue, max_size=100_000):
+        super().__init__(log_queue)
+        self.max_size = max_size
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Sem a cópia e a formatação completa do QueueHandler padrão
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        return record
+
+    def enqueue(self, record):
+        if self.queue.qsize() >= self.max_size:
+            self.dropped += 1
+        else:
+            self.queue.put(record)
+
+
+class BatchingJsonLinesWriter:
+    """
+    Thread de escrita: consome a fila de registros e os grava em lotes.
+
+    Enquanto um lote é gravado, os registros seguintes se acumulam na fila e formam o
+    próximo lote; com pouco movimento, cada registro é gravado assim que chega.
+
+    Args:
+        path: Arquivo de log (JSON lines), aberto em modo de acréscimo
+        log_queue: Fila alimentada pelo QueueHandler
+        batch_size: Número máximo de registros por escrita
+        max_bytes: Rotaciona o arquivo ao atingir este tamanho (None: sem limite)
+        rotate_interval: Rotaciona o arquivo a cada N segundos (None: sem rotação por tempo)
+        backup_count: Número de arquivos rotacionados mantidos
+    """
+
+    def __init__(self, path, log_queue, batch_size=512, max_bytes=None, rotate_interval=None, backup_count=5):
+        self.path = path
+        self.queue = log_queue
+        self.batch_size = batch_size
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self.formatter = JsonLinesFormatter()
+        self.written = 0
+        self.batches = 0
+        self.rotations = 0
+        self.errors = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "ab")
+        self._opened_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """
+        Grava os registros pendentes e encerra a thread.
+
+        O arquivo é fechado pela própria thread de escrita ao terminar a fila; se ela
+        ainda estiver gravando quando o timeout expirar, continua em segundo plano e
+        nenhum registro é perdido por escrita em arquivo fechado.
+        """
+        if self._thread.ident is None:  # nunca iniciada: não há quem feche o arquivo
+            self._file.close()
+            return
+        self.queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            while True:
+                try:
+                    batch = [self.queue.get(timeout=1.0)]
+                except queue.Empty:
+                    self._rotate_if_needed(0)
+                    continue
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stopping = any(record is _STOP for record in batch)
+                self._write([record for record in batch if record is not _STOP])
+                if stopping:
+                    return
+        finally:
+            self._file.close()
+
+    def _write(self, records):
+        lines = []
+        for record in records:
+            try:
+                lines.append(self.formatter.format(record))
+            except Exception:
+                self.errors += 1
+        if not lines:
+            return
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+        self._rotate_if_needed(len(data))
+        self._file.write(data)
+        self._file.flush()
+        self.written += len(lines)
+        self.batches += 1
+
+    def _rotate_if_needed(self, pending_bytes):
+        by_size = self.max_bytes and self._file.tell() and self._file.tell() + pending_bytes > self.max_bytes
+        by_time = self.rotate_interval and time.monotonic() - self._opened_at >= self.rotate_interval
+        if not (by_size or by_time) or not self._file.tell():
+            return
+        self._file.close()
+        for number in range(self.backup_count - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{number}"):
+                os.replace(f"{self.path}.{number}", f"{self.path}.{number + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "ab")
+        self._opened_at = time.monotonic()
+        self.rotations += 1
+
+
+class AsyncLogging:
+    """Pipeline instalado por setup_async_logging: handler da fila e thread de escrita."""
+
+    def __init__(self, handler, writer):
+        self.handler = handler
+        self.writer = writer
+        self._stopped = False
+
+    def stop(self):
+        if not self._stopped:
+            self._stopped = True
+            logging.getLogger().removeHandler(self.handler)
+            self.writer.stop()
+
+    def stats(self):
+        return {
+            "gravados": self.writer.written,
+            "lotes": self.writer.batches,
+            "descartados_fila_cheia": self.handler.dropped,
+            "rotacoes": self.writer.rotations,
+            "erros": self.writer.errors,
+        }
+
+
+def setup_async_logging(path, level=logging.DEBUG, sample_rates=None, max_bytes=None, rotate_interval=None,
+                        backup_count=5, batch_size=512, queue_size=100_000):
+    """
+    Instala no logger raiz o pipeline de logging em fila, com escrita em lotes e JSON lines.
+
+    Args:
+        path: Arquivo de log
+        level: Nível do logger raiz
+        sample_rates: Nome do logger -> fração dos registros mantida (ver SamplingFilter)
+        max_bytes: Tamanho máximo do arquivo antes da rotação
+        rotate_interval: Intervalo de rotação em segundos
+        backup_count: Número de arquivos rotacionados mantidos
+        batch_size: Número máximo de registros por escrita
+        queue_size: Capacidade da fila; além dela, os registros são descartados
+
+    Returns:
+        AsyncLogging: O pipeline, encerrado automaticamente ao final do processo
+    """
+    log_queue = queue.SimpleQueue()
+    handler = DroppingQueueHandler(log_queue, queue_size)
+    if sample_rates:
+        handler.addFilter(SamplingFilter(sample_rates))
+    writer = BatchingJsonLinesWriter(path, log_queue, batch_size, max_bytes, rotate_interval, backup_count)
+    writer.start()
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(handler)
+    pipeline = AsyncLogging(handler, writer)
+    atexit.register(pipeline.stop)
+    return pipeline
+
+
+class _SlowStorage:
+    """Simula um disco lento (ex: um volume de rede): cada flush leva `delay` segundos."""
+
+    def __init__(self, file, delay):
+        self._file = file
+        self._delay = delay
+
+    def flush(self):
+        time.sleep(self._delay)
+        self._file.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+
+def _measure(logger, records, threads):
+    """Registra `records` mensagens em `threads` threads; retorna as latências de cada chamada."""
+    latencies = [[] for _ in range(threads)]
+
+    def work(samples):
+        for i in range(records // threads):
+            started_at = time.perf_counter()
+            logger.debug("ciclo %d: modelo respondeu com %d tokens", i, 42, extra={"cycle_id": i})
+            samples.append(time.perf_counter() - started_at)
+
+    workers = [threading.Thread(target=work, args=(samples,)) for samples in latencies]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return [latency for samples in latencies for latency in samples]
+
+
+def _report(name, latencies, elapsed):
+    ordered = sorted(latencies)
+    percentile = lambda p: ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1e6
+    print(f"{name:<22} p50 {percentile(50):7.1f} µs | p99 {percentile(99):8.1f} µs | "
+          f"máx {ordered[-1] * 1e6:9.1f} µs | média {statistics.fmean(ordered) * 1e6:6.1f} µs | "
+          f"{len(ordered) / elapsed:9.0f} registros/s na thread do agente")
+
+
+def benchmark(records=50_000, threads=4, flush_delay_ms=0.0):
+    """
+    Compara a latência de logger.debug com o FileHandler síncrono e com o pipeline em fila.
+
+    Args:
+        records: Mensagens registradas em cada cenário
+        threads: Threads registrando mensagens simultaneamente
+        flush_delay_ms: Atraso simulado de cada flush no disco, em milissegundos
+    """
+    delay = flush_delay_ms / 1000
+    with tempfile.TemporaryDirectory() as directory:
+        logger = logging.getLogger("benchmark")
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+
+        handler = logging.FileHandler(os.path.join(directory, "sincrono.log"))
+        handler.setFormatter(logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(message)s"))
+        if delay:
+            handler.stream = _SlowStorage(handler.stream, delay)
+        logger.addHandler(handler)
+        started_at = time.perf_counter()
+        latencies = _measure(logger, records, threads)
+        _report("FileHandler síncrono", latencies, time.perf_counter() - started_at)
+        logger.removeHandler(handler)
+        handler.close()
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = DroppingQueueHandler(log_queue, max_size=records + 1)
+        writer = BatchingJsonLinesWriter(os.path.join(directory, "fila.jsonl"), log_queue)
+        if delay:
+            writer._file = _SlowStorage(writer._file, delay)
+        writer.start()
+        logger.addHandler(queue_handler)
+        started_at = time.perf_counter()
+        latencies = _measure(logger, records, threads)
+        _report("Fila + escrita em lote", latencies, time.perf_counter() - started_at)
+        logger.removeHandler(queue_handler)
+        drain_started_at = time.perf_counter()
+        writer.stop(timeout=60)
+        print(f"Thread de escrita: {writer.written} registros em {writer.batches} lotes "
+              f"(média de {writer.written / max(1, writer.batches):.0f} por lote); fila esvaziada "
+              f"{(time.perf_counter() - drain_started_at) * 1000:.0f} ms após a última mensagem")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Logging assíncrono e estruturado (JSON lines)")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Compara o FileHandler síncrono com o pipeline em fila")
+    parser.add_argument("--registros", type=int, default=50_000, help="Mensagens registradas por cenário")
+    parser.add_argument("--threads", type=int, default=4, help="Threads registrando mensagens simultaneamente")
+    parser.add_argument("--atraso-disco-ms", type=float, default=0.0,
+                        help="Simula um disco lento: atraso de cada flush em milissegundos (ex: 0.2)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.benchmark:
+        benchmark(args.registros, args.threads, args.atraso_disco_ms)
+    else:
+        print("Use --benchmark para comparar os handlers; veja setup_async_logging para usar o pipeline.")
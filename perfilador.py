@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Perfilador de Turnos do Agente
+
+Mede cada turno de um agente Strands e o grava como uma árvore de spans no formato JSON do
+OpenTelemetry (OTLP/JSON, uma requisição de exportação por linha), que pode ser lida pelo
+receptor de arquivos do OpenTelemetry Collector ou analisada pela linha de comando:
+
+    invoke_agent                    turno completo (tokens de entrada e saída acumulados)
+    └── cycle                       um ciclo do event loop
+        ├── chat                    chamada ao modelo (tempo até o 1º token, tokens)
+        └── execute_tool <nome>     execução de cada ferramenta
+
+Os spans são montados a partir dos eventos do callback_handler (ciclos, fluxo do modelo,
+uso de tokens) e, quando disponíveis na versão instalada do Strands, dos hooks de
+modelo e de ferramentas, que dão o início e o fim exatos de cada chamada. Sem os hooks,
+o tempo das ferramentas de um ciclo é medido do fim da resposta do modelo até a chegada
+dos resultados.
+
+Para obter p50, p95 e p99 de cada etapa a partir do arquivo gravado:
+
+    python perfilador.py logs/perfil.jsonl
+"""
+
+import argparse
+import json
+import math
+import os
+import secrets
+import threading
+import time
+from dataclasses import dataclass, field
+
+DEFAULT_PROFILE_PATH = os.path.join("logs", "perfil.jsonl")
+
+# Tipos de span do OpenTelemetry
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+
+# Códigos de status do OpenTelemetry
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+def _hook_events():
+    """
+    Retorna os eventos de hook (antes/depois da ferramenta, antes/depois do modelo) da versão
+    instalada do Strands, ou None se ela não tiver hooks de ferramentas.
+    """
+    try:
+        from strands.hooks import AfterModelCallEvent, AfterToolCallEvent, BeforeModelCallEvent, BeforeToolCallEvent
+        return BeforeToolCallEvent, AfterToolCallEvent, BeforeModelCallEvent, AfterModelCallEvent
+    except ImportError:
+        pass
+    try:
+        # Nomes usados enquanto os hooks eram experimentais
+        from strands.experimental.hooks import (
+            AfterModelInvocationEvent,
+            AfterToolInvocationEvent,
+            BeforeModelInvocationEvent,
+            BeforeToolInvocationEvent,
+        )
+        return BeforeToolInvocationEvent, AfterToolInvocationEvent, BeforeModelInvocationEvent, AfterModelInvocationEvent
+    except ImportError:
+        return None
+
+
+@dataclass
+class Span:
+    """Intervalo medido, no modelo de dados do OpenTelemetry."""
+    name: str
+    trace_id: str
+    parent_id: str = ""
+    kind: int = SPAN_KIND_INTERNAL
+    span_id: str = field(default_factory=lambda: secrets.token_hex(8))
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int = 0
+    attributes: dict = field(default_factory=dict)
+    error: bool = False
+
+    @property
+    def duration_ms(self):
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def end(self, error=False):
+        if not self.end_ns:
+            self.end_ns = time.time_ns()
+        self.error = self.error or error
+
+    def to_otlp(self):
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": STATUS_ERROR if self.error else STATUS_OK},
+        }
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _from_otlp_value(value):
+    if "intValue" in value:
+        return int(value["intValue"])
+    for key in ("doubleValue", "boolValue", "stringValue"):
+        if key in value:
+            return value[key]
+    return None
+
+
+class TurnProfiler:
+    """
+    Perfilador de turnos: registra a árvore de spans de cada chamada ao agente.
+
+    Uso:
+        profiler = TurnProfiler()
+        agent = Agent(..., callback_handler=profiler.callback_handler(), hooks=profiler.hooks())
+
+    Args:
+        path: Arquivo JSON lines onde cada turno é acrescentado
+        service_name: Valor de service.name nos recursos do OpenTelemetry
+    """
+
+    def __init__(self, path=DEFAULT_PROFILE_PATH, service_name="agente"):
+        self.path = path
+        self.service_name = service_name
+        self.last_turn = []
+        self._lock = threading.Lock()
+        self._spans = []
+        self._turn = None
+        self._cycle = None
+        self._chat = None
+        self._chat_started_at = 0.0
+        self._last_chat = None
+        self._tools = {}
+        self._model_hooks = False
+        self._tool_hooks = False
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    # Spans
+
+    def _start(self, name, parent, kind=SPAN_KIND_INTERNAL, **attributes):
+        span = Span(name, parent.trace_id if parent else secrets.token_hex(16),
+                    parent.span_id if parent else "", kind, attributes=attributes)
+        self._spans.append(span)
+        return span
+
+    def _start_turn(self):
+        if self._turn is not None:
+            # O turno anterior terminou sem resultado (ex: exceção no agente)
+            self._finish_turn(error=True)
+        self._turn = self._start("invoke_agent", None)
+
+    def _start_chat(self):
+        if self._chat is not None:
+            self._chat.end()
+        self._chat = self._start("chat", self._cycle or self._turn, SPAN_KIND_CLIENT)
+        self._chat_started_at = time.perf_counter()
+
+    def _end_chat(self, error=False):
+        if self._chat is not None:
+            self._chat.end(error)
+            self._last_chat, self._chat = self._chat, None
+
+    def _start_tool(self, tool_use):
+        tool_id = tool_use.get("toolUseId", tool_use.get("name"))
+        self._tools[tool_id] = self._start(f"execute_tool {tool_use.get('name')}", self._cycle or self._turn,
+                                           **{"gen_ai.tool.name": tool_use.get("name", ""),
+                                              "gen_ai.tool.call.id": tool_id})
+
+    def _end_tool(self, tool_id, error=False):
+        span = self._tools.pop(tool_id, None)
+        if span is not None:
+            span.end(error)
+
+    def _end_cycle(self):
+        self._end_chat()
+        for tool_id in list(self._tools):
+            self._end_tool(tool_id)
+        if self._cycle is not None:
+            self._cycle.end()
+            self._cycle = None
+
+    def _finish_turn(self, error=False):
+        # Os tokens do turno são somados das chamadas ao modelo: as métricas do AgentResult
+        # acumulam todos os turnos do agente
+        self._end_cycle()
+        turn = self._turn
+        turn.end(error)
+
+        chats = [s for s in self._spans if s.name == "chat"]
+        turn.attributes["agent.cycles"] = sum(1 for s in self._spans if s.name == "cycle")
+        turn.attributes["gen_ai.usage.input_tokens"] = sum(s.attributes.get("gen_ai.usage.input_tokens", 0) for s in chats)
+        turn.attributes["gen_ai.usage.output_tokens"] = sum(s.attributes.get("gen_ai.usage.output_tokens", 0) for s in chats)
+
+        record = {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+            "scopeSpans": [{"scope": {"name": "perfilador"}, "spans": [s.to_otlp() for s in self._spans]}],
+        }]}
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        self.last_turn, self._spans, self._turn = self._spans, [], None
+
+    # Eventos do callback_handler
+
+    def on_event(self, **kwargs):
+        """Atualiza os spans a partir de um evento do callback_handler do Strands."""
+        with self._lock:
+            if kwargs.get("init_event_loop") or (self._turn is None and kwargs.get("start_event_loop")):
+                self._start_turn()
+            if self._turn is None:
+                return
+
+            if kwargs.get("start_event_loop"):
+                self._end_cycle()
+                self._cycle = self._start("cycle", self._turn)
+                if not self._model_hooks:
+                    self._start_chat()
+
+            event = kwargs.get("event")
+            if isinstance(event, dict):
+                self._on_stream_event(event)
+
+            message = kwargs.get("message")
+            if isinstance(message, dict):
+                self._on_message(message)
+
+            if "result" in kwargs:
+                self._finish_turn()
+
+    def _on_stream_event(self, event):
+        if "contentBlockDelta" in event and self._chat is not None \
+                and "gen_ai.response.time_to_first_token_ms" not in self._chat.attributes:
+            first_token_ms = (time.perf_counter() - self._chat_started_at) * 1000
+            self._chat.attributes["gen_ai.response.time_to_first_token_ms"] = round(first_token_ms, 3)
+        if "metadata" in event:
+            # O uso de tokens chega no fim do fluxo da resposta
+            chat = self._chat or self._last_chat
+            if chat is not None:
+                usage = event["metadata"].get("usage", {})
+                chat.attributes["gen_ai.usage.input_tokens"] = usage.get("inputTokens", 0)
+                chat.attributes["gen_ai.usage.output_tokens"] = usage.get("outputTokens", 0)
+                latency = event["metadata"].get("metrics", {}).get("latencyMs")
+                if latency is not None:
+                    chat.attributes["gen_ai.provider.latency_ms"] = latency
+
+    def _on_message(self, message):
+        contents = message.get("content", [])
+        if message.get("role") == "assistant":
+            if not self._model_hooks:
+                self._end_chat()
+            if not self._tool_hooks:
+                for block in contents:
+                    if "toolUse" in block:
+                        self._start_tool(block["toolUse"])
+        elif message.get("role") == "user" and not self._tool_hooks:
+            for block in contents:
+                if "toolResult" in block:
+                    result = block["toolResult"]
+                    self._end_tool(result.get("toolUseId"), error=result.get("status") == "error")
+
+    def callback_handler(self, inner=None, print_output=True):
+        """
+        Retorna um callback_handler que registra os spans e repassa os eventos.
+
+        Args:
+            inner: callback_handler original, chamado depois do perfilador
+            print_output: Sem inner, mantém a saída padrão do Strands no console
+        """
+        if inner is None and print_output:
+            from strands.handlers.callback_handler import PrintingCallbackHandler
+            inner = PrintingCallbackHandler()
+
+        def handler(**kwargs):
+            self.on_event(**kwargs)
+            if inner is not None:
+                inner(**kwargs)
+
+        return handler
+
+    # Hooks do Strands
+
+    def hooks(self):
+        """Retorna os hooks a passar para o Agent (lista vazia se a versão do Strands não os tiver)."""
+        return [self] if _hook_events() is not None else []
+
+    def register_hooks(self, registry, **kwargs):
+        before_tool, after_tool, before_model, after_model = _hook_events()
+        registry.add_callback(before_tool, self._before_tool)
+        registry.add_callback(after_tool, self._after_tool)
+        registry.add_callback(before_model, self._before_model)
+        registry.add_callback(after_model, self._after_model)
+        self._tool_hooks = self._model_hooks = True
+
+    def _before_tool(self, event):
+        with self._lock:
+            if self._turn is not None:
+                self._start_tool(event.tool_use)
+
+    def _after_tool(self, event):
+        result = getattr(event, "result", None) or {}
+        failed = getattr(event, "exception", None) is not None or result.get("status") == "error"
+        with self._lock:
+            self._end_tool(event.tool_use.get("toolUseId", event.tool_use.get("name")), failed)
+
+    def _before_model(self, event):
+        with self._lock:
+            if self._turn is not None:
+                self._start_chat()
+
+    def _after_model(self, event):
+        with self._lock:
+            self._end_chat(getattr(event, "exception", None) is not None)
+
+    def summary(self):
+        """Resumo de uma linha do último turno registrado."""
+        if not self.last_turn:
+            return "Nenhum turno registrado."
+        turn = next(s for s in self.last_turn if s.name == "invoke_agent")
+        chats = [s for s in self.last_turn if s.name == "chat"]
+        tools = [s for s in self.last_turn if s.name.startswith("execute_tool")]
+        first_tokens = [s.attributes["gen_ai.response.time_to_first_token_ms"] for s in chats
+                        if "gen_ai.response.time_to_first_token_ms" in s.attributes]
+        parts = [
+            f"Turno: {turn.duration_ms / 1000:.2f}s",
+            f"{turn.attributes['agent.cycles']} ciclos",
+            f"modelo {sum(s.duration_ms for s in chats) / 1000:.2f}s em {len(chats)} chamadas"
+            + (f" (1º token em {first_tokens[0]:.0f} ms)" if first_tokens else ""),
+            f"ferramentas {sum(s.duration_ms for s in tools) / 1000:.2f}s em {len(tools)} chamadas",
+            f"tokens {turn.attributes['gen_ai.usage.input_tokens']} → {turn.attributes['gen_ai.usage.output_tokens']}",
+        ]
+        return " | ".join(parts)
+
+
+def read_spans(path):
+    """Lê os spans de um arquivo OTLP/JSON lines (uma requisição de exportação por linha)."""
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            for resource_spans in json.loads(line).get("resourceSpans", []):
+                for scope_spans in resource_spans.get("scopeSpans", []):
+                    for span in scope_spans.get("spans", []):
+                        attributes = {a["key"]: _from_otlp_value(a["value"]) for a in span.get("attributes", [])}
+                        duration_ms = (int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"])) / 1e6
+                        yield span["name"], duration_ms, attributes
+
+
+def percentile(ordered, p):
+    """Percentil pelo método do posto mais próximo, sobre valores já ordenados."""
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def analyze(paths):
+    """
+    Agrupa as medidas dos arquivos de perfil por etapa.
+
+    Returns:
+        tuple: (etapa -> latências em ms, métrica -> contagens de tokens por turno)
+    """
+    latencies, tokens = {}, {}
+    for path in paths:
+        for name, duration_ms, attributes in read_spans(path):
+            latencies.setdefault(name, []).append(duration_ms)
+            if "gen_ai.response.time_to_first_token_ms" in attributes:
+                latencies.setdefault("chat (1º token)", []).append(attributes["gen_ai.response.time_to_first_token_ms"])
+            if name == "invoke_agent":
+                tokens.setdefault("tokens de entrada", []).append(attributes.get("gen_ai.usage.input_tokens", 0))
+                tokens.setdefault("tokens de saída", []).append(attributes.get("gen_ai.usage.output_tokens", 0))
+                tokens.setdefault("ciclos", []).append(attributes.get("agent.cycles", 0))
+    return latencies, tokens
+
+
+def format_report(latencies, tokens):
+    lines = [f"{'Etapa':<40} {'n':>6} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'máx ms':>10}"]
+    for name in sorted(latencies, key=lambda n: (not n.startswith("invoke_agent"), n)):
+        ordered = sorted(latencies[name])
+        lines.append(f"{name:<40} {len(ordered):>6} {percentile(ordered, 50):>10.1f} {percentile(ordered, 95):>10.1f} "
+                     f"{percentile(ordered, 99):>10.1f} {ordered[-1]:>10.1f}")
+    if tokens:
+        lines += ["", f"{'Por turno':<40} {'n':>6} {'p50':>10} {'p95':>10} {'p99':>10} {'máx':>10}"]
+        for name, values in tokens.items():
+            ordered = sorted(values)
+            lines.append(f"{name:<40} {len(ordered):>6} {percentile(ordered, 50):>10} {percentile(ordered, 95):>10} "
+                         f"{percentile(ordered, 99):>10} {ordered[-1]:>10}")
+    return "\n".join(lines)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Latência por etapa (p50/p95/p99) a partir dos perfis de turnos")
+    parser.add_argument("arquivos", nargs="*", default=[DEFAULT_PROFILE_PATH],
+                        help="Arquivos de perfil em OTLP/JSON lines (padrão: logs/perfil.jsonl)")
+    parser.add_argument("--json", action="store_true", help="Emite as estatísticas em JSON")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    latencies, tokens = analyze(args.arquivos)
+    if not latencies:
+        raise SystemExit("Nenhum span encontrado.")
+    if args.json:
+        stats = {
+            name: {"n": len(values), **{f"p{p}": percentile(sorted(values), p) for p in (50, 95, 99)}}
+            for name, values in {**latencies, **tokens}.items()
+        }
+        print(json.dumps(stats, ensure_ascii=False, indent=2))
+    else:
+        print(format_report(latencies, tokens))
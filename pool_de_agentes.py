@@ -0,0 +1,133 @@
+"""
+Pool de Agentes Reutilizáveis
+
+Este módulo foi desenvolvido como exemplo para a sessão "AIM307" do AWS Summit São Paulo 2025.
+É compartilhado pelas demos 6 (etapas do fluxo de trabalho) e 7 (especialistas do professor).
+
+Criar um Agent a cada consulta repete o processamento do prompt de sistema e das
+especificações de ferramentas. O pool mantém agentes já construídos, agrupados por
+papel (pesquisador, analista, ...), que são emprestados a quem precisa e devolvidos
+ao final da consulta. Na devolução o histórico de conversa e as métricas do agente
+são apagados, para que uma consulta nunca enxergue as mensagens de outra.
+
+Exemplo:
+    pool = AgentPool()
+    pool.register("analista", lambda: Agent(model=modelo, system_prompt=PROMPT))
+
+    with pool.agent("analista") as analyst_agent:
+        resposta = analyst_agent("...")
+"""
+
+import queue
+import threading
+from contextlib import contextmanager
+
+
+class AgentPool:
+    """
+    Pool de agentes pré-construídos, agrupados por papel.
+
+    Cada papel tem uma fábrica que constrói novos agentes sob demanda, até o limite
+    de `max_agents_per_role` (ou o limite próprio do papel). Quando todos os agentes
+    de um papel estão emprestados, quem pede um agente aguarda até que algum seja
+    devolvido.
+
+    Args:
+        max_agents_per_role: Número máximo de agentes construídos para cada papel
+    """
+
+    def __init__(self, max_agents_per_role=8):
+        self.max_agents_per_role = max_agents_per_role
+        self._factories = {}
+        self._idle = {}
+        self._created = {}
+        self._limits = {}
+        self._lock = threading.Lock()
+
+    def register(self, role, factory, prewarm=0, max_agents=None):
+        """
+        Registra a fábrica de agentes de um papel.
+
+        Args:
+            role: Nome do papel (ex: "pesquisador")
+            factory: Função sem argumentos que constrói um novo Agent
+            prewarm: Quantidade de agentes construídos imediatamente
+            max_agents: Limite de agentes do papel (padrão: max_agents_per_role)
+        """
+        with self._lock:
+            self._factories[role] = factory
+            self._idle[role] = queue.LifoQueue()
+            self._created[role] = 0
+            if max_agents is not None:
+                self._limits[role] = max_agents
+        for _ in range(min(prewarm, self._limit(role))):
+            agent = factory()
+            with self._lock:
+                self._created[role] += 1
+            self._idle[role].put(agent)
+
+    def _limit(self, role):
+        return self._limits.get(role, self.max_agents_per_role)
+
+    def checkout(self, role, timeout=None):
+        """
+        Empresta um agente do papel indicado, construindo um novo se necessário.
+
+        Args:
+            role: Nome do papel registrado
+            timeout: Tempo máximo de espera por um agente livre (None para aguardar sempre)
+
+        Returns:
+            Agent: Agente com histórico de conversa vazio
+        """
+        if role not in self._factories:
+            raise KeyError(f"Papel de agente não registrado: '{role}'")
+
+        idle = self._idle[role]
+        try:
+            return idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created[role] < self._limit(role)
+            if can_create:
+                self._created[role] += 1
+        if can_create:
+            try:
+                return self._factories[role]()
+            except BaseException:
+                with self._lock:
+                    self._created[role] -= 1
+                raise
+
+        try:
+            return idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"Nenhum agente '{role}' disponível após {timeout}s") from None
+
+    def checkin(self, role, agent):
+        """Devolve um agente ao pool, apagando seu histórico de conversa."""
+        agent.messages.clear()
+        # As métricas do loop de eventos acumulam entre invocações do mesmo agente.
+        # Substituí-las (em vez de zerá-las) preserva as métricas do AgentResult já
+        # entregue a quem usou o agente.
+        if hasattr(agent, "event_loop_metrics"):
+            agent.event_loop_metrics = type(agent.event_loop_metrics)()
+        self._idle[role].put(agent)
+
+    @contextmanager
+    def agent(self, role, timeout=None):
+        """Empresta um agente durante o bloco `with` e o devolve ao final."""
+        agent = self.checkout(role, timeout=timeout)
+        try:
+            yield agent
+        finally:
+            self.checkin(role, agent)
+
+    def stats(self):
+        """Retorna, por papel, quantos agentes foram construídos e quantos estão livres."""
+        return {
+            role: {"construidos": self._created[role], "livres": self._idle[role].qsize()}
+            for role in self._factories
+        }
@@ -0,0 +1,11 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Os exemplos numerados não são pacotes: cada diretório importa seus módulos pelo caminho
+for path in (ROOT, ROOT / "6_fluxo_de_trabalho_multi_agente",
+             ROOT / "7_multi_agentes_como_ferramentas",
+             ROOT / "8_multi_agentes_com_peer_to_peer"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
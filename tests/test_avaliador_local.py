@@ -0,0 +1,27 @@
+import pytest
+
+from avaliador_local import solve_locally
+
+
+@pytest.mark.parametrize("query, result", [
+    ("quanto é 2 + 3 * 4?", "**Resultado:** 14"),
+    ("quanto dá 7,5 / 2?", "**Resultado:** 3,75"),
+    ("resolva 2x + 4 = 10", "**Resultado:** x = 3"),
+    ("1,5 + 1", "**Resultado:** 2,5"),
+])
+def test_solved_locally(query, result):
+    assert solve_locally(query).endswith(result)
+
+
+@pytest.mark.parametrize("query", [
+    "quanto é 5!",
+    "quanto é (2 + 1)!?",
+    "1.000 + 1",
+    "2 + 2 = 4",
+    "2 + 2 = 5",
+    "quanto é 2 + 2 para você?",
+    "sen(30)",
+    "quanto é cos(60) + 1?",
+])
+def test_escalated_to_agent(query):
+    assert solve_locally(query) is None
@@ -0,0 +1,51 @@
+import pytest
+
+from cache_semantico import SemanticCache, hashed_ngram_embedding, same_claim_structure
+
+DIFFERENT_CLAIMS = [
+    ("Terça-feira vem antes de segunda-feira na semana.",
+     "Segunda-feira vem antes de terça-feira na semana."),
+    ("Thomas Edison inventou a lâmpada", "Thomas Edison não inventou a lâmpada"),
+    ("Limão cura câncer", "Limão não cura câncer"),
+]
+
+
+@pytest.mark.parametrize("embed", [None, hashed_ngram_embedding])
+@pytest.mark.parametrize("stored, asked", DIFFERENT_CLAIMS)
+def test_negated_or_reordered_claims_miss(embed, stored, asked):
+    cache = SemanticCache(embed, threshold=0.85)
+    cache.store(stored, "resposta")
+    assert cache.lookup(asked) is None
+
+
+def test_exact_match_ignores_case_accents_and_punctuation():
+    cache = SemanticCache()
+    cache.store("Limão cura câncer?", "falso")
+    assert cache.lookup("  limao CURA cancer ") == "falso"
+    assert cache.metrics()["acertos"] == 1
+
+
+def test_default_cache_does_not_reuse_paraphrases():
+    cache = SemanticCache()
+    cache.store("Thomas Edison inventou a lâmpada", "resposta")
+    assert cache.lookup("Thomas Edison inventou a lâmpada elétrica") is None
+
+
+def test_embedding_hit_requires_same_structure():
+    cache = SemanticCache(hashed_ngram_embedding, threshold=0.8)
+    cache.store("Thomas Edison inventou a lâmpada", "resposta")
+    assert cache.lookup("Thomas Edison inventou a lâmpada elétrica") == "resposta"
+
+
+def test_capacity_evicts_oldest_entry():
+    cache = SemanticCache(capacity=2)
+    for text in ("um", "dois", "três"):
+        cache.store(text, text)
+    assert cache.lookup("um") is None
+    assert cache.lookup("três") == "três"
+
+
+def test_same_claim_structure():
+    assert same_claim_structure("A Terra é redonda", "a terra é redonda!")
+    assert not same_claim_structure("A Terra é redonda", "A Terra nunca foi redonda")
+    assert not same_claim_structure("Paris fica antes de Roma", "Roma fica antes de Paris")
@@ -0,0 +1,31 @@
+from compactacao import compact_sources, compact_text
+
+PASSAGE = ("O Agente Pesquisador consulta a web e a base de conhecimento antes de o Agente "
+           "Analista avaliar a confiabilidade das fontes encontradas.")
+
+
+def test_duplicate_from_another_source_keeps_url_and_confirmation():
+    web = f"{PASSAGE} Fonte: https://web.example/artigo"
+    kb = f"{PASSAGE} Fonte: https://kb.example/doc42"
+    (web_text, kb_text), stats = compact_sources([web, kb], 2500)
+
+    assert web_text == web
+    assert kb_text.startswith("Confirma o trecho da fonte 1: “O Agente Pesquisador consulta")
+    assert "Fontes adicionais: https://kb.example/doc42" in kb_text
+    assert stats["duplicadas"] == 1
+
+
+def test_duplicate_within_a_source_is_dropped_without_note():
+    text = f"{PASSAGE} https://a.example\n\n{PASSAGE} https://b.example"
+    compacted, stats = compact_text(text, 2500)
+    assert "Confirma" not in compacted
+    assert compacted.endswith("Fontes adicionais: https://b.example")
+    assert stats["duplicadas"] == 1
+
+
+def test_budget_keeps_urls_of_dropped_passages():
+    passages = [f"Passagem {i} com bastante texto sobre um assunto diferente {'x' * 300} "
+                f"https://fonte.example/{i}" for i in range(10)]
+    compacted, stats = compact_text("\n\n".join(passages), 300)
+    assert stats["descartadas"] > 0
+    assert "https://fonte.example/9" in compacted
@@ -0,0 +1,193 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+pytest.importorskip("strands")
+pytest.importorskip("urllib3")
+
+import ferramentas_clima
+from ferramentas_clima import WeatherClient, WeatherError, format_table
+from indice_de_cidades import SEED_PATH, CityIndex, build_index
+
+API_KEY = "chave-de-teste"
+
+
+class OpenWeatherStandIn(BaseHTTPRequestHandler):
+    """Simula os endpoints /weather e /forecast do OpenWeatherMap."""
+
+    protocol_version = "HTTP/1.1"
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.requests.append((url.path, query))
+        name = query.get("q", f"{query.get('lat')},{query.get('lon')}")
+
+        if query.get("appid") != API_KEY:
+            return self._send(401, {"cod": 401, "message": "Invalid API key"})
+        if name.startswith("Nenhuma"):
+            return self._send(404, {"cod": "404", "message": "city not found"})
+        if name == "Quebrada":
+            return self._send(200, b"<html>manutencao</html>")
+        if name == "Incompleta":
+            return self._send(200, {"name": name})
+        if url.path.endswith("/weather"):
+            return self._send(200, {
+                "name": name, "sys": {"country": "BR"}, "timezone": -10800, "dt": 1760000000,
+                "weather": [{"description": "céu limpo"}], "wind": {"speed": 4.1},
+                "main": {"temp": 29.5, "feels_like": 31.0, "temp_min": 28.0, "temp_max": 30.0,
+                         "humidity": 70},
+            })
+        return self._send(200, {
+            "city": {"name": name, "country": "BR", "timezone": -10800},
+            "list": [{"dt": 1760000000 + i * 10800, "main": {"temp": 25 + i, "humidity": 60},
+                      "weather": [{"description": "nublado"}], "pop": 0.2} for i in range(40)],
+        })
+
+    def _send(self, status, body):
+        payload = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OpenWeatherStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/data/2.5"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(scope="module")
+def index(tmp_path_factory):
+    path = tmp_path_factory.mktemp("indice") / "cidades.bin"
+    build_index([SEED_PATH], str(path))
+    return CityIndex(str(path))
+
+
+@pytest.fixture
+def client(base_url, index):
+    OpenWeatherStandIn.requests.clear()
+    return WeatherClient(api_key=API_KEY, base_url=base_url, index=index, requests_per_minute=0)
+
+
+def test_current_weather_by_index_coordinates(client):
+    weather = client.current("Joao Pessoa")
+    assert (weather["cidade"], weather["uf"], weather["temperatura"]) == ("João Pessoa", "PB", 29.5)
+    assert OpenWeatherStandIn.requests[0][1]["lat"] == "-7.1195"
+    assert "q" not in OpenWeatherStandIn.requests[0][1]
+
+
+def test_cache_is_shared_between_spellings(client):
+    client.current("João Pessoa")
+    client.current("joao pessoa")
+    client.current("João Pessoa", units="imperial")
+    assert client.stats() == {"requisicoes": 2, "acertos_cache": 1}
+    assert len(OpenWeatherStandIn.requests) == 2
+
+
+def test_cache_expires_after_ttl(client, monkeypatch):
+    monkeypatch.setattr(ferramentas_clima, "CURRENT_WEATHER_TTL", 0.2)
+    client.current("Recife")
+    client.current("Recife")
+    time.sleep(0.3)
+    client.current("Recife")
+    assert client.stats() == {"requisicoes": 2, "acertos_cache": 1}
+
+
+def test_cache_is_bounded_and_drops_expired_entries_first(base_url, index, monkeypatch):
+    weather = WeatherClient(api_key=API_KEY, base_url=base_url, index=index,
+                            requests_per_minute=0, cache_size=2)
+    monkeypatch.setattr(ferramentas_clima, "FORECAST_TTL", 0.2)
+    weather.forecast("Manaus")
+    monkeypatch.setattr(ferramentas_clima, "FORECAST_TTL", 60)
+    weather.current("Natal")
+    time.sleep(0.3)
+    weather.current("Recife")
+    # A previsão expirada sai primeiro, mesmo sendo Natal a entrada usada há mais tempo
+    assert [key[0] for key in weather._cache] == ["weather", "weather"]
+    # Cheio, o cache descarta a entrada usada há mais tempo (Recife, depois do acerto em Natal)
+    weather.current("Natal")
+    weather.current("Fortaleza")
+    weather.current("Natal")
+    weather.current("Recife")
+    assert weather.stats() == {"requisicoes": 5, "acertos_cache": 2}
+
+
+def test_forecast_points(client):
+    forecast = client.forecast("Manaus", hours=12)
+    assert [point["temperatura"] for point in forecast["previsao"]] == [25, 26, 27, 28]
+    assert forecast["previsao"][0]["probabilidade_chuva_pct"] == 20
+
+
+def test_unknown_city_falls_back_to_provider_geocoder(client):
+    with pytest.raises(WeatherError, match="não encontrada"):
+        client.current("Nenhuma Cidade")
+    assert OpenWeatherStandIn.requests[-1][1]["q"] == "Nenhuma Cidade"
+
+
+def test_invalid_api_key(base_url, index):
+    weather = WeatherClient(api_key="errada", base_url=base_url, index=index, requests_per_minute=0)
+    with pytest.raises(WeatherError, match="inválida"):
+        weather.current("Natal")
+
+
+def test_missing_api_key_makes_no_request(client, base_url, index, monkeypatch):
+    monkeypatch.delenv("OPENWEATHER_API_KEY", raising=False)
+    weather = WeatherClient(base_url=base_url, index=index, requests_per_minute=0)
+    with pytest.raises(WeatherError, match="OPENWEATHER_API_KEY"):
+        weather.current("Natal")
+    assert OpenWeatherStandIn.requests == []
+
+
+@pytest.mark.parametrize("city", ["Quebrada", "Incompleta"])
+def test_malformed_responses_raise_weather_error(client, city):
+    with pytest.raises(WeatherError, match="Resposta"):
+        client.current(city)
+    with pytest.raises(WeatherError, match="Resposta"):
+        client.forecast(city)
+
+
+def test_format_table_shows_missing_values_as_dash():
+    rows = [
+        {"cidade": "Natal", "uf": "RN", "unidade_temperatura": "°C", "temperatura": 28.04,
+         "sensacao_termica": None, "minima": None, "maxima": 30.2, "umidade_pct": None,
+         "vento": None, "unidade_vento": "m/s", "descricao": ""},
+        {"consulta": "Atlântida", "erro": "Localização não encontrada"},
+    ]
+    table = format_table(rows).splitlines()
+    assert table[2] == "| Natal/RN | 28.0 °C | – | –/30 | – | – | – |"
+    assert table[3].startswith("| Atlântida | erro: Localização não encontrada |")
+
+
+def test_current_many_turns_any_failure_into_an_error_row(client, monkeypatch):
+    def current(city, units="metric"):
+        if city == "Natal":
+            raise json.JSONDecodeError("Expecting value", "", 0)
+        if city == "Recife":
+            raise KeyError("main")
+        return {"cidade": city, "temperatura": 20.0}
+
+    monkeypatch.setattr(client, "current", current)
+    rows = client.current_many(["Natal", "Recife", "Manaus"])
+    assert [row.get("erro") is not None for row in rows] == [True, True, False]
+    assert rows[2]["cidade"] == "Manaus"
+
+
+def test_current_many_deduplicates_and_reports_errors(client):
+    rows = client.current_many(["Sampa", "São Paulo", "Quebrada", "Natal"])
+    assert [row.get("cidade") or row["consulta"] for row in rows] == ["São Paulo", "Quebrada", "Natal"]
+    assert "erro" in rows[1]
+    assert len(OpenWeatherStandIn.requests) == 3
@@ -0,0 +1,28 @@
+from indice_de_cidades import CityIndex, build_index
+
+
+def _geonames_line(geoname_id, name, latitude, longitude, country, admin1, population):
+    columns = [str(geoname_id), name, name, "", str(latitude), str(longitude), "P", "PPL",
+               country, "", admin1, "", "", "", str(population), "", "", "America/Sao_Paulo",
+               "2024-01-01"]
+    return "\t".join(columns) + "\n"
+
+
+def test_geonames_admin1_codes_become_state_abbreviations(tmp_path):
+    source = tmp_path / "cities15000.txt"
+    source.write_text(
+        _geonames_line(1, "Bom Jesus", -28.67, -50.43, "BR", "23", 11000)
+        + _geonames_line(2, "Bom Jesus", -9.07, -44.36, "BR", "20", 25000)
+        + _geonames_line(3, "Springfield", 39.8, -89.64, "US", "IL", 114000),
+        encoding="utf-8",
+    )
+    path = tmp_path / "cidades.bin"
+    build_index([str(source)], str(path))
+    index = CityIndex(str(path))
+    try:
+        assert index.resolve("Bom Jesus, RS").latitude == -28.67
+        assert index.resolve("Bom Jesus, PI").latitude == -9.07
+        assert index.resolve("Bom Jesus").state == "PI"  # mais populosa
+        assert index.resolve("Springfield, US").state == ""
+    finally:
+        index.close()
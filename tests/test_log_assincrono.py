@@ -0,0 +1,28 @@
+import logging
+import queue
+
+from log_assincrono import BatchingJsonLinesWriter
+
+
+def _record(number):
+    return logging.LogRecord("teste", logging.INFO, __file__, 1, "mensagem %d", (number,), None)
+
+
+def test_stop_timeout_does_not_lose_pending_records(tmp_path):
+    path = tmp_path / "log.jsonl"
+    log_queue = queue.Queue()
+    writer = BatchingJsonLinesWriter(str(path), log_queue, batch_size=10)
+    for number in range(5000):
+        log_queue.put(_record(number))
+    writer.start()
+    # O timeout expira com a thread ainda gravando: o arquivo não pode ser fechado por stop
+    writer.stop(timeout=0.001)
+    writer._thread.join()
+    assert writer.errors == 0
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 5000
+
+
+def test_stop_without_start_closes_the_file(tmp_path):
+    writer = BatchingJsonLinesWriter(str(tmp_path / "log.jsonl"), queue.Queue())
+    writer.stop()
+    assert writer._file.closed
@@ -0,0 +1,14 @@
+from memoria_de_traducao import TranslationMemory
+
+
+def test_exact_and_fuzzy_lookups_return_stored_source(tmp_path):
+    memory = TranslationMemory(str(tmp_path / "memoria.sqlite3"), threshold=0.8)
+    memory.store("pt", "en", "Eu tenho 3 gatos.", "I have 3 cats.")
+
+    assert memory.lookup("pt", "en", "eu  tenho 3 GATOS.") == ("I have 3 cats.", 1.0, "Eu tenho 3 gatos.")
+
+    translation, score, source = memory.lookup("pt", "en", "Eu tenho 5 gatos.")
+    assert score < 1.0
+    assert (translation, source) == ("I have 3 cats.", "Eu tenho 3 gatos.")
+    assert memory.lookup("pt", "en", "O trem sai às 11h30.") is None
+    memory.close()
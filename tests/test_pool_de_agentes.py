@@ -0,0 +1,45 @@
+import threading
+import time
+
+import pytest
+
+from pool_de_agentes import AgentPool
+
+
+class FakeAgent:
+    def __init__(self):
+        self.messages = []
+
+    def __call__(self, prompt):
+        self.messages += [prompt, "resposta"]
+
+
+def test_history_is_cleared_on_checkin():
+    pool = AgentPool()
+    pool.register("analista", FakeAgent)
+    with pool.agent("analista") as agent:
+        agent("primeira consulta")
+        assert agent.messages
+    # Ocioso no pool, o agente já não guarda a conversa anterior
+    assert agent.messages == []
+    with pool.agent("analista") as reused:
+        assert reused is agent
+    assert pool.stats() == {"analista": {"construidos": 1, "livres": 1}}
+
+
+def test_role_limit_makes_callers_wait():
+    pool = AgentPool(max_agents_per_role=8)
+    pool.register("especialista", FakeAgent, max_agents=1)
+    first = pool.checkout("especialista")
+    with pytest.raises(TimeoutError):
+        pool.checkout("especialista", timeout=0.05)
+
+    threading.Timer(0.05, pool.checkin, ("especialista", first)).start()
+    started_at = time.monotonic()
+    assert pool.checkout("especialista", timeout=2) is first
+    assert time.monotonic() - started_at >= 0.04
+
+
+def test_unknown_role():
+    with pytest.raises(KeyError):
+        AgentPool().checkout("inexistente")
@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+from pool_de_interpretadores import InterpreterPool
+
+
+@pytest.fixture(scope="module")
+def pool():
+    os.environ["SEGREDO_DO_TESTE"] = "não deve vazar"
+    pool = InterpreterPool(size=1, timeout=10)
+    yield pool
+    pool.close()
+    del os.environ["SEGREDO_DO_TESTE"]
+
+
+def test_writes_inside_the_workdir(pool):
+    result = pool.run("open('saida.txt', 'w').write('ok'); open('saida.txt').read()")
+    assert result.error == ""
+    assert "'ok'" in result.output
+
+
+def test_writes_outside_the_workdir_are_refused(pool, tmp_path):
+    target = tmp_path / "fora.txt"
+    result = pool.run(f"open({str(target)!r}, 'w')")
+    assert "PermissionError" in result.error
+    assert not target.exists()
+
+
+@pytest.mark.parametrize("code", [
+    "import socket; socket.create_connection(('127.0.0.1', 9))",
+    "import subprocess; subprocess.run(['true'])",
+    "import os; os.system('true')",
+])
+def test_network_and_processes_are_refused(pool, code):
+    assert "PermissionError" in pool.run(code).error
+
+
+def test_environment_is_not_inherited(pool):
+    result = pool.run("import os; 'SEGREDO_DO_TESTE' in os.environ")
+    assert "False" in result.output
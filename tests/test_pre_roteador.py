@@ -0,0 +1,79 @@
+import pytest
+
+from pre_roteador import PreRouter
+
+
+@pytest.fixture
+def router(tmp_path):
+    return PreRouter(routes_log=str(tmp_path / "rotas.jsonl"))
+
+
+@pytest.mark.parametrize("query, specialist", [
+    ("Como declarar um ponteiro em C++?", "computer_science_assistant"),
+    ("c++ ou rust para jogos", "computer_science_assistant"),
+    ("quanto é 37*89?", "math_assistant"),
+    ("traduza bom dia para o inglês", "language_assistant"),
+    ("quando usar crase?", "portuguese_assistant"),
+])
+def test_keyword_rules(router, query, specialist):
+    route = router.route(query)
+    assert (route.specialist, route.source) == (specialist, "regras")
+
+
+def test_language_names_inside_words_do_not_match(router):
+    assert router.route("o javali comeu a abc++def") is None
+
+
+@pytest.mark.parametrize("query", [
+    "qual o melhor programa de TV hoje?",
+    "onde fica a ilha de Java?",
+    "leite integral engorda?",
+    "o código postal da minha rua mudou",
+])
+def test_single_weak_term_does_not_route(router, query):
+    assert router.route(query) is None
+
+
+def test_two_weak_terms_route_with_lower_confidence(router):
+    route = router.route("meu programa tem um bug")
+    assert route.specialist == "computer_science_assistant"
+    assert route.confidence < 1.0
+
+
+def _train(router, examples, repeat=5):
+    for query, specialist in examples * repeat:
+        router.classifier.add(query, specialist)
+
+
+def test_single_weak_term_needs_classifier_agreement(router):
+    _train(router, [
+        ("como compilar meu programa em rust", "computer_science_assistant"),
+        ("rust ou go para servidores", "computer_science_assistant"),
+        ("quanto custa a passagem", "math_assistant"),
+        ("quantos litros cabem na caixa", "math_assistant"),
+    ])
+    route = router.route("rust serve para servidores?")
+    assert (route.specialist, route.source) == ("computer_science_assistant", "classificador")
+
+
+def test_classifier_cannot_contradict_a_weak_term(router):
+    _train(router, [
+        ("qual o melhor programa de domingo", "portuguese_assistant"),
+        ("programa de auditório antigo", "portuguese_assistant"),
+        ("quanto custa a passagem", "math_assistant"),
+        ("quantos litros cabem na caixa", "math_assistant"),
+    ])
+    assert router.route("programa de domingo") is None
+
+
+def test_invalid_log_lines_are_skipped(tmp_path):
+    log = tmp_path / "rotas.jsonl"
+    log.write_text(
+        '{"query": "traduza oi", "specialist": "language_assistant"}\n'
+        '{"query": "sem especialista"}\n'
+        '{"query": "trunc\n'
+        '["lista", "em vez de objeto"]\n',
+        encoding="utf-8",
+    )
+    router = PreRouter(routes_log=str(log))
+    assert len(router.classifier.examples) == 1